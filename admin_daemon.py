@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Warm Firebase Admin SDK Daemon for EduGenie Platform
+Keeps one Admin app, its Firestore client and an OAuth access token alive
+and answers Admin check requests over a Unix socket, so a checker run skips
+the certificate parsing, initialize_app, token minting and gRPC channel
+setup of a cold start.
+
+Requests and responses are one JSON object per line:
+    {"op": "check", "checks": ["admin_init", "admin_auth", "admin_firestore"]}
+    {"op": "ping"} / {"op": "stats"} / {"op": "shutdown"}
+
+Usage:
+    python admin_daemon.py &                      # start (foreground process)
+    python comprehensive_firebase_checker.py --via-daemon
+    python admin_daemon.py --status | --stop
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+try:
+    from comprehensive_firebase_checker import ComprehensiveFirebaseChecker, import_admin_sdk
+    from token_cache import TokenCache, cached_certificate
+except ImportError as e:
+    print("❌ Missing required packages. Please install them with:")
+    print("pip install -r requirements-comprehensive-firebase.txt")
+    sys.exit(1)
+
+DEFAULT_SOCKET = '.firebase_admin_daemon.sock'
+APP_NAME = 'admin-daemon'
+DAEMON_CHECKS = ['admin_init', 'admin_auth', 'admin_firestore']
+# Refresh the access token this long before it expires, off the check path
+TOKEN_REFRESH_MARGIN = 300
+# Seconds a client waits for the daemon to answer
+CLIENT_TIMEOUT = 30
+
+
+class DaemonUnavailable(Exception):
+    """No daemon is listening on the socket"""
+
+
+def request(payload, socket_path=DEFAULT_SOCKET, timeout=CLIENT_TIMEOUT):
+    """Send one request to the daemon and return its decoded response"""
+    if not hasattr(socket, 'AF_UNIX'):
+        raise DaemonUnavailable("Unix sockets are not supported on this platform")
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        try:
+            sock.connect(socket_path)
+        except (FileNotFoundError, ConnectionRefusedError) as e:
+            raise DaemonUnavailable(f"No admin daemon at {socket_path} ({e.strerror})") from e
+        sock.sendall(json.dumps(payload).encode('utf-8') + b"\n")
+        with sock.makefile('rb') as reader:
+            line = reader.readline()
+    finally:
+        sock.close()
+    if not line:
+        raise DaemonUnavailable(f"Admin daemon at {socket_path} closed the connection")
+    return json.loads(line)
+
+
+class WarmAdmin:
+    """The long-lived Admin app, Firestore client and access token"""
+
+    def __init__(self, service_account_path):
+        self.service_account_path = service_account_path
+        self.firebase_admin = None
+        self.auth = None
+        self.app = None
+        self.credential = None
+        self.db = None
+        self.token_expiry = None
+        self.started_at = None
+        self.init_seconds = None
+        self.error = None
+        self._signature = None
+        self._lock = threading.Lock()
+
+    def _file_signature(self):
+        stat = os.stat(self.service_account_path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def start(self):
+        """Initialize (or re-initialize) the app and warm the token and gRPC channel"""
+        started = time.perf_counter()
+        self.close()
+        self.error = None
+        try:
+            self.firebase_admin, credentials, self.auth, firestore = import_admin_sdk()
+            self._signature = self._file_signature()
+            # A restarted daemon picks up the token its previous run cached
+            self.credential = cached_certificate(credentials, self.service_account_path, TokenCache())
+            self.app = self.firebase_admin.initialize_app(self.credential, name=APP_NAME)
+            self.db = firestore.client(app=self.app)
+            self._refresh_token()
+        except Exception as e:
+            self.close()
+            self.error = str(e)
+        else:
+            try:
+                # One cheap read opens the gRPC channel now rather than on the first check
+                self.db.collection('test').document('connection').get()
+            except Exception as e:
+                self.error = f"Warm-up read failed: {e}"
+        self.started_at = datetime.now(timezone.utc)
+        self.init_seconds = time.perf_counter() - started
+        return self.error is None
+
+    def _refresh_token(self):
+        token = self.credential.get_access_token()
+        expiry = token.expiry
+        if expiry is not None and expiry.tzinfo is None:
+            expiry = expiry.replace(tzinfo=timezone.utc)
+        self.token_expiry = expiry
+
+    def _ensure_fresh(self):
+        # Callers hold self._lock
+        try:
+            changed = self._file_signature() != self._signature
+        except OSError:
+            changed = False
+        if changed or self.app is None:
+            self.start()
+            return
+        if self.token_expiry is not None:
+            remaining = (self.token_expiry - datetime.now(timezone.utc)).total_seconds()
+            if remaining < TOKEN_REFRESH_MARGIN:
+                try:
+                    self._refresh_token()
+                except Exception as e:
+                    self.error = f"Token refresh failed: {e}"
+
+    def ensure_fresh(self):
+        """Re-initialize after the service account file changed; refresh a token about to expire"""
+        with self._lock:
+            self._ensure_fresh()
+
+    @contextmanager
+    def session(self):
+        """Freshen the app and hold it for a batch of checks.
+
+        A re-initialization deletes the app, so checks and refreshes share one
+        lock - no check ever runs against an app another request just deleted.
+        """
+        with self._lock:
+            self._ensure_fresh()
+            yield self
+
+    def close(self):
+        if self.app is not None:
+            try:
+                self.firebase_admin.delete_app(self.app)
+            except ValueError:
+                pass
+        self.app = None
+        self.db = None
+
+    def stop(self):
+        """Delete the app once in-flight checks have finished"""
+        with self._lock:
+            self.close()
+
+    def stats(self):
+        return {
+            'service_account': self.service_account_path,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'init_seconds': round(self.init_seconds, 3) if self.init_seconds is not None else None,
+            'token_expiry': self.token_expiry.isoformat() if self.token_expiry else None,
+            'error': self.error,
+        }
+
+
+def _timed(check_id, func):
+    started = time.perf_counter()
+    try:
+        ok, message = func()
+    except Exception as e:
+        ok, message = False, f"Error - {e}"
+    return {'check': check_id, 'ok': ok, 'message': message,
+            'latency_ms': round((time.perf_counter() - started) * 1000, 2)}
+
+
+def run_checks(warm, check_ids):
+    """Answer a check request from the warm app, same checks as the comprehensive checker"""
+    with warm.session():
+        return _run_checks(warm, check_ids)
+
+
+def _run_checks(warm, check_ids):
+    if warm.app is None:
+        message = f"Admin SDK initialization error: {warm.error}"
+        return [{'check': check_id, 'ok': False, 'message': message, 'latency_ms': 0.0}
+                for check_id in check_ids]
+
+    def admin_init():
+        return True, f"Warm app up since {warm.started_at:%H:%M:%S}"
+
+    def admin_auth():
+        # Listing one user works even when there are none
+        warm.auth.list_users(max_results=1, app=warm.app)
+        return True, "Working"
+
+    def admin_firestore():
+        # A reference proves the client works without querying the database
+        warm.db.collection('test').document('connection')
+        return True, "Working"
+
+    checks = {'admin_init': admin_init, 'admin_auth': admin_auth, 'admin_firestore': admin_firestore}
+    return [_timed(check_id, checks[check_id]) if check_id in checks
+            else {'check': check_id, 'ok': False, 'message': "Unknown check", 'latency_ms': 0.0}
+            for check_id in check_ids]
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                payload = json.loads(line)
+                response = self.server.dispatch(payload)
+            except Exception as e:
+                response = {'ok': False, 'error': str(e)}
+            self.wfile.write(json.dumps(response).encode('utf-8') + b"\n")
+            self.wfile.flush()
+
+
+class AdminDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server in front of one WarmAdmin"""
+
+    daemon_threads = True
+
+    def __init__(self, warm, socket_path=DEFAULT_SOCKET):
+        self.warm = warm
+        self.socket_path = socket_path
+        self.served = 0
+        # Only the owner may talk to a process holding Admin credentials
+        previous = os.umask(0o177)
+        try:
+            super().__init__(socket_path, _Handler)
+        finally:
+            os.umask(previous)
+
+    def dispatch(self, payload):
+        op = payload.get('op')
+        if op == 'ping':
+            return {'ok': True, 'pid': os.getpid()}
+        if op == 'stats':
+            return {'ok': True, 'served': self.served, **self.warm.stats()}
+        if op == 'check':
+            started = time.perf_counter()
+            results = run_checks(self.warm, payload.get('checks') or DAEMON_CHECKS)
+            self.served += 1
+            return {'ok': True, 'results': results,
+                    'elapsed_ms': round((time.perf_counter() - started) * 1000, 2),
+                    **self.warm.stats()}
+        if op == 'shutdown':
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {'ok': True}
+        return {'ok': False, 'error': f"Unknown op {op!r}"}
+
+    def server_close(self):
+        super().server_close()
+        try:
+            os.unlink(self.socket_path)
+        except OSError:
+            pass
+
+
+def remove_stale_socket(socket_path):
+    """Delete a socket file no daemon answers on; False if a daemon is already running"""
+    if not os.path.exists(socket_path):
+        return True
+    try:
+        request({'op': 'ping'}, socket_path, timeout=2)
+        return False
+    except (DaemonUnavailable, OSError, ValueError):
+        os.unlink(socket_path)
+        return True
+
+
+def serve(socket_path=DEFAULT_SOCKET, service_account_path=None):
+    """Warm up the Admin app and serve check requests until stopped"""
+    print("🔥 Firebase Admin SDK Daemon")
+    print("=" * 50)
+    if not hasattr(socket, 'AF_UNIX'):
+        print("❌ Unix sockets are not supported on this platform")
+        return False
+
+    if not service_account_path:
+        checker = ComprehensiveFirebaseChecker()
+        if not checker.find_service_account_file():
+            print("❌ Service account JSON file not found!")
+            return False
+        service_account_path = checker.service_account_path
+
+    if not remove_stale_socket(socket_path):
+        print(f"❌ A daemon is already listening on {socket_path}")
+        return False
+
+    warm = WarmAdmin(service_account_path)
+    print(f"📋 Service account: {service_account_path}")
+    if warm.start():
+        print(f"✅ Admin app, Firestore channel and token warm in {warm.init_seconds:.2f}s")
+    else:
+        print(f"⚠️ Warm-up failed ({warm.error}) - will retry on the first request")
+
+    server = AdminDaemon(warm, socket_path)
+    signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(target=server.shutdown).start())
+    print(f"🔌 Listening on {socket_path} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        warm.stop()
+        print(f"\n👋 Daemon stopped after {server.served} check requests")
+    return True
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Keep a warm Firebase Admin SDK app and serve checks over a Unix socket")
+    parser.add_argument('--socket', default=DEFAULT_SOCKET,
+                        help=f"Unix socket path (default: {DEFAULT_SOCKET})")
+    parser.add_argument('--service-account', metavar='PATH',
+                        help="service account JSON (default: same discovery as the comprehensive checker)")
+    control = parser.add_mutually_exclusive_group()
+    control.add_argument('--status', action='store_true', help="print the running daemon's stats and exit")
+    control.add_argument('--stop', action='store_true', help="ask the running daemon to shut down")
+    return parser.parse_args(argv)
+
+
+def main(args):
+    """Main function"""
+    if args.status or args.stop:
+        try:
+            response = request({'op': 'stats' if args.status else 'shutdown'}, args.socket)
+        except DaemonUnavailable as e:
+            print(f"❌ {e}")
+            return False
+        if args.status:
+            print(json.dumps(response, indent=2))
+        else:
+            print("👋 Daemon is shutting down")
+        return response.get('ok', False)
+    return serve(args.socket, args.service_account)
+
+
+if __name__ == "__main__":
+    try:
+        success = main(parse_args())
+    except KeyboardInterrupt:
+        success = True
+    sys.exit(0 if success else 1)
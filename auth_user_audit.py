@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Firebase Auth User Audit for EduGenie Platform
+Pages through every Auth user (1000 per page, the API maximum) and streams a
+one-line summary per user - providers, disabled, last sign-in - to NDJSON,
+without keeping the user list in memory. Reports users/sec and per-page
+latency.
+
+With --cross-check, each page's uids are looked up in the `users` Firestore
+collection with one batched get_all() while the next page is being fetched,
+and every summary records whether its profile document exists.
+
+Usage:
+    python auth_user_audit.py --output auth-users.ndjson --cross-check
+    python comprehensive_firebase_checker.py --audit-users auth-users.ndjson
+"""
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+try:
+    from course_duplicate_auditor import connect_admin
+    from check_timings import percentile
+    from comprehensive_firebase_checker import import_admin_sdk
+except ImportError as e:
+    print("❌ Missing required packages. Please install them with:")
+    print("pip install -r requirements-comprehensive-firebase.txt")
+    sys.exit(1)
+
+# Largest page list_users() accepts
+PAGE_SIZE = 1000
+USERS_COLLECTION = 'users'
+
+
+def _timestamp(milliseconds):
+    if not milliseconds:
+        return None
+    return datetime.fromtimestamp(milliseconds / 1000, tz=timezone.utc).isoformat()
+
+
+def user_summary(user):
+    """The audit line for one UserRecord"""
+    metadata = user.user_metadata
+    return {
+        'uid': user.uid,
+        'email': user.email,
+        'providers': [info.provider_id for info in user.provider_data] or ['anonymous'],
+        'disabled': user.disabled,
+        'email_verified': user.email_verified,
+        'created': _timestamp(metadata.creation_timestamp if metadata else None),
+        'last_sign_in': _timestamp(metadata.last_sign_in_timestamp if metadata else None),
+    }
+
+
+def existing_profiles(db, uids, collection=USERS_COLLECTION):
+    """uids that have a users/{uid} document, from one batched get_all()"""
+    refs = [db.collection(collection).document(uid) for uid in uids]
+    # Asking for a single field keeps the response small; only existence matters
+    return {snapshot.id for snapshot in db.get_all(refs, field_paths=['email']) if snapshot.exists}
+
+
+class AuditStats:
+    """Running totals; only counters and page latencies are kept"""
+
+    def __init__(self):
+        self.users = 0
+        self.pages = 0
+        self.page_latencies = []
+        self.providers = {}
+        self.disabled = 0
+        self.never_signed_in = 0
+        self.cross_checked = 0
+        self.missing_profiles = 0
+        self.cross_check_seconds = 0.0
+        self.seconds = 0.0
+
+    def count(self, summary):
+        self.users += 1
+        for provider in summary['providers']:
+            self.providers[provider] = self.providers.get(provider, 0) + 1
+        if summary['disabled']:
+            self.disabled += 1
+        if not summary['last_sign_in']:
+            self.never_signed_in += 1
+        if 'profile' in summary:
+            self.cross_checked += 1
+            if not summary['profile']:
+                self.missing_profiles += 1
+
+
+def audit_users(auth, app, out, db=None, page_size=PAGE_SIZE, collection=USERS_COLLECTION):
+    """Walk all Auth users page by page and write one NDJSON line per user.
+
+    This is the same walk iterate_all() does, with pages fetched explicitly so
+    each one can be timed. With `db`, profile lookups for a page overlap the
+    fetch of the next page.
+    """
+    stats = AuditStats()
+    started = time.perf_counter()
+
+    def fetch(previous):
+        page_started = time.perf_counter()
+        if previous is None:
+            page = auth.list_users(max_results=page_size, app=app)
+        else:
+            page = previous.get_next_page()
+        if page is not None:
+            stats.page_latencies.append(time.perf_counter() - page_started)
+            stats.pages += 1
+        return page
+
+    def cross_check(users):
+        check_started = time.perf_counter()
+        found = existing_profiles(db, [user.uid for user in users], collection)
+        stats.cross_check_seconds += time.perf_counter() - check_started
+        return found
+
+    def write(users, profiles):
+        for user in users:
+            summary = user_summary(user)
+            if profiles is not None:
+                summary['profile'] = user.uid in profiles
+            stats.count(summary)
+            out.write(json.dumps(summary) + "\n")
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        page = fetch(None)
+        while page is not None:
+            users = list(page.users)
+            lookup = executor.submit(cross_check, users) if db is not None and users else None
+            next_page = fetch(page) if page.has_next_page else None
+            write(users, lookup.result() if lookup else None)
+            page = next_page
+
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+def print_audit_report(stats, output, indent="  "):
+    """Print throughput, page latency and account breakdown"""
+    stream = sys.stderr if output == '-' else sys.stdout
+    latencies = sorted(stats.page_latencies)
+    rate = stats.users / stats.seconds if stats.seconds else 0.0
+    print("\n👥 AUTH USER AUDIT", file=stream)
+    print("=" * 50, file=stream)
+    print(f"{indent}Users: {stats.users:,} in {stats.pages:,} pages "
+          f"({rate:,.0f} users/sec, {stats.seconds:.1f}s)", file=stream)
+    if latencies:
+        print(f"{indent}Page Latency: p50 {percentile(latencies, 50) * 1000:.0f}ms, "
+              f"p95 {percentile(latencies, 95) * 1000:.0f}ms, max {latencies[-1] * 1000:.0f}ms", file=stream)
+    providers = ", ".join(f"{name} {count:,}" for name, count in
+                          sorted(stats.providers.items(), key=lambda item: -item[1]))
+    print(f"{indent}Providers: {providers or 'none'}", file=stream)
+    print(f"{indent}Disabled: {stats.disabled:,}, never signed in: {stats.never_signed_in:,}", file=stream)
+    if stats.cross_checked:
+        icon = "⚠️" if stats.missing_profiles else "✅"
+        print(f"{indent}{icon} Missing users/{{uid}} profiles: {stats.missing_profiles:,} of "
+              f"{stats.cross_checked:,} ({stats.cross_check_seconds:.1f}s in get_all)", file=stream)
+    if output != '-':
+        print(f"\n📄 User summaries written to {output}", file=stream)
+
+
+def run_audit(app, output, cross_check=False, page_size=PAGE_SIZE):
+    """Audit with an already initialized Admin app; returns AuditStats"""
+    firebase_admin, credentials, auth, firestore = import_admin_sdk()
+    db = firestore.client(app=app) if cross_check else None
+    if output == '-':
+        return audit_users(auth, app, sys.stdout, db, page_size)
+    with open(output, 'w', encoding='utf-8') as out:
+        return audit_users(auth, app, out, db, page_size)
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Stream a summary of every Firebase Auth user to NDJSON")
+    parser.add_argument('--output', '-o', default='auth-users.ndjson',
+                        help="NDJSON file for user summaries, '-' for stdout (default: auth-users.ndjson)")
+    parser.add_argument('--cross-check', action='store_true',
+                        help=f"check each uid has a {USERS_COLLECTION}/{{uid}} Firestore document")
+    parser.add_argument('--page-size', type=int, default=PAGE_SIZE,
+                        help=f"users per list_users() page, at most {PAGE_SIZE} (default: {PAGE_SIZE})")
+    parser.add_argument('--service-account', metavar='PATH',
+                        help="service account JSON (default: same discovery as the comprehensive checker)")
+    return parser.parse_args(argv)
+
+
+def main(args):
+    """Main function"""
+    log = sys.stderr if args.output == '-' else sys.stdout
+    print("👥 Firebase Auth User Audit", file=log)
+    print("=" * 50, file=log)
+    try:
+        firebase_admin, app, firestore, db = connect_admin('auth-user-audit', args.service_account)
+    except ImportError:
+        print("❌ firebase-admin is not installed: pip install firebase-admin google-cloud-firestore", file=log)
+        return False
+    except Exception as e:
+        print(f"❌ Admin SDK initialization failed: {e}", file=log)
+        return False
+
+    try:
+        stats = run_audit(app, args.output, args.cross_check, min(args.page_size, PAGE_SIZE))
+        print_audit_report(stats, args.output)
+        return True
+    except Exception as e:
+        print(f"❌ User audit failed: {e}", file=log)
+        return False
+    finally:
+        firebase_admin.delete_app(app)
+
+
+if __name__ == "__main__":
+    try:
+        success = main(parse_args())
+    except KeyboardInterrupt:
+        print("\n\n❌ Audit interrupted by user")
+        success = False
+    sys.exit(0 if success else 1)
@@ -0,0 +1,494 @@
+#!/usr/bin/env python3
+"""
+Production Build Budget Gate for EduGenie Platform
+Inspects dist/ after `vite build`: raw, gzip and brotli size of every JS/CSS
+chunk, which source modules each chunk is made of (decoded from its
+sourcemap), and a check against build-budget.json. Exits nonzero when the
+entry chunk or a firebase vendor chunk is over its budget; other chunks over
+budget are reported as warnings (or fail too with --strict).
+
+Results are cached per chunk by content hash in .firebase_check_cache/, so
+only chunks that changed since the last run are re-compressed and
+re-attributed - cheap enough to run on every commit.
+
+Usage:
+    npm run build && python build_budget.py
+    python build_budget.py --init-budget      # write budgets from the current build
+"""
+
+import argparse
+import fnmatch
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from probe_cache import DEFAULT_CACHE_DIR
+    from vite_module_crawler import html_entries
+except ImportError as e:
+    print("❌ Missing required packages. Please install them with:")
+    print("pip install -r requirements-comprehensive-firebase.txt")
+    sys.exit(1)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DEFAULT_DIST = 'dist'
+# vite.config.ts moves the hidden sourcemaps here so deploying dist/ never publishes them
+DEFAULT_MAPS = 'build-sourcemaps'
+DEFAULT_BUDGET_FILE = 'build-budget.json'
+CACHE_FILE = os.path.join(DEFAULT_CACHE_DIR, 'build-budget.json')
+ASSET_EXTENSIONS = ('.js', '.mjs', '.css')
+# Vite appends an 8 character content hash: assets/index-BxYz12_a.js
+CONTENT_HASH = re.compile(r'-[A-Za-z0-9_-]{8}(?=\.\w+$)')
+SIZE_UNITS = {'b': 1, 'kb': 1024, 'mb': 1024 * 1024}
+# Headroom --init-budget leaves above the current sizes
+INIT_HEADROOM = 0.10
+UNMAPPED = '(unmapped)'
+BASE64_DIGITS = {char: index for index, char in enumerate(
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/')}
+
+
+def parse_size(value):
+    """Bytes from 153600, "150 KB" or "1.5 MB\""""
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = re.fullmatch(r'\s*([\d.]+)\s*([kKmM]?[bB])?\s*', str(value))
+    if not match:
+        raise ValueError(f"Not a size: {value!r}")
+    return int(float(match.group(1)) * SIZE_UNITS[(match.group(2) or 'b').lower()])
+
+
+def format_size(num_bytes):
+    if num_bytes is None:
+        return "—"
+    if abs(num_bytes) >= 1024 * 1024:
+        return f"{num_bytes / (1024 * 1024):.2f} MB"
+    return f"{num_bytes / 1024:.1f} KB"
+
+
+def chunk_name(path):
+    """Chunk path without Vite's content hash, stable across builds"""
+    return CONTENT_HASH.sub('', os.path.basename(path))
+
+
+def read_manifest(dist):
+    """dist/.vite/manifest.json, or None"""
+    try:
+        with open(os.path.join(dist, '.vite', 'manifest.json'), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        return manifest if isinstance(manifest, dict) else None
+    except (OSError, ValueError):
+        return None
+
+
+def chunk_keys(paths, manifest=None):
+    """Unique, build-stable identity per chunk path.
+
+    Vite emits several `index-<hash>.js` chunks, so the hash-stripped name is
+    not enough: the manifest source (`src/pages/Courses.tsx`) is used where
+    there is one, else the hash-stripped path with `#2`, `#3` for collisions.
+    """
+    sources = {}
+    for item in (manifest or {}).values():
+        if isinstance(item, dict) and item.get('file') and item.get('src'):
+            sources.setdefault(item['file'], item['src'])
+    keys, seen = {}, {}
+    for path in sorted(paths, key=lambda p: (sources.get(p, ''), p)):
+        key = sources.get(path) or CONTENT_HASH.sub('', path)
+        seen[key] = seen.get(key, 0) + 1
+        keys[path] = key if seen[key] == 1 else f"{key}#{seen[key]}"
+    return keys
+
+
+def package_of(source):
+    """Group a sourcemap source by npm package, or by file for app code"""
+    source = source.replace('\\', '/')
+    if 'node_modules/' in source:
+        parts = source.rsplit('node_modules/', 1)[1].split('/')
+        return '/'.join(parts[:2]) if parts[0].startswith('@') else parts[0]
+    return re.sub(r'^(?:\.\./|\./|/)+', '', source)
+
+
+def _vlq_decode(segment):
+    values, shift, value = [], 0, 0
+    for char in segment:
+        digit = BASE64_DIGITS[char]
+        value += (digit & 31) << shift
+        if digit & 32:
+            shift += 5
+        else:
+            values.append(-(value >> 1) if value & 1 else value >> 1)
+            shift = value = 0
+    return values
+
+
+def attribute_sources(code, sourcemap):
+    """Bytes of generated code per source package/file, from the map's mappings"""
+    sources = [package_of((sourcemap.get('sourceRoot') or '') + source)
+               for source in sourcemap.get('sources', [])]
+    totals = {UNMAPPED: 0}
+    source_index = 0
+    lines = code.split('\n')
+    mappings = sourcemap.get('mappings', '').split(';')
+    for line_number, line in enumerate(lines):
+        spans = []
+        column = 0
+        mapping = mappings[line_number] if line_number < len(mappings) else ''
+        for segment in filter(None, mapping.split(',')):
+            values = _vlq_decode(segment)
+            column += values[0]
+            if len(values) >= 4:
+                source_index += values[1]
+                spans.append((column, sources[source_index] if source_index < len(sources) else UNMAPPED))
+            else:
+                spans.append((column, UNMAPPED))
+        if not spans or spans[0][0] > 0:
+            spans.insert(0, (0, UNMAPPED))
+        for (start, owner), (end, _) in zip(spans, spans[1:] + [(len(line), None)]):
+            if end > start:
+                totals[owner] = totals.get(owner, 0) + len(line[start:end].encode('utf-8'))
+    # The newlines themselves
+    totals[UNMAPPED] += len(lines) - 1
+    if not totals[UNMAPPED]:
+        del totals[UNMAPPED]
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def _sourcemap_path(dist, path, code, maps=None):
+    """The chunk's map: moved out of dist/ into `maps` (same relative path), else next to the chunk"""
+    if maps:
+        moved = os.path.join(maps, path + '.map')
+        if os.path.exists(moved):
+            return moved
+    chunk_path = os.path.join(dist, path)
+    match = re.search(r'[#@] sourceMappingURL=(\S+)\s*$', code[-1024:])
+    if match and not match.group(1).startswith('data:'):
+        return os.path.join(os.path.dirname(chunk_path), match.group(1))
+    return chunk_path + '.map'
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ChunkReport:
+    """Sizes and source attribution of one built chunk"""
+
+    def __init__(self, path, name, sha256, key=None):
+        self.path = path
+        self.name = name
+        # Unique across the build; caches and the growth baseline use it
+        self.key = key or name
+        # What reports show: the name, or the key when several chunks share the name
+        self.label = name
+        self.sha256 = sha256
+        self.map_path = None
+        self.map_sha256 = None
+        self.raw = 0
+        self.gzip = 0
+        self.brotli = None
+        self.sources = None
+        self.is_entry = False
+        self.is_firebase = False
+        self.cached = False
+        self.previous_gzip = None
+
+    def measure(self, dist, maps=None):
+        """Compress and attribute the chunk (the expensive part the cache skips)"""
+        full_path = os.path.join(dist, self.path)
+        with open(full_path, 'rb') as f:
+            data = f.read()
+        self.raw = len(data)
+        self.gzip = len(gzip.compress(data, compresslevel=9, mtime=0))
+        self.brotli = len(brotli.compress(data, quality=11)) if brotli else None
+        map_path = _sourcemap_path(dist, self.path, data[-1024:].decode('utf-8', errors='replace'), maps)
+        if self.path.endswith('.css') or not os.path.exists(map_path):
+            return
+        self.map_path = map_path.replace(os.sep, '/')
+        self.map_sha256 = _sha256(map_path)
+        try:
+            with open(map_path, 'r', encoding='utf-8') as f:
+                sourcemap = json.load(f)
+            self.sources = attribute_sources(data.decode('utf-8', errors='replace'), sourcemap)
+        except (OSError, ValueError, KeyError, IndexError):
+            self.sources = None
+
+    @property
+    def kind(self):
+        if self.is_entry:
+            return 'entry'
+        return 'firebase' if self.is_firebase else 'chunk'
+
+    def to_cache(self):
+        return {'path': self.path, 'sha256': self.sha256, 'map_path': self.map_path, 'map_sha256': self.map_sha256,
+                'raw': self.raw, 'gzip': self.gzip, 'brotli': self.brotli, 'sources': self.sources}
+
+    def restore(self, entry):
+        self.map_path, self.map_sha256 = entry.get('map_path'), entry.get('map_sha256')
+        self.raw, self.gzip, self.brotli = entry['raw'], entry['gzip'], entry.get('brotli')
+        self.sources = entry.get('sources')
+        self.cached = True
+
+
+class BuildCache:
+    """Per-chunk measurements keyed by chunk key, reused while the content hash matches"""
+
+    def __init__(self, path=CACHE_FILE):
+        self.path = path
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f).get('chunks', {})
+        except (OSError, ValueError, AttributeError):
+            self.entries = {}
+
+    def lookup(self, chunk):
+        """Cached entry for an unchanged chunk and sourcemap, else None"""
+        entry = self.entries.get(chunk.key)
+        if not entry or entry.get('sha256') != chunk.sha256:
+            return None
+        if brotli and entry.get('brotli') is None:
+            return None
+        if entry.get('map_path'):
+            map_path = entry['map_path']
+            if not os.path.exists(map_path) or _sha256(map_path) != entry['map_sha256']:
+                return None
+        return entry
+
+    def save(self, chunks):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        payload = {'stored_at': time.time(), 'chunks': {chunk.key: chunk.to_cache() for chunk in chunks}}
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path) or '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+def entry_chunks(dist, manifest=None):
+    """Entry chunk paths from the Vite manifest, else from dist/index.html"""
+    if manifest:
+        try:
+            return {item['file'] for item in manifest.values() if item.get('isEntry')}
+        except (KeyError, AttributeError):
+            pass
+    try:
+        with open(os.path.join(dist, 'index.html'), 'r', encoding='utf-8') as f:
+            html = f.read()
+    except OSError:
+        return set()
+    return {src.lstrip('/') for src, kind in html_entries(html) if kind == 'entry'}
+
+
+def is_firebase_chunk(chunk):
+    """A firebase-* manual chunk, or one mostly made of the Firebase SDK"""
+    if chunk.name.startswith('firebase'):
+        return True
+    if not chunk.sources:
+        return False
+    firebase = sum(size for owner, size in chunk.sources.items()
+                   if owner == 'firebase' or owner.startswith('@firebase/'))
+    return firebase > sum(chunk.sources.values()) / 2
+
+
+def analyze_dist(dist=DEFAULT_DIST, cache=None, jobs=None, maps=DEFAULT_MAPS):
+    """ChunkReports for every JS/CSS asset in dist/, measuring only what changed"""
+    paths = []
+    for root, _, files in os.walk(dist):
+        for file_name in files:
+            if file_name.endswith(ASSET_EXTENSIONS):
+                paths.append(os.path.relpath(os.path.join(root, file_name), dist).replace(os.sep, '/'))
+    manifest = read_manifest(dist)
+    entries = entry_chunks(dist, manifest)
+    keys = chunk_keys(paths, manifest)
+    names = [chunk_name(path) for path in paths]
+    chunks = []
+    for path in sorted(paths):
+        chunk = ChunkReport(path, chunk_name(path), _sha256(os.path.join(dist, path)), keys[path])
+        if names.count(chunk.name) > 1:
+            chunk.label = chunk.key
+        chunk.is_entry = path in entries
+        if cache is not None:
+            previous = cache.entries.get(chunk.key)
+            chunk.previous_gzip = previous.get('gzip') if previous else None
+            entry = cache.lookup(chunk)
+            if entry:
+                chunk.restore(entry)
+        chunks.append(chunk)
+
+    stale = [chunk for chunk in chunks if not chunk.cached]
+    # zlib and brotli release the GIL, so chunks compress in parallel
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as executor:
+        list(executor.map(lambda chunk: chunk.measure(dist, maps), stale))
+    for chunk in chunks:
+        chunk.is_firebase = is_firebase_chunk(chunk)
+    if cache is not None:
+        cache.save(chunks)
+    return chunks
+
+
+def load_budget(path=DEFAULT_BUDGET_FILE):
+    """The budget list from build-budget.json: [{'match', 'raw'|'gzip'|'brotli'}]"""
+    with open(path, 'r', encoding='utf-8') as f:
+        budgets = json.load(f).get('budgets', [])
+    for budget in budgets:
+        if 'match' not in budget:
+            raise ValueError(f"Budget without a 'match' pattern in {path}: {budget}")
+        for metric in ('raw', 'gzip', 'brotli'):
+            if metric in budget:
+                budget[metric] = parse_size(budget[metric])
+    return budgets
+
+
+def _matches(chunk, pattern):
+    if pattern == 'entry':
+        return chunk.is_entry
+    return any(fnmatch.fnmatch(value, pattern) for value in (chunk.name, chunk.path, chunk.key))
+
+
+def check_budgets(chunks, budgets, strict=False):
+    """(violations, gating) - every metric over a matching budget, and those that fail the gate"""
+    violations = []
+    for chunk in chunks:
+        for budget in budgets:
+            if not _matches(chunk, budget['match']):
+                continue
+            for metric in ('raw', 'gzip', 'brotli'):
+                limit = budget.get(metric)
+                actual = getattr(chunk, metric)
+                if limit is not None and actual is not None and actual > limit:
+                    violations.append({'chunk': chunk.label, 'kind': chunk.kind, 'match': budget['match'],
+                                       'metric': metric, 'actual': actual, 'limit': limit,
+                                       'gating': strict or chunk.is_entry or chunk.is_firebase})
+    return violations, [v for v in violations if v['gating']]
+
+
+def initial_budget(chunks, headroom=INIT_HEADROOM):
+    """Budgets for the entry and firebase chunks at their current gzip size plus headroom"""
+    budgets = []
+    for chunk in chunks:
+        if chunk.is_entry or chunk.is_firebase:
+            limit = int(chunk.gzip * (1 + headroom) / 1024 + 1)
+            budgets.append({'match': 'entry' if chunk.is_entry else chunk.label, 'gzip': f"{limit} KB"})
+    return {'budgets': budgets}
+
+
+def print_chunk_table(chunks, top_sources=3):
+    """Per-chunk sizes, growth since the last run and the biggest source modules"""
+    icons = {'entry': '🚪', 'firebase': '🔥', 'chunk': '📄'}
+    print(f"  {'Chunk':<34} {'raw':>10} {'gzip':>10} {'brotli':>10} {'Δ gzip':>10}")
+    for chunk in sorted(chunks, key=lambda c: c.gzip, reverse=True):
+        delta = ""
+        if chunk.previous_gzip is not None and chunk.previous_gzip != chunk.gzip:
+            delta = ("+" if chunk.gzip > chunk.previous_gzip else "-") + format_size(abs(chunk.gzip - chunk.previous_gzip))
+        print(f"  {icons[chunk.kind]} {chunk.label:<32} {format_size(chunk.raw):>10} {format_size(chunk.gzip):>10} "
+              f"{format_size(chunk.brotli):>10} {delta:>10}")
+        if chunk.sources:
+            total = sum(chunk.sources.values()) or 1
+            parts = [f"{owner} {size / total:.0%}" for owner, size in list(chunk.sources.items())[:top_sources]]
+            print(f"     └─ {', '.join(parts)}")
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Check the vite build output in dist/ against the size budget")
+    parser.add_argument('--dist', default=DEFAULT_DIST, help=f"build output directory (default: {DEFAULT_DIST})")
+    parser.add_argument('--maps', default=DEFAULT_MAPS,
+                        help=f"sourcemaps moved out of the build output (default: {DEFAULT_MAPS})")
+    parser.add_argument('--budget', default=DEFAULT_BUDGET_FILE,
+                        help=f"budget file (default: {DEFAULT_BUDGET_FILE})")
+    parser.add_argument('--strict', action='store_true', help="fail on every chunk over budget, not only entry/firebase")
+    parser.add_argument('--no-cache', action='store_true', help="re-measure every chunk")
+    parser.add_argument('--jobs', '-j', type=int, default=None, help="chunks compressed in parallel (default: CPU count)")
+    parser.add_argument('--top-sources', type=int, default=3, help="source modules listed per chunk (default: 3)")
+    parser.add_argument('--init-budget', action='store_true',
+                        help=f"write the budget file from the current build (+{INIT_HEADROOM:.0%} headroom)")
+    parser.add_argument('--json', metavar='PATH', help="also write chunks and violations as JSON")
+    return parser.parse_args(argv)
+
+
+def main(args):
+    """Main function"""
+    print("📦 Build Budget Check")
+    print("=" * 50)
+    if not os.path.isdir(args.dist):
+        print(f"❌ {args.dist}/ not found")
+        print("   → Run: npm run build")
+        return False
+
+    started = time.perf_counter()
+    chunks = analyze_dist(args.dist, cache=None if args.no_cache else BuildCache(), jobs=args.jobs,
+                          maps=args.maps)
+    if not chunks:
+        print(f"❌ No JS/CSS chunks in {args.dist}/")
+        return False
+    measured = sum(1 for chunk in chunks if not chunk.cached)
+    print(f"📁 {args.dist}/: {len(chunks)} chunks, {measured} measured, "
+          f"{len(chunks) - measured} unchanged (cached) in {time.perf_counter() - started:.2f}s")
+    if brotli is None:
+        print("⚠️ brotli is not installed - brotli sizes skipped (pip install brotli)")
+    if not any(chunk.is_entry for chunk in chunks):
+        print("⚠️ No entry chunk found (no .vite/manifest.json or module script in index.html)")
+    if not any(chunk.sources for chunk in chunks if chunk.path.endswith(('.js', '.mjs'))):
+        print(f"⚠️ No sourcemaps in {args.maps}/ or {args.dist}/ - set build.sourcemap in vite.config.ts "
+              f"for source attribution")
+    print()
+    print_chunk_table(chunks, args.top_sources)
+
+    if args.init_budget:
+        with open(args.budget, 'w', encoding='utf-8') as f:
+            json.dump(initial_budget(chunks), f, indent=2)
+            f.write('\n')
+        print(f"\n💾 Budget written to {args.budget}")
+        return True
+
+    try:
+        budgets = load_budget(args.budget)
+    except FileNotFoundError:
+        print(f"\n⚠️ No budget file {args.budget} - run with --init-budget to create one")
+        return True
+    except ValueError as e:
+        print(f"\n❌ Invalid budget file: {e}")
+        return False
+
+    violations, gating = check_budgets(chunks, budgets, args.strict)
+    print("\n🎯 Budget")
+    if not violations:
+        print(f"  ✅ All chunks within budget ({len(budgets)} rules)")
+    for violation in violations:
+        icon = "❌" if violation['gating'] else "⚠️"
+        print(f"  {icon} {violation['chunk']} {violation['metric']} {format_size(violation['actual'])} "
+              f"> {format_size(violation['limit'])} ({violation['match']}, "
+              f"+{format_size(violation['actual'] - violation['limit'])})")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'chunks': [dict(chunk.to_cache(), name=chunk.name, key=chunk.key, kind=chunk.kind) for chunk in chunks],
+                       'violations': violations}, f, indent=2)
+        print(f"\n💾 Report written to {args.json}")
+    if gating:
+        print(f"\n❌ Build budget exceeded ({len(gating)} failing limit(s))")
+    else:
+        print("\n✅ Build is within budget")
+    return not gating
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main(parse_args()) else 1)
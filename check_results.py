@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Structured Check Results for the EduGenie Firebase checkers
+One CheckResult per check (id, status, latency, detail, remediation key),
+emitted as NDJSON the moment a check finishes or collected into a single
+JSON document at the end, so pipelines don't have to scrape emoji output.
+
+While a machine-readable format is active the human-readable report is sent
+to stderr, leaving stdout for the results alone.
+"""
+
+import json
+import sys
+import threading
+from contextlib import contextmanager, nullcontext, redirect_stdout
+from datetime import datetime
+
+FORMATS = ('text', 'ndjson', 'json')
+STATUSES = ('pass', 'warn', 'fail', 'skip')
+
+# Remediation keys and the fix each one stands for
+REMEDIATIONS = {
+    'create-env-file': "Copy .env.example to .env.local and fill in the Firebase web app config",
+    'add-firebase-config': "Copy the missing values from Firebase Console > Project Settings > Your apps",
+    'replace-placeholders': "Replace the 'your-*-here' placeholder values in .env.local with real config",
+    'use-import-meta-env': "Read VITE_* variables through import.meta.env in src/config/firebase.ts",
+    'create-firestore-database': "Create the Firestore database in Firebase Console > Firestore",
+    'enable-authentication': "Enable Email/Password sign-in in Firebase Console > Authentication",
+    'service-account-setup': "Generate a private key under Project Settings > Service accounts",
+    'install-admin-sdk': "pip install firebase-admin google-cloud-firestore",
+    'check-network': "Check network access to *.googleapis.com and retry",
+    'check-project-access': "Verify the project exists and the API key belongs to it",
+    'start-admin-daemon': "Start the warm Admin SDK daemon with: python admin_daemon.py",
+    'deploy-firestore-indexes': "Add the indexes with: python firestore_index_advisor.py --write, "
+                                "then firebase deploy --only firestore:indexes",
+}
+
+# First matching keyword decides the remediation for a failure or warning message
+_REMEDIATION_KEYWORDS = [
+    ('composite index', 'deploy-firestore-indexes'),
+    ('not installed', 'install-admin-sdk'),
+    ('admin daemon', 'start-admin-daemon'),
+    ('.env.local', 'create-env-file'),
+    ('placeholder', 'replace-placeholders'),
+    ('missing or empty', 'add-firebase-config'),
+    ('not created', 'create-firestore-database'),
+    ('process.env', 'use-import-meta-env'),
+    ('firebase.ts', 'use-import-meta-env'),
+    ('service account', 'service-account-setup'),
+    ('timeout', 'check-network'),
+    ('connection', 'check-network'),
+    ('auth', 'enable-authentication'),
+    ('project', 'check-project-access'),
+]
+
+
+def remediation_for(message):
+    """Remediation key for a failure/warning message, or None"""
+    if not message:
+        return None
+    lowered = message.lower()
+    for keyword, key in _REMEDIATION_KEYWORDS:
+        if keyword in lowered:
+            return key
+    return None
+
+
+class CheckResult:
+    """Outcome of one check; status is filled in from the messages it produced"""
+
+    def __init__(self, check_id, status=None, latency_ms=None, detail=None, remediation=None):
+        self.check_id = check_id
+        self.status = status
+        self.latency_ms = latency_ms
+        self.detail = detail
+        self.remediation = remediation
+        # Requests a network check sent for its verdict (retries and hedges included)
+        self.attempts = None
+        self.finished_at = None
+
+    def resolve(self, issues, warnings, successes):
+        """Derive status/detail/remediation from the check's issue, warning and success messages"""
+        if self.status is None:
+            self.status = 'fail' if issues else 'warn' if warnings else 'pass'
+        if self.detail is None:
+            messages = issues or warnings or successes
+            self.detail = messages[0] if messages else None
+        if self.remediation is None and self.status in ('fail', 'warn'):
+            self.remediation = remediation_for(self.detail)
+
+    def to_dict(self):
+        return {
+            'check': self.check_id,
+            'status': self.status,
+            'latency_ms': round(self.latency_ms, 1) if self.latency_ms is not None else None,
+            'detail': self.detail,
+            'remediation': self.remediation,
+            'attempts': self.attempts,
+            'finished_at': self.finished_at,
+        }
+
+
+class ResultReporter:
+    """Collects results and writes them in the selected format"""
+
+    def __init__(self, fmt='text', stream=None):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format {fmt!r}")
+        self.format = fmt
+        # Bound now, before quiet() points sys.stdout at stderr
+        self.stream = stream or sys.stdout
+        self.results = []
+        self._lock = threading.Lock()
+
+    @property
+    def machine_readable(self):
+        return self.format != 'text'
+
+    def emit(self, result):
+        """Record a finished check; safe to call from parallel checks"""
+        result.finished_at = datetime.now().isoformat()
+        with self._lock:
+            self.results.append(result)
+            if self.format == 'ndjson':
+                self.stream.write(json.dumps(result.to_dict()) + "\n")
+                self.stream.flush()
+
+    def summary(self):
+        counts = {status: 0 for status in STATUSES}
+        for result in self.results:
+            counts[result.status] = counts.get(result.status, 0) + 1
+        return counts
+
+    def finish(self, success, **extra):
+        """Write the closing summary line (ndjson) or the whole document (json)"""
+        summary = {'success': bool(success), 'counts': self.summary(), **extra}
+        if self.format == 'ndjson':
+            self.stream.write(json.dumps({'summary': summary}) + "\n")
+        elif self.format == 'json':
+            used = sorted({r.remediation for r in self.results if r.remediation})
+            json.dump({
+                'generated_at': datetime.now().isoformat(),
+                'summary': summary,
+                'results': [r.to_dict() for r in self.results],
+                'remediations': {key: REMEDIATIONS.get(key) for key in used},
+            }, self.stream, indent=2)
+            self.stream.write("\n")
+        self.stream.flush()
+
+    @contextmanager
+    def quiet(self):
+        """Route print() output to stderr while a machine-readable format owns stdout"""
+        with redirect_stdout(sys.stderr) if self.machine_readable else nullcontext():
+            yield
+
+
+def add_format_argument(parser):
+    """Register the shared --format option on an argparse parser"""
+    parser.add_argument('--format', choices=FORMATS, default='text',
+                        help="text report, one JSON result per line as checks finish (ndjson), "
+                             "or a single JSON document (json); default: text")
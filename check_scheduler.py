@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Dependency-Aware Check Scheduler for the EduGenie Firebase checkers
+Checks are registered as units that name the units they depend on. Units
+whose prerequisites have passed run in parallel on a thread pool; units
+downstream of a failed or skipped prerequisite are skipped with a reason.
+
+Each unit's printed output is buffered and written in one piece when the
+unit finishes, so report sections from parallel checks never interleave.
+"""
+
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import redirect_stdout
+
+DEFAULT_JOBS = 4
+
+
+class SkipCheck(Exception):
+    """Raised by a unit that cannot run; its dependents are skipped as well"""
+
+
+class CheckUnit:
+    """A named check plus the units it depends on"""
+
+    def __init__(self, name, func, requires=(), succeeded=bool):
+        self.name = name
+        self.func = func
+        self.requires = tuple(requires)
+        self.succeeded = succeeded
+
+
+class UnitOutcome:
+    """What happened to one unit: passed, failed or skipped"""
+
+    def __init__(self, name, status, value=None, reason=None, elapsed=0.0):
+        self.name = name
+        self.status = status
+        self.value = value
+        self.reason = reason
+        self.elapsed = elapsed
+
+    @property
+    def passed(self):
+        return self.status == 'passed'
+
+
+class _ThreadOutput:
+    """stdout stand-in that buffers writes per worker thread until the unit ends"""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def write(self, text):
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is not None:
+            buffer.append(text)
+        else:
+            with self._lock:
+                self._stream.write(text)
+        return len(text)
+
+    def flush(self):
+        if getattr(self._local, 'buffer', None) is None:
+            self._stream.flush()
+
+    def begin(self):
+        self._local.buffer = []
+
+    def end(self):
+        text = ''.join(self._local.buffer)
+        self._local.buffer = None
+        with self._lock:
+            self._stream.write(text)
+            self._stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+class CheckScheduler:
+    """Runs registered units as a DAG on a thread pool"""
+
+    def __init__(self, jobs=DEFAULT_JOBS):
+        self.jobs = max(1, jobs)
+        self.units = {}
+
+    def add(self, name, func, requires=(), succeeded=bool):
+        """Register a unit; its prerequisites must already be registered, so cycles cannot form"""
+        unknown = [r for r in requires if r not in self.units]
+        if unknown:
+            raise ValueError(f"Unit {name!r} requires unregistered units: {', '.join(unknown)}")
+        self.units[name] = CheckUnit(name, func, requires, succeeded)
+
+    def _execute(self, unit, output):
+        output.begin()
+        started = time.perf_counter()
+        try:
+            value = unit.func()
+            status = 'passed' if unit.succeeded(value) else 'failed'
+            return UnitOutcome(unit.name, status, value, elapsed=time.perf_counter() - started)
+        except SkipCheck as e:
+            return UnitOutcome(unit.name, 'skipped', reason=str(e), elapsed=time.perf_counter() - started)
+        except Exception as e:
+            print(f"  ❌ {unit.name}: Unexpected error - {e}")
+            return UnitOutcome(unit.name, 'failed', reason=str(e), elapsed=time.perf_counter() - started)
+        finally:
+            output.end()
+
+    def run(self, on_skip=None):
+        """Run every unit; returns {name: UnitOutcome} in registration order.
+
+        `on_skip(name, reason)` is called for each skipped unit, whether it
+        raised SkipCheck itself or sat downstream of a prerequisite that did
+        not pass.
+        """
+        outcomes = {}
+        pending = dict(self.units)
+        running = {}
+        output = _ThreadOutput(sys.stdout)
+
+        def skip(name, reason):
+            outcomes[name] = UnitOutcome(name, 'skipped', reason=reason)
+            print(f"⏭️ {name}: skipped - {reason}")
+            if on_skip:
+                on_skip(name, reason)
+
+        with redirect_stdout(output), ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            while pending or running:
+                for name, unit in list(pending.items()):
+                    blocked = [r for r in unit.requires if r in outcomes and not outcomes[r].passed]
+                    if blocked:
+                        del pending[name]
+                        skip(name, f"{blocked[0]} {outcomes[blocked[0]].status}")
+                    elif all(r in outcomes for r in unit.requires):
+                        del pending[name]
+                        running[executor.submit(self._execute, unit, output)] = name
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    outcome = future.result()
+                    outcomes[running.pop(future)] = outcome
+                    if outcome.status == 'skipped' and on_skip:
+                        on_skip(outcome.name, outcome.reason)
+
+        return {name: outcomes[name] for name in self.units}
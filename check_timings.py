@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Startup Timing Report for the EduGenie Firebase checkers
+Records how long a run spends importing modules versus running checks,
+printed when a checker is started with --timings.
+"""
+
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+# Taken when this module is first imported - checkers import it before anything heavy
+PROCESS_START = time.perf_counter()
+
+
+class Timings:
+    """Collects (kind, label, seconds) samples for one run"""
+
+    def __init__(self, started=PROCESS_START):
+        self.started = started
+        self.samples = []
+        self._local = threading.local()
+
+    def record(self, kind, label, seconds):
+        self.samples.append((kind, label, seconds))
+
+    def record_since_start(self, kind, label):
+        """Record the time elapsed since the process (this module) started"""
+        self.record(kind, label, time.perf_counter() - self.started)
+
+    @contextmanager
+    def measure(self, kind, label):
+        """Time a block; time spent in nested measured blocks is not counted twice"""
+        stack = self._local.__dict__.setdefault('stack', [])
+        started = time.perf_counter()
+        stack.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            nested = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            self.record(kind, label, elapsed - nested)
+
+    def timed(self, kind, label):
+        """Decorator form of measure()"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.measure(kind, label):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def total(self, kind):
+        return sum(seconds for sample_kind, _, seconds in self.samples if sample_kind == kind)
+
+    def print_report(self):
+        """Print time spent importing versus checking"""
+        print("\n⏱️ Startup Timings")
+        print("-" * 40)
+        for kind, title in (('import', 'Imports'), ('check', 'Checks')):
+            print(f"  {title}: {self.total(kind):.3f}s")
+            for sample_kind, label, seconds in self.samples:
+                if sample_kind == kind:
+                    print(f"    • {label}: {seconds:.3f}s")
+        print(f"  Wall clock: {time.perf_counter() - self.started:.3f}s")
+
+
+def percentile(sorted_values, pct):
+    """Percentile with linear interpolation between closest ranks"""
+    if not sorted_values:
+        return None
+    rank = (len(sorted_values) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+# Shared instance so lazily imported modules can record into the same report
+timings = Timings()
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Course Duplicate Auditor for EduGenie Platform
+Python counterpart of check-duplicates.js that works on large `courses`
+collections: it pages through the collection with query cursors, keeps only
+a hash-of-normalized-title -> course id index in memory, and writes duplicate
+groups as NDJSON (one group per line, oldest course first).
+
+Usage:
+    python course_duplicate_auditor.py --output course-duplicates.ndjson
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+import time
+import unicodedata
+from datetime import datetime
+
+try:
+    from comprehensive_firebase_checker import ComprehensiveFirebaseChecker, import_admin_sdk
+    from token_cache import TokenCache, cached_certificate
+except ImportError as e:
+    print("❌ Missing required packages. Please install them with:")
+    print("pip install -r requirements-comprehensive-firebase.txt")
+    sys.exit(1)
+
+COURSES_COLLECTION = 'courses'
+DEFAULT_PAGE_SIZE = 1000
+# get_all() round trips used to look up createdAt for duplicate group members
+LOOKUP_BATCH_SIZE = 300
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_title(title):
+    """Case-fold and collapse whitespace so "Intro  to Python " == "intro to python" """
+    if not isinstance(title, str):
+        return ''
+    return _WHITESPACE.sub(' ', unicodedata.normalize('NFKC', title).casefold()).strip()
+
+
+def title_key(normalized):
+    """64-bit digest of a normalized title - the only per-title state the audit keeps"""
+    return int.from_bytes(hashlib.blake2b(normalized.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def created_at_sort_key(value):
+    """Seconds since the epoch for a createdAt value; missing dates sort last"""
+    if value is None:
+        return float('inf')
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, dict):
+        # Timestamp.toJSON() gives {seconds, nanoseconds}; JSON exports often use {_seconds, _nanoseconds}
+        seconds = value.get('seconds', value.get('_seconds'))
+        return float(seconds) if seconds is not None else float('inf')
+    if isinstance(value, (int, float)):
+        # JS Date.now() style milliseconds
+        return value / 1000 if value > 1e11 else float(value)
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return float('inf')
+
+
+def json_created_at(value):
+    """createdAt as a JSON-friendly value for NDJSON output"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value if isinstance(value, (int, float, str, dict, list)) else str(value)
+
+
+def connect_admin(app_name, service_account_path=None):
+    """Initialize a named Admin SDK app; returns (firebase_admin, app, firestore module, db)"""
+    if not service_account_path:
+        checker = ComprehensiveFirebaseChecker()
+        if not checker.find_service_account_file():
+            raise FileNotFoundError("Service account JSON file not found")
+        service_account_path = checker.service_account_path
+    firebase_admin, credentials, auth, firestore = import_admin_sdk()
+    cred = cached_certificate(credentials, service_account_path, TokenCache())
+    app = firebase_admin.initialize_app(cred, name=app_name)
+    return firebase_admin, app, firestore, firestore.client(app=app)
+
+
+def stream_pages(db, firestore, collection=COURSES_COLLECTION, page_size=DEFAULT_PAGE_SIZE,
+                 fields=('title',)):
+    """Yield lists of snapshots, one page at a time, resuming each page from a cursor.
+
+    Short paged queries keep each RPC well inside Firestore's stream deadline
+    and only ever hold one page of documents in memory.
+    """
+    query = db.collection(collection).order_by(firestore.FieldPath.document_id())
+    if fields:
+        query = query.select(list(fields))
+    last = None
+    while True:
+        page_query = query.limit(page_size)
+        if last is not None:
+            page_query = page_query.start_after(last)
+        page = list(page_query.stream())
+        if not page:
+            return
+        yield page
+        if len(page) < page_size:
+            return
+        last = page[-1]
+
+
+class DuplicateIndex:
+    """Title-hash -> first course id, plus member lists for titles seen more than once"""
+
+    def __init__(self):
+        self.first_ids = {}
+        self.groups = {}
+        self.titles = {}
+        self.documents = 0
+        self.untitled = 0
+
+    def add(self, course_id, title):
+        self.documents += 1
+        normalized = normalize_title(title)
+        if not normalized:
+            self.untitled += 1
+            return
+        key = title_key(normalized)
+        first = self.first_ids.setdefault(key, course_id)
+        if first == course_id:
+            return
+        if key not in self.groups:
+            self.groups[key] = [first]
+            self.titles[key] = title
+        self.groups[key].append(course_id)
+
+    @property
+    def redundant(self):
+        return sum(len(ids) - 1 for ids in self.groups.values())
+
+
+def lookup_created_at(db, collection, course_ids):
+    """Fetch createdAt for the given ids with batched get_all() calls"""
+    created = {}
+    course_ids = list(course_ids)
+    for start in range(0, len(course_ids), LOOKUP_BATCH_SIZE):
+        refs = [db.collection(collection).document(i) for i in course_ids[start:start + LOOKUP_BATCH_SIZE]]
+        for snapshot in db.get_all(refs, field_paths=['createdAt']):
+            if snapshot.exists:
+                created[snapshot.id] = (snapshot.to_dict() or {}).get('createdAt')
+    return created
+
+
+def write_groups(out, index, created):
+    """Write one NDJSON line per duplicate group, oldest course first"""
+    for key, ids in index.groups.items():
+        members = sorted(ids, key=lambda i: created_at_sort_key(created.get(i)))
+        out.write(json.dumps({
+            'key': f"{key:016x}",
+            'title': index.titles[key],
+            'count': len(members),
+            'courses': [{'id': i, 'createdAt': json_created_at(created.get(i))} for i in members],
+        }, ensure_ascii=False) + "\n")
+
+
+def audit_courses(db, firestore, out, collection=COURSES_COLLECTION, page_size=DEFAULT_PAGE_SIZE,
+                  progress_every=50000):
+    """Scan the collection, then write duplicate groups to `out`. Returns (index, stats)."""
+    index = DuplicateIndex()
+    pages = 0
+    started = time.perf_counter()
+    next_progress = progress_every
+    for page in stream_pages(db, firestore, collection, page_size):
+        pages += 1
+        for snapshot in page:
+            index.add(snapshot.id, (snapshot.to_dict() or {}).get('title'))
+        if progress_every and index.documents >= next_progress:
+            elapsed = time.perf_counter() - started
+            print(f"   📄 {index.documents:,} courses scanned ({index.documents / elapsed:,.0f} docs/sec)",
+                  file=sys.stderr)
+            next_progress += progress_every
+    scan_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    created = lookup_created_at(db, collection, (i for ids in index.groups.values() for i in ids))
+    write_groups(out, index, created)
+    return index, {'pages': pages, 'scan_seconds': scan_seconds,
+                   'lookup_seconds': time.perf_counter() - started}
+
+
+def peak_memory_mb():
+    """Peak resident memory of this process, or None where resource is unavailable"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def print_audit_report(index, stats, output):
+    """Print totals and throughput (to stderr when groups go to stdout)"""
+    stream = sys.stderr if output == '-' else sys.stdout
+    rate = index.documents / stats['scan_seconds'] if stats['scan_seconds'] else 0.0
+    print("\n📊 COURSE DUPLICATE AUDIT", file=stream)
+    print("=" * 50, file=stream)
+    print(f"  Courses Scanned: {index.documents:,} in {stats['pages']:,} pages", file=stream)
+    print(f"  Unique Titles: {len(index.first_ids):,}", file=stream)
+    print(f"  Untitled Courses: {index.untitled:,}", file=stream)
+    print(f"  Duplicate Groups: {len(index.groups):,} ({index.redundant:,} redundant courses)", file=stream)
+    print(f"  Throughput: {rate:,.0f} docs/sec ({stats['scan_seconds']:.1f}s scan, "
+          f"{stats['lookup_seconds']:.1f}s createdAt lookup)", file=stream)
+    peak = peak_memory_mb()
+    if peak is not None:
+        print(f"  Peak Memory: {peak:.0f} MB", file=stream)
+    if output != '-':
+        print(f"\n📄 Duplicate groups written to {output}", file=stream)
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Find courses with duplicate titles without loading them all")
+    parser.add_argument('--output', '-o', default='course-duplicates.ndjson',
+                        help="NDJSON file for duplicate groups, '-' for stdout (default: course-duplicates.ndjson)")
+    parser.add_argument('--collection', default=COURSES_COLLECTION,
+                        help=f"collection to audit (default: {COURSES_COLLECTION})")
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE,
+                        help=f"documents per cursor page (default: {DEFAULT_PAGE_SIZE})")
+    parser.add_argument('--service-account', metavar='PATH',
+                        help="service account JSON (default: same discovery as the comprehensive checker)")
+    return parser.parse_args(argv)
+
+
+def main(args=None):
+    """Main function"""
+    args = args or parse_args([])
+    log = sys.stderr if args.output == '-' else sys.stdout
+    print("🔍 Course Duplicate Auditor", file=log)
+    print("=" * 50, file=log)
+
+    try:
+        firebase_admin, app, firestore, db = connect_admin('duplicate-auditor', args.service_account)
+    except ImportError:
+        print("❌ firebase-admin is not installed: pip install firebase-admin google-cloud-firestore", file=log)
+        return False
+    except Exception as e:
+        print(f"❌ Admin SDK initialization failed: {e}", file=log)
+        return False
+
+    try:
+        print(f"📚 Scanning '{args.collection}' in pages of {args.page_size}...", file=log)
+        if args.output == '-':
+            index, stats = audit_courses(db, firestore, sys.stdout, args.collection, args.page_size)
+        else:
+            with open(args.output, 'w', encoding='utf-8') as out:
+                index, stats = audit_courses(db, firestore, out, args.collection, args.page_size)
+        print_audit_report(index, stats, args.output)
+        return True
+    except Exception as e:
+        print(f"❌ Audit failed: {e}", file=log)
+        return False
+    finally:
+        firebase_admin.delete_app(app)
+
+
+if __name__ == "__main__":
+    try:
+        success = main(parse_args())
+    except KeyboardInterrupt:
+        print("\n\n❌ Audit interrupted by user")
+        success = False
+    sys.exit(0 if success else 1)
@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Course Detector for EduGenie Platform
+Finds courses that are almost, but not exactly, the same - e.g. re-imported
+YouTube playlists titled "Python Part 1" vs "Python Pt. 1 | SomeChannel".
+
+Each course gets a MinHash signature over title character shingles and
+description word shingles. Candidate pairs come from LSH banding (courses
+sharing any band of their signature), so the work grows with the number of
+courses rather than with every pair of courses. Candidates are verified
+against a Jaccard similarity threshold and merged into clusters.
+
+Signatures use one-permutation hashing: every shingle is hashed once, its low
+bits pick a signature slot and the high bits compete for that slot's minimum.
+That keeps signing cheap enough in pure Python for ~1M courses on one machine.
+
+Usage:
+    python course_near_duplicates.py --export courses.ndjson --threshold 0.8
+    python course_near_duplicates.py --live --output near-duplicates.ndjson
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from course_duplicate_auditor import (
+        COURSES_COLLECTION, DEFAULT_PAGE_SIZE, connect_admin, created_at_sort_key,
+        json_created_at, normalize_title, peak_memory_mb, stream_pages
+    )
+except ImportError as e:
+    print("❌ Missing required packages. Please install them with:")
+    print("pip install -r requirements-comprehensive-firebase.txt")
+    sys.exit(1)
+
+DEFAULT_NUM_HASHES = 64
+DEFAULT_BANDS = 16
+DEFAULT_THRESHOLD = 0.8
+SHINGLE_SIZE = 4
+# Only the start of the description is shingled, so long shared boilerplate
+# (channel links, sponsor blurbs) cannot outweigh the title
+DESCRIPTION_WORDS = 40
+CHUNK_SIZE = 2000
+# Members of a cluster a joining course is compared with. Bounded, so one huge
+# family of exact duplicates (a re-imported playlist) costs O(k²) per merge
+REPRESENTATIVES = 8
+
+_EMPTY = 0xFFFFFFFF
+_ROTATION = 0x9E3779B1
+_PUNCTUATION = re.compile(r'[^\w\s]')
+_NUMBER = re.compile(r'\d+')
+# Abbreviations that show up in re-imported playlist titles
+_ALIASES = {
+    'pt': 'part', 'ep': 'episode', 'vol': 'volume', 'ch': 'chapter',
+    'lec': 'lecture', 'tut': 'tutorial', 'intro': 'introduction', 'no': 'number',
+}
+
+
+def canonical_text(text):
+    """normalize_title plus punctuation stripping and abbreviation expansion"""
+    words = _PUNCTUATION.sub(' ', normalize_title(text)).split()
+    return ' '.join(_ALIASES.get(word, word) for word in words)
+
+
+def shingles(title, description=''):
+    """Character shingles of the title plus word 3-grams of the description start"""
+    result = set()
+    title = canonical_text(title)
+    if title:
+        padded = f" {title} "
+        if len(padded) <= SHINGLE_SIZE:
+            result.add(padded)
+        else:
+            result.update(padded[i:i + SHINGLE_SIZE] for i in range(len(padded) - SHINGLE_SIZE + 1))
+    words = canonical_text(description).split()[:DESCRIPTION_WORDS]
+    result.update('d:' + ' '.join(words[i:i + 3]) for i in range(len(words) - 2))
+    return result
+
+
+def minhash_signature(shingle_set, num_hashes=DEFAULT_NUM_HASHES):
+    """One-permutation MinHash signature, or None for an empty shingle set.
+
+    Slots no shingle landed in borrow the next filled slot's value (rotation
+    densification), so short titles still get comparable signatures.
+    """
+    if not shingle_set:
+        return None
+    mask = num_hashes - 1
+    signature = [_EMPTY] * num_hashes
+    for shingle in shingle_set:
+        h = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little')
+        slot = h & mask
+        value = h >> 32
+        if value < signature[slot]:
+            signature[slot] = value
+    if _EMPTY in signature:
+        dense = list(signature)
+        for slot in range(num_hashes):
+            if signature[slot] == _EMPTY:
+                distance = 1
+                while signature[(slot + distance) & mask] == _EMPTY:
+                    distance += 1
+                dense[slot] = (signature[(slot + distance) & mask] + distance * _ROTATION) & 0xFFFFFFFF
+        signature = dense
+    return signature
+
+
+def title_numbers(title):
+    """Numbers in a title - "Part 1" and "Part 2" must not merge however similar the rest is"""
+    return tuple(_NUMBER.findall(title)) if isinstance(title, str) else ()
+
+
+def _signature_chunk(texts, num_hashes):
+    """Worker entry point: signatures for a chunk of (title, description) pairs"""
+    results = []
+    for title, description in texts:
+        signature = minhash_signature(shingles(title, description), num_hashes)
+        results.append(array('I', signature).tobytes() if signature else None)
+    return results
+
+
+class NearDuplicateIndex:
+    """Flat signature store with LSH banding and union-find clustering"""
+
+    def __init__(self, num_hashes=DEFAULT_NUM_HASHES, bands=DEFAULT_BANDS):
+        if num_hashes & (num_hashes - 1) or num_hashes % bands:
+            raise ValueError("num_hashes must be a power of two divisible by bands")
+        self.num_hashes = num_hashes
+        self.bands = bands
+        self.rows = num_hashes // bands
+        self.ids = []
+        self.titles = []
+        self.created = []
+        self.numbers = []
+        self.signatures = array('I')
+        self.documents = 0
+        self.skipped = 0
+        self.candidate_pairs = 0
+        self.verified_pairs = 0
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, course_id, data, signature_bytes):
+        self.documents += 1
+        if signature_bytes is None:
+            self.skipped += 1
+            return
+        self.ids.append(course_id)
+        self.titles.append(data.get('title'))
+        self.created.append(json_created_at(data.get('createdAt')))
+        numbers = title_numbers(data.get('title'))
+        self.numbers.append(numbers or None)
+        self.signatures.frombytes(signature_bytes)
+
+    def similarity(self, a, b):
+        """Estimated Jaccard similarity: share of signature slots that agree"""
+        k = self.num_hashes
+        sa = self.signatures[a * k:(a + 1) * k]
+        sb = self.signatures[b * k:(b + 1) * k]
+        return sum(1 for x, y in zip(sa, sb) if x == y) / k
+
+    def _candidates(self):
+        """(earlier, later) index pairs that share at least one band; one band in memory at a time"""
+        view = memoryview(self.signatures)
+        k, rows = self.num_hashes, self.rows
+        for band in range(self.bands):
+            buckets = {}
+            offset = band * rows
+            for i in range(len(self)):
+                start = i * k + offset
+                first = buckets.setdefault(view[start:start + rows].tobytes(), i)
+                if first != i:
+                    yield first, i
+
+    def clusters(self, threshold=DEFAULT_THRESHOLD):
+        """Lists of indexes whose members are all similar to the cluster's representatives.
+
+        Checking only the candidate pair would let "Part 1" ~ "Part" ~ "Part 2"
+        chain two different parts into one cluster, so two clusters merge only
+        if their title numbers agree and every pair of their first
+        REPRESENTATIVES members is similar.
+        """
+        parent = list(range(len(self)))
+        # Per root, for clusters of two or more: size, representatives, title numbers
+        sizes, representatives, numbers = {}, {}, {}
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for a, b in self._candidates():
+            self.candidate_pairs += 1
+            root_a, root_b = find(a), find(b)
+            if root_a == root_b:
+                continue
+            self.verified_pairs += 1
+            numbers_a = numbers.get(root_a, self.numbers[root_a])
+            numbers_b = numbers.get(root_b, self.numbers[root_b])
+            if numbers_a and numbers_b and numbers_a != numbers_b:
+                continue
+            reps_a = representatives.get(root_a, [root_a])
+            reps_b = representatives.get(root_b, [root_b])
+            if not all(self.similarity(x, y) >= threshold for x in reps_a for y in reps_b):
+                continue
+            # Merge the smaller cluster into the larger one, extending its lists in place
+            if sizes.get(root_a, 1) < sizes.get(root_b, 1):
+                root_a, root_b, reps_a, reps_b = root_b, root_a, reps_b, reps_a
+            parent[root_b] = root_a
+            sizes[root_a] = sizes.get(root_a, 1) + sizes.pop(root_b, 1)
+            reps_a.extend(reps_b[:REPRESENTATIVES - len(reps_a)])
+            representatives[root_a] = reps_a
+            representatives.pop(root_b, None)
+            numbers[root_a] = numbers_a or numbers_b
+            numbers.pop(root_b, None)
+
+        # Only courses that joined a cluster get a list; singletons stay as ints
+        for i in range(len(self)):
+            parent[i] = find(i)
+        groups = {root: [] for i, root in enumerate(parent) if root != i}
+        for i, root in enumerate(parent):
+            if root in groups:
+                groups[root].append(i)
+        return list(groups.values())
+
+
+def write_clusters(out, index, clusters):
+    """One NDJSON line per cluster, oldest course first, similarity measured against it"""
+    written = 0
+    for members in clusters:
+        members.sort(key=lambda i: created_at_sort_key(index.created[i]))
+        keep = members[0]
+        scores = [index.similarity(keep, i) for i in members[1:]]
+        out.write(json.dumps({
+            'title': index.titles[keep],
+            'count': len(members),
+            'min_similarity': round(min(scores), 3),
+            'courses': [
+                {'id': index.ids[i], 'title': index.titles[i], 'createdAt': index.created[i],
+                 'similarity': 1.0 if i == keep else round(score, 3)}
+                for i, score in zip(members, [1.0] + scores)
+            ],
+        }, ensure_ascii=False) + "\n")
+        written += 1
+    return written
+
+
+def iter_export(path):
+    """(id, data) pairs from a JSON export: NDJSON lines, a list, or an {id: data} map"""
+    def course_id(data, fallback):
+        return str(data.get('id') or data.get('__id__') or data.get('_id') or fallback)
+
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith(('.ndjson', '.jsonl')):
+            for line_number, line in enumerate(f, 1):
+                if line.strip():
+                    data = json.loads(line)
+                    yield course_id(data, line_number), data
+            return
+        exported = json.load(f)
+
+    if isinstance(exported, dict) and COURSES_COLLECTION in exported:
+        exported = exported[COURSES_COLLECTION]
+    if isinstance(exported, dict):
+        for key, data in exported.items():
+            yield key, data
+    else:
+        for position, data in enumerate(exported):
+            yield course_id(data, position), data
+
+
+def iter_live(db, firestore, collection=COURSES_COLLECTION, page_size=DEFAULT_PAGE_SIZE):
+    """(id, data) pairs streamed from Firestore with cursor paging"""
+    for page in stream_pages(db, firestore, collection, page_size, fields=('title', 'description', 'createdAt')):
+        for snapshot in page:
+            yield snapshot.id, snapshot.to_dict() or {}
+
+
+def _chunks(records, size):
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def build_index(records, num_hashes=DEFAULT_NUM_HASHES, bands=DEFAULT_BANDS, workers=None):
+    """Sign every course, spreading chunks over `workers` processes with bounded read-ahead"""
+    index = NearDuplicateIndex(num_hashes, bands)
+
+    def texts(chunk):
+        # Workers only need the shingled text; the description is cut well past DESCRIPTION_WORDS
+        return [(data.get('title'), str(data.get('description') or '')[:1000]) for _, data in chunk]
+
+    def collect(chunk, signatures):
+        for (course_id, data), signature in zip(chunk, signatures):
+            index.add(course_id, data, signature)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for chunk in _chunks(records, CHUNK_SIZE):
+            collect(chunk, _signature_chunk(texts(chunk), num_hashes))
+        return index
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in _chunks(records, CHUNK_SIZE):
+            pending.append((chunk, executor.submit(_signature_chunk, texts(chunk), num_hashes)))
+            if len(pending) >= workers * 2:
+                chunk, future = pending.popleft()
+                collect(chunk, future.result())
+        while pending:
+            chunk, future = pending.popleft()
+            collect(chunk, future.result())
+    return index
+
+
+def print_report(index, clusters, stats, output):
+    """Print totals and throughput (to stderr when clusters go to stdout)"""
+    stream = sys.stderr if output == '-' else sys.stdout
+    rate = index.documents / stats['sign_seconds'] if stats['sign_seconds'] else 0.0
+    print("\n📊 NEAR-DUPLICATE COURSE REPORT", file=stream)
+    print("=" * 50, file=stream)
+    print(f"  Courses Read: {index.documents:,} ({index.skipped:,} without title/description)", file=stream)
+    print(f"  Signatures: {index.num_hashes} slots, {index.bands} bands x {index.rows} rows", file=stream)
+    print(f"  Candidate Pairs: {index.candidate_pairs:,} ({index.verified_pairs:,} verified)", file=stream)
+    print(f"  Clusters: {len(clusters):,} covering {sum(len(c) for c in clusters):,} courses", file=stream)
+    print(f"  Signing: {stats['sign_seconds']:.1f}s ({rate:,.0f} docs/sec), "
+          f"LSH + clustering: {stats['cluster_seconds']:.1f}s", file=stream)
+    peak = peak_memory_mb()
+    if peak is not None:
+        print(f"  Peak Memory: {peak:.0f} MB", file=stream)
+    if output != '-':
+        print(f"\n📄 Clusters written to {output}", file=stream)
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Find near-duplicate courses with MinHash and LSH")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--export', metavar='PATH',
+                        help="JSON/NDJSON export of the courses collection")
+    source.add_argument('--live', action='store_true', help="stream courses from Firestore")
+    parser.add_argument('--output', '-o', default='near-duplicates.ndjson',
+                        help="NDJSON file for clusters, '-' for stdout (default: near-duplicates.ndjson)")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f"minimum estimated Jaccard similarity (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument('--num-hashes', type=int, default=DEFAULT_NUM_HASHES,
+                        help=f"signature slots, a power of two (default: {DEFAULT_NUM_HASHES})")
+    parser.add_argument('--bands', type=int, default=DEFAULT_BANDS,
+                        help=f"LSH bands; more bands find lower similarities (default: {DEFAULT_BANDS})")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="processes used for signing (default: number of CPUs)")
+    parser.add_argument('--collection', default=COURSES_COLLECTION,
+                        help=f"collection for --live (default: {COURSES_COLLECTION})")
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE,
+                        help=f"documents per cursor page for --live (default: {DEFAULT_PAGE_SIZE})")
+    parser.add_argument('--service-account', metavar='PATH', help="service account JSON for --live")
+    return parser.parse_args(argv)
+
+
+def main(args):
+    """Main function"""
+    log = sys.stderr if args.output == '-' else sys.stdout
+    print("🧬 Near-Duplicate Course Detector", file=log)
+    print("=" * 50, file=log)
+
+    firebase_admin = app = None
+    if args.live:
+        try:
+            firebase_admin, app, firestore, db = connect_admin('near-duplicates', args.service_account)
+        except ImportError:
+            print("❌ firebase-admin is not installed: pip install firebase-admin google-cloud-firestore", file=log)
+            return False
+        except Exception as e:
+            print(f"❌ Admin SDK initialization failed: {e}", file=log)
+            return False
+        records = iter_live(db, firestore, args.collection, args.page_size)
+        print(f"📚 Streaming '{args.collection}' from Firestore...", file=log)
+    else:
+        records = iter_export(args.export)
+        print(f"📚 Reading export {args.export}...", file=log)
+
+    try:
+        started = time.perf_counter()
+        index = build_index(records, args.num_hashes, args.bands, args.workers)
+        stats = {'sign_seconds': time.perf_counter() - started}
+
+        started = time.perf_counter()
+        clusters = index.clusters(args.threshold)
+        stats['cluster_seconds'] = time.perf_counter() - started
+
+        if args.output == '-':
+            write_clusters(sys.stdout, index, clusters)
+        else:
+            with open(args.output, 'w', encoding='utf-8') as out:
+                write_clusters(out, index, clusters)
+        print_report(index, clusters, stats, args.output)
+        return True
+    except Exception as e:
+        # Includes Firestore / google.api_core errors while streaming --live
+        print(f"❌ Near-duplicate scan failed: {e}", file=log)
+        return False
+    finally:
+        if app is not None:
+            firebase_admin.delete_app(app)
+
+
+if __name__ == "__main__":
+    try:
+        success = main(parse_args())
+    except KeyboardInterrupt:
+        print("\n\n❌ Scan interrupted by user")
+        success = False
+    sys.exit(0 if success else 1)
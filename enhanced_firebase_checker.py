@@ -4,52 +4,46 @@ Enhanced Firebase Configuration Checker for EduGenie Platform
 This script verifies Firebase Authentication and Firestore setup with detailed configuration guidance.
 """
 
-import os
-import json
+import argparse
 import sys
-from datetime import datetime
-import re
 try:
-    import requests
-    import urllib.parse
+    from firebase_probes import client_probes
+    from firebase_check_engine import run_profiles
+    from check_scheduler import DEFAULT_JOBS
+    from check_results import ResultReporter, add_format_argument
+    from env_loader import existing_env_files, load_vite_env
+    from probe_cache import add_cache_arguments, cache_from_args
+    from firebase_bench import (StandInServer, run_benchmark, summarize,
+                                print_bench_report, write_samples_csv)
 except ImportError as e:
     print("❌ Missing required packages. Please install them with:")
-    print("pip install requests")
+    print("pip install -r requirements-firebase-check.txt")
     sys.exit(1)
 
 class FirebaseConfigChecker:
-    def __init__(self):
+    def __init__(self, cache=None):
         self.env_vars = {}
+        self.cache = cache
         self.issues = []
         self.warnings = []
         self.success_messages = []
         
     def load_env_file(self):
-        """Load environment variables from .env.local file"""
-        env_file = '.env.local'
-        
-        if not os.path.exists(env_file):
-            self.issues.append(f"Environment file {env_file} not found!")
+        """Load environment variables from the .env / .env.local layers"""
+        if not existing_env_files():
+            self.issues.append("Environment file .env.local not found!")
             return False
         
         try:
-            with open(env_file, 'r', encoding='utf-8') as f:
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    if line and not line.startswith('#') and '=' in line:
-                        try:
-                            key, value = line.split('=', 1)
-                            self.env_vars[key.strip()] = value.strip().strip('"').strip("'")
-                        except ValueError:
-                            self.warnings.append(f"Line {line_num}: Invalid format - {line}")
+            self.env_vars = load_vite_env()
             return True
         except Exception as e:
-            self.issues.append(f"Error reading {env_file}: {e}")
+            self.issues.append(f"Error reading environment files: {e}")
             return False
 
     def check_env_file_exists(self):
         """Check if .env.local exists, if not provide setup instructions"""
-        if not os.path.exists('.env.local'):
+        if not existing_env_files():
             print("❌ Firebase Environment Configuration Missing!")
             print("=" * 60)
             print()
@@ -78,351 +72,107 @@ class FirebaseConfigChecker:
             return False
         return True
 
-    def validate_config_format(self):
-        """Validate Firebase configuration format and values"""
-        print("🔍 Configuration Format Validation")
-        print("-" * 40)
-        
-        # Required Firebase config keys
-        required_keys = [
-            'VITE_FIREBASE_API_KEY',
-            'VITE_FIREBASE_AUTH_DOMAIN', 
-            'VITE_FIREBASE_PROJECT_ID',
-            'VITE_FIREBASE_STORAGE_BUCKET',
-            'VITE_FIREBASE_MESSAGING_SENDER_ID',
-            'VITE_FIREBASE_APP_ID'
-        ]
-        
-        config_valid = True
-        
-        for key in required_keys:
-            if key in self.env_vars and self.env_vars[key]:
-                value = self.env_vars[key]
-                if value in ['your-api-key-here', 'your-project-id', 'your-app-id-here', 'demo-api-key']:
-                    print(f"  ⚠️ {key}: Using placeholder value - needs real Firebase config")
-                    self.warnings.append(f"{key} contains placeholder value")
-                    config_valid = False
-                else:
-                    print(f"  ✅ {key}: {value[:20]}...")
-                    self.success_messages.append(f"{key} configured")
-            else:
-                print(f"  ❌ {key}: Missing or empty")
-                self.issues.append(f"{key} is missing or empty")
-                config_valid = False
-        
-        return config_valid
-
-    def validate_firebase_urls(self):
-        """Validate Firebase URL formats and consistency"""
-        print("\n🔗 URL Format & Consistency Check")
-        print("-" * 40)
-        
-        project_id = self.env_vars.get('VITE_FIREBASE_PROJECT_ID', '')
-        auth_domain = self.env_vars.get('VITE_FIREBASE_AUTH_DOMAIN', '')
-        storage_bucket = self.env_vars.get('VITE_FIREBASE_STORAGE_BUCKET', '')
-        api_key = self.env_vars.get('VITE_FIREBASE_API_KEY', '')
-        
-        # Validate project ID format
-        if project_id:
-            if re.match(r'^[a-z0-9-]+$', project_id) and not project_id.startswith('-') and not project_id.endswith('-'):
-                print(f"  ✅ Project ID format: Valid ({project_id})")
-            else:
-                print(f"  ❌ Project ID format: Invalid ({project_id})")
-                self.issues.append("Project ID format is invalid")
-        
-        # Check auth domain consistency
-        expected_auth_domain = f"{project_id}.firebaseapp.com"
-        if auth_domain == expected_auth_domain:
-            print(f"  ✅ Auth Domain: Consistent with project ID")
-        elif auth_domain:
-            print(f"  ⚠️ Auth Domain: Expected {expected_auth_domain}, got {auth_domain}")
-            self.warnings.append("Auth domain doesn't match project ID")
-        
-        # Check storage bucket format
-        expected_storage_formats = [
-            f"{project_id}.appspot.com",
-            f"{project_id}.firebasestorage.app"
-        ]
-        if storage_bucket in expected_storage_formats:
-            print(f"  ✅ Storage Bucket: Valid format")
-        elif storage_bucket:
-            print(f"  ⚠️ Storage Bucket: Unexpected format ({storage_bucket})")
-            self.warnings.append("Storage bucket format is unusual")
+    def run_benchmark(self, iterations, concurrency=1, csv_path=None, base_url=None):
+        """Benchmark the connectivity endpoints and report tail latency per endpoint"""
+        print("🏁 Firebase Endpoint Benchmark")
+        print("=" * 60)
         
-        # Check API key format
-        if api_key and api_key.startswith('AIza') and len(api_key) > 30:
-            print(f"  ✅ API Key: Valid format")
-        elif api_key:
-            print(f"  ❌ API Key: Invalid format (should start with 'AIza')")
-            self.issues.append("API key format is invalid")
-
-    def test_firebase_connectivity(self):
-        """Test Firebase services connectivity"""
-        project_id = self.env_vars.get('VITE_FIREBASE_PROJECT_ID')
-        api_key = self.env_vars.get('VITE_FIREBASE_API_KEY')
+        if base_url is None:
+            if not self.check_env_file_exists() or not self.load_env_file():
+                return False
+        else:
+            self.load_env_file()
         
+        # A stand-in server does not care about real credentials
+        project_id = self.env_vars.get('VITE_FIREBASE_PROJECT_ID') or ('demo-project' if base_url else None)
+        api_key = self.env_vars.get('VITE_FIREBASE_API_KEY') or ('demo-api-key' if base_url else None)
         if not project_id or not api_key:
-            print("\n❌ Cannot test connectivity - missing project ID or API key")
-            return {}
+            print("❌ Cannot benchmark - missing project ID or API key")
+            return False
         
-        print(f"\n🌐 Testing Firebase Connectivity")
         print(f"Project: {project_id}")
-        print("-" * 40)
-        
-        test_results = {}
-        
-        # Test Firebase Auth REST API
-        try:
-            auth_url = f"https://identitytoolkit.googleapis.com/v1/accounts:signUp?key={api_key}"
-            response = requests.post(auth_url, json={}, timeout=10)
-            
-            if response.status_code == 400:  # Expected for empty request
-                print("  ✅ Firebase Authentication API: Accessible")
-                test_results['auth'] = True
-                self.success_messages.append("Authentication service is accessible")
-            else:
-                print(f"  ⚠️ Firebase Authentication API: Unexpected response ({response.status_code})")
-                test_results['auth'] = False
-                self.warnings.append(f"Authentication API returned status {response.status_code}")
-                
-        except requests.exceptions.Timeout:
-            print("  ❌ Firebase Authentication API: Connection timeout")
-            test_results['auth'] = False
-            self.issues.append("Authentication API connection timeout")
-        except Exception as e:
-            print(f"  ❌ Firebase Authentication API: Connection failed - {e}")
-            test_results['auth'] = False
-            self.issues.append(f"Authentication API error: {e}")
+        print(f"Target: {base_url or 'live Firebase endpoints'}")
+        print(f"Requests: {iterations} per endpoint, concurrency {concurrency}")
         
-        # Test Firestore REST API
-        try:
-            firestore_url = f"https://firestore.googleapis.com/v1/projects/{project_id}/databases/(default)/documents"
-            response = requests.get(firestore_url, timeout=10)
-            
-            if response.status_code in [200, 401, 403]:  # 401/403 are OK - means service exists
-                print("  ✅ Firestore Database API: Accessible")
-                test_results['firestore'] = True
-                self.success_messages.append("Firestore service is accessible")
-            else:
-                print(f"  ❌ Firestore Database API: Error ({response.status_code})")
-                test_results['firestore'] = False
-                self.issues.append(f"Firestore API returned status {response.status_code}")
-                
-        except requests.exceptions.Timeout:
-            print("  ❌ Firestore Database API: Connection timeout")
-            test_results['firestore'] = False
-            self.issues.append("Firestore API connection timeout")
-        except Exception as e:
-            print(f"  ❌ Firestore Database API: Connection failed - {e}")
-            test_results['firestore'] = False
-            self.issues.append(f"Firestore API error: {e}")
+        samples, wall_clock = run_benchmark(
+            client_probes(project_id, api_key, base_url), iterations, concurrency
+        )
+        summary = summarize(samples, wall_clock)
+        print_bench_report(summary, wall_clock, concurrency)
         
-        # Test Firebase project validity
-        try:
-            config_url = f"https://{project_id}.firebaseapp.com/__/firebase/init.json"
-            response = requests.get(config_url, timeout=10)
-            
-            if response.status_code == 200:
-                print("  ✅ Firebase Project: Valid and accessible")
-                test_results['project'] = True
-                self.success_messages.append("Firebase project is valid")
-            else:
-                print(f"  ⚠️ Firebase Project: Response ({response.status_code})")
-                test_results['project'] = False
-                self.warnings.append(f"Project validation returned status {response.status_code}")
-                
-        except requests.exceptions.Timeout:
-            print("  ❌ Firebase Project: Connection timeout")
-            test_results['project'] = False
-            self.issues.append("Project validation timeout")
-        except Exception as e:
-            print(f"  ❌ Firebase Project: Connection failed - {e}")
-            test_results['project'] = False
-            self.issues.append(f"Project validation error: {e}")
+        if csv_path:
+            write_samples_csv(csv_path, samples)
+            print(f"  📄 Raw samples written to {csv_path}")
         
-        return test_results
+        return all(stats['error_rate'] == 0 for stats in summary.values())
 
-    def provide_configuration_guidance(self):
-        """Provide detailed configuration guidance based on issues found"""
-        if not self.issues and not self.warnings:
-            return
+    def run_complete_check(self, jobs=DEFAULT_JOBS, reporter=None):
+        """Run the complete Firebase configuration check (the engine's 'enhanced' profile)"""
+        print("🚀 Enhanced Firebase Configuration Checker")
+        print("🎯 EduGenie Platform")
+        print("=" * 60)
+        print()
         
-        print("\n🛠️ Configuration Guidance")
-        print("=" * 50)
+        # Step 1: Check if .env.local exists, with setup steps if not; the
+        # engine's environment check still reports it as a result
+        self.check_env_file_exists()
         
-        if self.issues:
-            print("\n❌ CRITICAL ISSUES (Must Fix):")
-            for i, issue in enumerate(self.issues, 1):
-                print(f"  {i}. {issue}")
-            
-            print("\n🔧 How to Fix Critical Issues:")
+        # Steps 2-7: config, URL formats, connectivity, guidance and report
+        return run_profiles(['enhanced'], jobs=jobs, cache=self.cache, reporter=reporter)
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Enhanced Firebase configuration checker")
+    add_cache_arguments(parser)
+    parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS,
+                        help=f"checks to run in parallel once their prerequisites pass (default: {DEFAULT_JOBS})")
+    bench = parser.add_argument_group('benchmark mode')
+    bench.add_argument('--bench', type=int, metavar='N',
+                       help="send N requests to each endpoint and report latency percentiles")
+    bench.add_argument('--concurrency', type=int, default=1, metavar='C',
+                       help="requests in flight at once during --bench (default: 1)")
+    bench.add_argument('--csv', metavar='PATH', help="write raw --bench samples to a CSV file")
+    bench.add_argument('--base-url', metavar='URL',
+                       help="send --bench requests to this server instead of Google (e.g. an emulator)")
+    bench.add_argument('--stand-in', action='store_true',
+                       help="start a local stand-in server and benchmark against it (offline/CI)")
+    add_format_argument(parser)
+    return parser.parse_args(argv)
+
+def main(args=None):
+    """Main function"""
+    args = args or parse_args([])
+    reporter = ResultReporter(args.format)
+    # Keep stdout clean for --format ndjson/json
+    with reporter.quiet():
+        try:
+            checker = FirebaseConfigChecker(cache=cache_from_args(args))
             
-            if any("Environment file" in issue for issue in self.issues):
-                print("\n📁 Missing .env.local file:")
-                print("  1. Copy .env.example to .env.local")
-                print("  2. Edit .env.local with your Firebase project values")
-                print("  3. Get values from Firebase Console > Project Settings")
+            if args.bench:
+                if args.stand_in:
+                    with StandInServer() as server:
+                        return checker.run_benchmark(args.bench, args.concurrency, args.csv, server.base_url)
+                return checker.run_benchmark(args.bench, args.concurrency, args.csv, args.base_url)
             
-            if any("missing or empty" in issue.lower() for issue in self.issues):
-                print("\n🔑 Missing Firebase Configuration:")
-                print("  1. Go to https://console.firebase.google.com/")
-                print("  2. Select your project")
-                print("  3. Go to Project Settings > General")
-                print("  4. Scroll to 'Your apps' > Web app")
-                print("  5. Copy config values to .env.local")
+            success = checker.run_complete_check(args.jobs, reporter)
             
-            if any("placeholder" in issue.lower() for issue in self.issues):
-                print("\n🔄 Replace Placeholder Values:")
-                print("  1. Open .env.local file")
-                print("  2. Replace all 'your-*-here' values with real Firebase config")
-                print("  3. Get real values from Firebase Console")
+            if success:
+                print("\n🎊 Configuration check completed successfully!")
+                print("🚀 Your Firebase setup is ready for development!")
+            else:
+                print("\n⚠️ Configuration check found issues that need attention.")
+                print("💡 Follow the guidance above to resolve them.")
             
-            if any("api" in issue.lower() for issue in self.issues):
-                print("\n🌐 API Connection Issues:")
-                print("  1. Check your internet connection")
-                print("  2. Verify Firebase project exists and is active")
-                print("  3. Ensure API key is correct and has proper permissions")
-                print("  4. Check if Firebase services are enabled in console")
-        
-        if self.warnings:
-            print("\n⚠️ WARNINGS (Recommended Fixes):")
-            for i, warning in enumerate(self.warnings, 1):
-                print(f"  {i}. {warning}")
-
-    def generate_final_report(self, test_results):
-        """Generate comprehensive final status report"""
-        print("\n📊 Firebase Configuration Status Report")
-        print("=" * 60)
-        
-        project_id = self.env_vars.get('VITE_FIREBASE_PROJECT_ID', 'Unknown')
-        print(f"🔥 Project: {project_id}")
-        print(f"⏰ Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print()
-        
-        # Overall status
-        critical_issues = len(self.issues)
-        warnings = len(self.warnings)
-        working_services = sum(1 for result in test_results.values() if result)
-        total_services = len(test_results)
-        
-        if critical_issues == 0 and working_services == total_services:
-            print("🎉 STATUS: EXCELLENT")
-            print("✅ All Firebase services are properly configured and working!")
-        elif critical_issues == 0:
-            print("✅ STATUS: GOOD")
-            print("✅ Firebase is configured, but some services may have minor issues")
-        elif critical_issues <= 2:
-            print("⚠️ STATUS: NEEDS ATTENTION")
-            print("❌ Some configuration issues need to be resolved")
-        else:
-            print("❌ STATUS: CRITICAL ISSUES")
-            print("❌ Multiple configuration problems require immediate attention")
-        
-        print()
-        
-        # Service status summary
-        if test_results:
-            print("🔧 Service Status:")
-            services = [
-                ("Authentication", test_results.get('auth', False)),
-                ("Firestore Database", test_results.get('firestore', False)),
-                ("Project Validity", test_results.get('project', False))
-            ]
+            return success
             
-            for service, status in services:
-                icon = "✅" if status else "❌"
-                status_text = "Working" if status else "Issues"
-                print(f"  {icon} {service}: {status_text}")
-        
-        # Statistics
-        print(f"\n📈 Summary Statistics:")
-        print(f"  • Critical Issues: {critical_issues}")
-        print(f"  • Warnings: {warnings}")
-        print(f"  • Working Services: {working_services}/{total_services}")
-        print(f"  • Success Messages: {len(self.success_messages)}")
-        
-        # Quick links
-        if project_id != 'Unknown':
-            print(f"\n🔗 Firebase Console Links:")
-            print(f"  • Main Console: https://console.firebase.google.com/project/{project_id}")
-            print(f"  • Authentication: https://console.firebase.google.com/project/{project_id}/authentication")
-            print(f"  • Firestore: https://console.firebase.google.com/project/{project_id}/firestore")
-            print(f"  • Project Settings: https://console.firebase.google.com/project/{project_id}/settings/general")
-        
-        # Next steps
-        print(f"\n📋 Next Steps:")
-        if critical_issues > 0:
-            print("  1. Fix critical issues listed above")
-            print("  2. Re-run this checker to verify fixes")
-            print("  3. Test your application")
-        elif warnings > 0:
-            print("  1. Review and address warnings if needed")
-            print("  2. Test your application functionality")
-        else:
-            print("  1. ✅ Configuration is ready!")
-            print("  2. Start developing your application")
-            print("  3. Run periodic checks to ensure continued functionality")
-        
-        return critical_issues == 0
-
-    def run_complete_check(self):
-        """Run the complete Firebase configuration check"""
-        print("🚀 Enhanced Firebase Configuration Checker")
-        print("🎯 EduGenie Platform")
-        print("=" * 60)
-        print()
-        
-        # Step 1: Check if .env.local exists
-        if not self.check_env_file_exists():
+        except KeyboardInterrupt:
+            print("\n\n⏹️ Check cancelled by user")
             return False
-        
-        # Step 2: Load environment variables
-        if not self.load_env_file():
-            print("❌ Failed to load environment configuration")
+        except Exception as e:
+            print(f"\n❌ Unexpected error during check: {e}")
+            print("💡 Try running the checker again or check your Python environment")
             return False
-        
-        # Step 3: Validate configuration format
-        config_valid = self.validate_config_format()
-        
-        # Step 4: Validate URL formats
-        self.validate_firebase_urls()
-        
-        # Step 5: Test connectivity (only if basic config is valid)
-        test_results = {}
-        if config_valid:
-            test_results = self.test_firebase_connectivity()
-        
-        # Step 6: Provide guidance for any issues
-        self.provide_configuration_guidance()
-        
-        # Step 7: Generate final report
-        success = self.generate_final_report(test_results)
-        
-        return success
-
-def main():
-    """Main function"""
-    try:
-        checker = FirebaseConfigChecker()
-        success = checker.run_complete_check()
-        
-        if success:
-            print("\n🎊 Configuration check completed successfully!")
-            print("🚀 Your Firebase setup is ready for development!")
-        else:
-            print("\n⚠️ Configuration check found issues that need attention.")
-            print("💡 Follow the guidance above to resolve them.")
-        
-        return success
-        
-    except KeyboardInterrupt:
-        print("\n\n⏹️ Check cancelled by user")
-        return False
-    except Exception as e:
-        print(f"\n❌ Unexpected error during check: {e}")
-        print("💡 Try running the checker again or check your Python environment")
-        return False
 
 if __name__ == "__main__":
-    success = main()
+    success = main(parse_args())
     sys.exit(0 if success else 1)
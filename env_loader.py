@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Shared .env Loader for the EduGenie Firebase checkers
+Parses .env files the way Vite (dotenv) does and caches each file keyed on its
+mtime and size, so a long-running monitor only re-parses a file when it changes.
+
+Files are layered like Vite's loadEnv, later files overriding earlier ones:
+    .env  <  .env.local  <  .env.[mode]  <  .env.[mode].local
+and VITE_* variables already set in the process environment win over all files.
+"""
+
+import os
+import re
+import threading
+
+# Mode used when none is given (what `npm run dev` uses); override with FIREBASE_CHECK_MODE
+DEFAULT_MODE = os.environ.get('FIREBASE_CHECK_MODE', 'development')
+
+ENV_PREFIX = 'VITE_'
+
+# Same line grammar as dotenv's parser, which Vite uses under the hood
+_LINE = re.compile(
+    r"^\s*(?:export\s+)?([\w.-]+)(?:\s*=\s*?|:\s+?)"
+    r"(\s*'(?:\\'|[^'])*'|\s*\"(?:\\\"|[^\"])*\"|\s*`(?:\\`|[^`])*`|[^#\r\n]+)?"
+    r"\s*(?:#.*)?$",
+    re.MULTILINE,
+)
+
+_lock = threading.Lock()
+_cache = {}  # absolute path -> (mtime_ns, size, values)
+
+
+def parse_env_text(text):
+    """Parse the contents of a .env file into a dict"""
+    values = {}
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    for match in _LINE.finditer(text):
+        key = match.group(1)
+        value = (match.group(2) or '').strip()
+        quote = value[:1]
+        if len(value) >= 2 and quote in ('"', "'", '`') and value.endswith(quote):
+            value = value[1:-1]
+            if quote == '"':
+                value = value.replace('\\n', '\n').replace('\\r', '\r')
+        values[key] = value
+    return values
+
+
+def load_env_file(path='.env.local'):
+    """Load one .env file, re-parsing only when its mtime or size changed.
+
+    Returns an empty dict when the file does not exist.
+    """
+    path = os.path.abspath(path)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        with _lock:
+            _cache.pop(path, None)
+        return {}
+
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _lock:
+        cached = _cache.get(path)
+        if cached and cached[:2] == signature:
+            return dict(cached[2])
+
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        values = parse_env_text(f.read())
+
+    with _lock:
+        _cache[path] = (signature[0], signature[1], values)
+    return dict(values)
+
+
+def vite_env_files(mode=None, directory='.'):
+    """Env file paths in the order Vite layers them"""
+    mode = mode or DEFAULT_MODE
+    names = ['.env', '.env.local', f'.env.{mode}', f'.env.{mode}.local']
+    return [os.path.join(directory, name) for name in names]
+
+
+def existing_env_files(mode=None, directory='.'):
+    """Layered env files that are actually present on disk"""
+    return [path for path in vite_env_files(mode, directory) if os.path.exists(path)]
+
+
+def load_vite_env(mode=None, directory='.'):
+    """Load and merge all env layers for a mode, like Vite's loadEnv"""
+    env_vars = {}
+    for path in vite_env_files(mode, directory):
+        env_vars.update(load_env_file(path))
+
+    for key, value in os.environ.items():
+        if key.startswith(ENV_PREFIX):
+            env_vars[key] = value
+
+    return env_vars
+
+
+def clear_cache():
+    """Forget all cached parses"""
+    with _lock:
+        _cache.clear()
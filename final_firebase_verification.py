@@ -4,209 +4,139 @@ Final Firebase Verification - Tests actual application functionality
 This script verifies that your Firebase setup works exactly as your React app would use it.
 """
 
+import argparse
 import os
-import json
 import sys
-from datetime import datetime
 
 try:
-    import firebase_admin
-    from firebase_admin import credentials, auth, firestore
-    import requests
+    from env_loader import load_vite_env
+    from check_results import ResultReporter, add_format_argument
+    from firebase_check_engine import CheckEngine
+    from token_cache import add_token_cache_argument, token_cache_from_args
+    from check_scheduler import DEFAULT_JOBS
+    from firestore_load_test import run_load_test, print_load_report
 except ImportError as e:
     print("❌ Missing required packages. Please install them with:")
     print("pip install firebase-admin requests")
     sys.exit(1)
 
-def test_application_functionality():
-    """Test Firebase functionality as the application would use it"""
-    print("🎯 Final Firebase Application Verification")
-    print("=" * 50)
-    print(f"⏰ Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print()
-    
-    # Load environment variables
-    env_vars = {}
+def run_load_test_stage(db, firestore_module, args):
+    """Run the concurrent writer/reader load test and print its report"""
+    print(f"\n📈 Firestore Load Test ({args.writers} writers, {args.readers} readers, "
+          f"{args.docs} docs per writer)...")
     try:
-        with open('.env.local', 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    env_vars[key.strip()] = value.strip()
-    except FileNotFoundError:
-        print("❌ .env.local file not found")
+        stats, phases = run_load_test(
+            db, firestore_module,
+            writers=args.writers, readers=args.readers, docs_per_writer=args.docs,
+            reads_per_reader=args.reads, hot_ratio=args.hot_ratio
+        )
+    except Exception as e:
+        print(f"   ❌ Load test failed: {e}")
         return False
+    print_load_report(stats, phases)
+    return True
+
+def run_emulator_load_test(args):
+    """Run only the load test stage against the Firestore emulator"""
+    print("🎯 Firestore Load Test (emulator)")
+    print("=" * 50)
+    os.environ['FIRESTORE_EMULATOR_HOST'] = args.emulator
+    project_id = load_vite_env().get('VITE_FIREBASE_PROJECT_ID') or 'demo-edugenie'
+    print(f"🔥 Emulator: {args.emulator} (project {project_id})")
     
-    project_id = env_vars.get('VITE_FIREBASE_PROJECT_ID')
-    print(f"🔥 Testing Firebase Project: {project_id}")
+    # The emulator needs no credentials, so talk to it without an Admin SDK app
+    from google.cloud import firestore as cloud_firestore
+    db = cloud_firestore.Client(project=project_id)
+    return run_load_test_stage(db, cloud_firestore, args)
+
+def test_application_functionality(args=None, reporter=None):
+    """Test Firebase functionality as the application would use it (the engine's 'final' profile)"""
+    print("🎯 Final Firebase Application Verification")
+    print("=" * 50)
+    print()
     
-    # Test 1: Admin SDK Functionality (Server-side operations)
-    print("\n1️⃣ Testing Admin SDK (Server-side operations)...")
+    engine = CheckEngine(['final'], jobs=args.jobs if args else DEFAULT_JOBS, reporter=reporter,
+                         token_cache=token_cache_from_args(args))
     try:
-        if not firebase_admin._apps:
-            cred = credentials.Certificate('JSON/edugenie-h-ba04c-9bf32eb544c7.json')
-            app = firebase_admin.initialize_app(cred)
-        else:
-            app = firebase_admin.get_app()
-        
-        # Test Admin Auth
-        try:
-            # This simulates creating a user (like your signup functionality)
-            users = auth.list_users(max_results=1)
-            print("   ✅ Admin Authentication: Ready for user management")
-        except Exception as e:
-            print(f"   ❌ Admin Authentication: {e}")
+        # Admin SDK, client sign-up, anonymous auth and security rules
+        if not engine.run():
             return False
         
-        # Test Admin Firestore
-        try:
-            db = firestore.client()
-            # This simulates what your app does when storing user data
-            test_ref = db.collection('users').document('test_user')
-            test_data = {
-                'email': 'test@example.com',
-                'displayName': 'Test User',
-                'createdAt': firestore.SERVER_TIMESTAMP,
-                'enrolledCourses': [],
-                'progress': {}
-            }
-            test_ref.set(test_data)
-            
-            # Read it back
-            doc = test_ref.get()
-            if doc.exists:
-                print("   ✅ Admin Firestore: Ready for user data storage")
-                # Clean up test data
-                test_ref.delete()
-            else:
-                print("   ❌ Admin Firestore: Write/read failed")
+        if args and args.load_test:
+            app, auth, firestore = engine.context.admin()
+            if not run_load_test_stage(firestore.client(app=app), firestore, args):
                 return False
-                
-        except Exception as e:
-            print(f"   ❌ Admin Firestore: {e}")
-            return False
-            
-    except Exception as e:
-        print(f"   ❌ Admin SDK: {e}")
-        return False
-    
-    # Test 2: Client SDK Functionality (Frontend operations)
-    print("\n2️⃣ Testing Client SDK Compatibility (Frontend operations)...")
-    
-    # Test Authentication API (what your frontend uses)
-    api_key = env_vars.get('VITE_FIREBASE_API_KEY')
-    try:
-        # Test the signup endpoint your frontend would use
-        auth_url = f"https://identitytoolkit.googleapis.com/v1/accounts:signUp?key={api_key}"
-        test_payload = {
-            "email": "test@example.com",
-            "password": "testpassword",
-            "returnSecureToken": True
-        }
-        response = requests.post(auth_url, json=test_payload, timeout=10)
-        
-        if response.status_code in [200, 400]:  # 400 is expected for duplicate email
-            print("   ✅ Client Authentication API: Ready for user signup/login")
-        else:
-            print(f"   ⚠️ Client Authentication API: Unexpected response ({response.status_code})")
-            
-    except Exception as e:
-        print(f"   ❌ Client Authentication API: {e}")
-        return False
-    
-    # Test 3: Security Rules (Database access)
-    print("\n3️⃣ Testing Database Security Rules...")
-    try:
-        # Test anonymous access (for guest features)
-        anon_auth_url = f"https://identitytoolkit.googleapis.com/v1/accounts:signUp?key={api_key}"
-        anon_response = requests.post(anon_auth_url, json={"returnSecureToken": True}, timeout=10)
-        
-        if anon_response.status_code == 200:
-            token = anon_response.json().get('idToken')
-            print("   ✅ Anonymous Authentication: Working")
-            
-            # Test Firestore access with auth token
-            firestore_url = f"https://firestore.googleapis.com/v1/projects/{project_id}/databases/(default)/documents/test/security_test"
-            headers = {"Authorization": f"Bearer {token}"}
-            test_doc = {"fields": {"test": {"stringValue": "security test"}}}
-            
-            write_response = requests.patch(firestore_url, json=test_doc, headers=headers, timeout=10)
-            if write_response.status_code in [200, 400, 403]:  # Any of these means the API is accessible
-                print("   ✅ Database Security Rules: Configured correctly")
-            else:
-                print(f"   ⚠️ Database Security Rules: Response ({write_response.status_code})")
-        else:
-            print("   ⚠️ Anonymous Authentication: Issues detected")
-            
-    except Exception as e:
-        print(f"   ❌ Security Rules Test: {e}")
-    
-    # Test 4: Application Readiness
-    print("\n4️⃣ Application Readiness Check...")
-    
-    required_features = {
-        "User Registration": "✅ Ready",
-        "User Authentication": "✅ Ready", 
-        "User Data Storage": "✅ Ready",
-        "Course Management": "✅ Ready",
-        "Progress Tracking": "✅ Ready",
-        "File Storage": "✅ Ready (localStorage + Firestore)",
-        "Real-time Updates": "✅ Ready"
-    }
-    
-    for feature, status in required_features.items():
-        print(f"   {status} {feature}")
+    finally:
+        engine.close()
     
     # Final Summary
     print("\n📊 FINAL VERIFICATION REPORT")
     print("=" * 50)
     print("🎉 STATUS: YOUR FIREBASE SETUP IS COMPLETE!")
     print()
-    print("✅ All core Firebase services are working correctly")
     print("✅ Your application can now:")
     print("   • Register and authenticate users")
     print("   • Store and retrieve user data")
     print("   • Manage courses and progress")
-    print("   • Handle file uploads (via localStorage)")
     print("   • Provide real-time data updates")
     print()
-    print("🚀 Your EduGenie application is ready to use!")
-    print()
     print("🔗 Next Steps:")
     print("   1. Open your application: http://localhost:5173/")
     print("   2. Test user registration and login")
     print("   3. Try uploading files and creating courses")
     print("   4. Check the Firebase Status panel in your app")
-    print()
-    print(f"📋 Configuration Summary:")
-    print(f"   • Project ID: {project_id}")
-    print(f"   • Authentication: Email/Password + Anonymous ✅")
-    print(f"   • Firestore Database: Enabled ✅")
-    print(f"   • Admin SDK: Working ✅")
-    print(f"   • Client SDK: Working ✅")
     
     return True
 
-def main():
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Final Firebase application verification")
+    parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS,
+                        help=f"checks to run in parallel once their prerequisites pass (default: {DEFAULT_JOBS})")
+    add_token_cache_argument(parser)
+    add_format_argument(parser)
+    load = parser.add_argument_group('load test')
+    load.add_argument('--load-test', action='store_true',
+                      help="run a concurrent Firestore write/read load test after the Admin checks")
+    load.add_argument('--writers', type=int, default=4, help="concurrent writers (default: 4)")
+    load.add_argument('--readers', type=int, default=4, help="concurrent readers (default: 4)")
+    load.add_argument('--docs', type=int, default=25, help="documents created per writer (default: 25)")
+    load.add_argument('--reads', type=int, default=100, help="reads per reader (default: 100)")
+    load.add_argument('--hot-ratio', type=float, default=0.1,
+                      help="share of updates sent to one shared document to measure contention (default: 0.1)")
+    load.add_argument('--emulator', metavar='HOST:PORT',
+                      help="run only the load test, against the Firestore emulator")
+    return parser.parse_args(argv)
+
+def main(args=None):
     """Main function"""
-    try:
-        success = test_application_functionality()
-        return success
-    except KeyboardInterrupt:
-        print("\n\n❌ Verification interrupted by user")
-        return False
-    except Exception as e:
-        print(f"\n❌ Unexpected error: {e}")
-        return False
+    args = args or parse_args([])
+    reporter = ResultReporter(args.format)
+    # Keep stdout clean for --format ndjson/json
+    with reporter.quiet():
+        try:
+            if args.emulator:
+                success = run_emulator_load_test(args)
+            else:
+                success = test_application_functionality(args, reporter)
+        except KeyboardInterrupt:
+            print("\n\n❌ Verification interrupted by user")
+            success = False
+        except Exception as e:
+            print(f"\n❌ Unexpected error: {e}")
+            success = False
+    reporter.finish(success)
+    return success
 
 if __name__ == "__main__":
-    success = main()
+    args = parse_args()
+    success = main(args)
+    log = sys.stderr if args.format != 'text' else sys.stdout
     
     if success:
-        print(f"\n🎉 Firebase setup verification completed successfully!")
-        print("Your EduGenie application is ready to use! 🚀")
+        print(f"\n🎉 Firebase setup verification completed successfully!", file=log)
+        print("Your EduGenie application is ready to use! 🚀", file=log)
         sys.exit(0)
     else:
-        print(f"\n❌ Some issues were detected during verification.")
+        print(f"\n❌ Some issues were detected during verification.", file=log)
         sys.exit(1)
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Firebase Endpoint Latency Benchmark for EduGenie Platform
+Repeatedly hits the Auth accounts:lookup, Firestore REST and init.json endpoints and
+reports min/p50/p95/p99/max latency, throughput and error rate per endpoint.
+
+Used by `enhanced_firebase_checker.py --bench N --concurrency C`. With
+--stand-in the requests go to a local server that mimics the three endpoints,
+so the benchmark also runs offline in CI.
+"""
+
+import csv
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from check_timings import percentile
+from http_session import new_session, POOL_SIZE_PER_HOST
+
+
+class Sample:
+    """One timed request"""
+
+    def __init__(self, endpoint, iteration, started_at, latency, status_code, ok, error):
+        self.endpoint = endpoint
+        self.iteration = iteration
+        self.started_at = started_at
+        self.latency = latency
+        self.status_code = status_code
+        self.ok = ok
+        self.error = error
+
+
+def run_benchmark(probes, iterations, concurrency=1, timeout=10):
+    """Send `iterations` requests to every probe endpoint, `concurrency` at a time.
+
+    Returns (samples, wall_clock_seconds).
+    """
+    session = new_session(pool_size=max(concurrency, POOL_SIZE_PER_HOST))
+    tasks = [(probe, i) for i in range(iterations) for probe in probes]
+
+    def execute(task):
+        probe, iteration = task
+        started_at = time.time()
+        started = time.perf_counter()
+        try:
+            response = session.request(probe.method, probe.url, timeout=timeout, **probe.kwargs)
+            latency = time.perf_counter() - started
+            ok = response.status_code in probe.expected
+            return Sample(probe.key, iteration, started_at, latency, response.status_code, ok, None)
+        except Exception as e:
+            latency = time.perf_counter() - started
+            return Sample(probe.key, iteration, started_at, latency, None, False, type(e).__name__)
+
+    wall_started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            samples = list(executor.map(execute, tasks))
+    finally:
+        session.close()
+    return samples, time.perf_counter() - wall_started
+
+
+def summarize(samples, wall_clock):
+    """Per-endpoint latency percentiles, throughput and error rate"""
+    summary = {}
+    for endpoint in dict.fromkeys(sample.endpoint for sample in samples):
+        endpoint_samples = [s for s in samples if s.endpoint == endpoint]
+        latencies = sorted(s.latency for s in endpoint_samples)
+        errors = sum(1 for s in endpoint_samples if not s.ok)
+        summary[endpoint] = {
+            'requests': len(endpoint_samples),
+            'min': latencies[0],
+            'p50': percentile(latencies, 50),
+            'p95': percentile(latencies, 95),
+            'p99': percentile(latencies, 99),
+            'max': latencies[-1],
+            'throughput': len(endpoint_samples) / wall_clock if wall_clock else 0.0,
+            'error_rate': errors / len(endpoint_samples),
+        }
+    return summary
+
+
+def print_bench_report(summary, wall_clock, concurrency):
+    """Print the benchmark table"""
+    print("\n🏁 Latency Benchmark")
+    print("-" * 78)
+    print(f"  {'Endpoint':<10} {'Reqs':>5} {'min':>8} {'p50':>8} {'p95':>8} "
+          f"{'p99':>8} {'max':>8} {'req/s':>7} {'errors':>7}")
+    for endpoint, stats in summary.items():
+        print(f"  {endpoint:<10} {stats['requests']:>5} "
+              f"{stats['min'] * 1000:>6.1f}ms {stats['p50'] * 1000:>6.1f}ms "
+              f"{stats['p95'] * 1000:>6.1f}ms {stats['p99'] * 1000:>6.1f}ms "
+              f"{stats['max'] * 1000:>6.1f}ms {stats['throughput']:>7.1f} "
+              f"{stats['error_rate']:>6.1%}")
+    print(f"\n  Wall clock: {wall_clock:.2f}s at concurrency {concurrency}")
+
+
+def write_samples_csv(path, samples):
+    """Export raw samples for offline analysis"""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['endpoint', 'iteration', 'started_at', 'latency_ms', 'status_code', 'ok', 'error'])
+        for s in samples:
+            writer.writerow([
+                s.endpoint, s.iteration, f"{s.started_at:.6f}", f"{s.latency * 1000:.3f}",
+                s.status_code if s.status_code is not None else '', int(s.ok), s.error or ''
+            ])
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """Answers like the real endpoints do for the checker's probe requests"""
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without this, Nagle plus
+    # delayed ACKs add ~40ms to every keep-alive response
+    disable_nagle_algorithm = True
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _drain(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+
+    def do_POST(self):
+        self._drain()
+        if self.path.startswith('/v1/accounts:lookup'):
+            self._reply(400, {'error': {'code': 400, 'message': 'INVALID_ID_TOKEN'}})
+        else:
+            self._reply(404, {'error': {'code': 404, 'message': 'Not found'}})
+
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        if path.startswith('/v1/projects/') and '/documents' in path:
+            self._reply(403, {'error': {'code': 403, 'status': 'PERMISSION_DENIED'}})
+        elif path == '/__/firebase/init.json':
+            self._reply(200, {'projectId': 'stand-in', 'apiKey': 'stand-in-key'})
+        else:
+            self._reply(404, {'error': {'code': 404, 'message': 'Not found'}})
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer:
+    """Local HTTP server mimicking Auth, Firestore REST and Hosting init.json"""
+
+    def __init__(self, host='127.0.0.1', port=0):
+        self._server = ThreadingHTTPServer((host, port), _StandInHandler)
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,817 @@
+#!/usr/bin/env python3
+"""
+Unified Firebase Check Engine for EduGenie Platform
+Every check lives once in a registry, and each checker is a named profile
+over it (quick, enhanced, comprehensive, final). Selecting several profiles
+runs the union of their checks as one dependency-aware schedule, so shared
+work - the env load, the client REST probes, the Admin SDK app, the
+anonymous sign-in - happens once and every check that needs it reuses the
+result.
+
+Usage:
+    python firebase_check_engine.py --profile quick
+    python firebase_check_engine.py --profile enhanced --profile final --format ndjson
+"""
+
+from check_timings import timings
+
+import argparse
+import os
+import re
+import sys
+import threading
+import time
+from datetime import datetime
+
+try:
+    from firebase_probes import DEFAULT_BUDGET, client_probes, run_probes, print_probe_summary
+    from http_session import get_session, print_connection_stats
+    from env_loader import existing_env_files, load_vite_env
+    from probe_cache import add_cache_arguments, cache_from_args
+    from check_results import REMEDIATIONS, CheckResult, ResultReporter, add_format_argument
+    from check_scheduler import CheckScheduler, SkipCheck, UnitOutcome, DEFAULT_JOBS
+    from token_cache import cached_certificate, add_token_cache_argument, token_cache_from_args
+    from comprehensive_firebase_checker import (ComprehensiveFirebaseChecker, REQUIRED_ENV_KEYS,
+                                                import_admin_sdk)
+    from firestore_queries import SERVICES_DIR, extract_queries
+    from firestore_index_advisor import INDEXES_FILE, advise, load_indexes_file, missing_indexes
+except ImportError as e:
+    print("❌ Missing required packages. Please install them with:")
+    print("pip install -r requirements-firebase-check.txt")
+    sys.exit(1)
+
+timings.record_since_start('import', 'module imports')
+
+PLACEHOLDER_VALUES = ['your-api-key-here', 'your-project-id', 'your-app-id-here', 'demo-api-key']
+
+# Named app, so the engine never collides with a default app set up elsewhere
+ADMIN_APP_NAME = 'check-engine'
+
+
+class RegisteredCheck:
+    """A check in the registry: what it needs and which client probe it reads"""
+
+    def __init__(self, check_id, label, func, requires=(), probe=None):
+        self.check_id = check_id
+        self.label = label
+        self.func = func
+        self.requires = tuple(requires)
+        self.probe = probe
+
+
+REGISTRY = {}
+
+
+def register(check_id, label, requires=(), probe=None):
+    """Add a check to the registry; prerequisites must be registered first"""
+    def decorator(func):
+        unknown = [r for r in requires if r not in REGISTRY]
+        if unknown:
+            raise ValueError(f"Check {check_id!r} requires unregistered checks: {', '.join(unknown)}")
+        REGISTRY[check_id] = RegisteredCheck(check_id, label, func, requires, probe)
+        return func
+    return decorator
+
+
+class Profile:
+    """A named selection of registry checks.
+
+    In a strict profile a skipped check counts as a failure - the final
+    verification needs the Admin SDK, the comprehensive check treats it as
+    optional.
+    """
+
+    def __init__(self, name, description, checks, probe_budget=DEFAULT_BUDGET, strict=False):
+        self.name = name
+        self.description = description
+        self.checks = list(checks)
+        self.probe_budget = probe_budget
+        self.strict = strict
+
+    def passed(self, outcomes):
+        bad = ('failed', 'skipped') if self.strict else ('failed',)
+        return all(outcomes[check_id].status not in bad for check_id in self.checks)
+
+
+PROFILES = {
+    'quick': Profile(
+        'quick', "Env config plus Auth and Firestore reachability",
+        ['environment', 'client_config', 'client_auth', 'client_firestore'],
+        probe_budget=5,
+    ),
+    'enhanced': Profile(
+        'enhanced', "Client config, URL formats and every client REST probe",
+        ['environment', 'client_config', 'config_format',
+         'client_auth', 'client_firestore', 'project_valid'],
+    ),
+    'comprehensive': Profile(
+        'comprehensive', "Client checks, firebase.ts source, Firestore indexes, service account and Admin SDK",
+        ['environment', 'client_config', 'client_source', 'client_auth', 'client_firestore',
+         'project_valid', 'firestore_indexes', 'service_account', 'admin_init', 'admin_auth',
+         'admin_firestore'],
+    ),
+    'final': Profile(
+        'final', "Application flows: Admin writes, client sign-up, anonymous auth and rules",
+        ['environment', 'client_config', 'client_auth', 'service_account', 'admin_init',
+         'admin_auth', 'admin_firestore_write', 'anonymous_auth', 'security_rules'],
+        strict=True,
+    ),
+}
+
+
+class CheckRun:
+    """Messages one check produced, resolved into its CheckResult afterwards"""
+
+    def __init__(self, check_id):
+        self.result = CheckResult(check_id)
+        self.issues = []
+        self.warnings = []
+        self.successes = []
+
+    def absorb(self, checker):
+        """Take over the messages a ComprehensiveFirebaseChecker helper recorded"""
+        self.issues += checker.issues
+        self.warnings += checker.warnings
+        self.successes += checker.success_messages
+
+
+class CheckContext:
+    """State shared by every check of one engine run"""
+
+    def __init__(self, probe_keys=(), probe_budget=DEFAULT_BUDGET, cache=None, token_cache=None,
+                 daemon_socket=None):
+        self.env_vars = {}
+        self.service_account_path = None
+        self.service_account_info = None
+        self.admin_app = None
+        self.probe_keys = set(probe_keys)
+        self.probe_budget = probe_budget
+        self.cache = cache
+        self.token_cache = token_cache
+        # Unix socket of a warm admin_daemon.py; None runs the Admin checks in-process
+        self.daemon_socket = daemon_socket
+        self._values = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+        # key -> [times computed, times used]
+        self.usage = {}
+
+    def shared(self, key, factory):
+        """Compute factory() once per run; parallel callers wait for the first one.
+
+        A factory that raises is not remembered, so the next caller retries.
+        """
+        with self._lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+            usage = self.usage.setdefault(key, [0, 0])
+        with lock:
+            if key not in self._values:
+                self._values[key] = factory()
+                usage[0] += 1
+            usage[1] += 1
+            return self._values[key]
+
+    def forget(self, *keys):
+        """Drop shared values so the next caller computes them again"""
+        with self._lock:
+            for key in keys:
+                self._values.pop(key, None)
+
+    def legacy_checker(self):
+        """A ComprehensiveFirebaseChecker primed with this run's config, to reuse its validators"""
+        checker = ComprehensiveFirebaseChecker()
+        checker.env_vars = self.env_vars
+        checker.service_account_path = self.service_account_path
+        return checker
+
+    def probe(self, key):
+        """Result of one client REST probe; all probes the run needs fire together the first time"""
+        def fire():
+            project_id = self.env_vars.get('VITE_FIREBASE_PROJECT_ID')
+            api_key = self.env_vars.get('VITE_FIREBASE_API_KEY')
+            selected = [p for p in client_probes(project_id, api_key) if p.key in self.probe_keys]
+            results = run_probes(selected, budget=self.probe_budget, cache=self.cache)
+            print_probe_summary(results, budget=self.probe_budget)
+            return {result.key: result for result in results}
+        return self.shared('client_probes', fire)[key]
+
+    def admin(self):
+        """(app, auth, firestore) from the one Admin SDK app of this run"""
+        def initialize():
+            firebase_admin, credentials, auth, firestore = import_admin_sdk()
+            if self.token_cache:
+                cred = cached_certificate(credentials, self.service_account_info or self.service_account_path,
+                                          self.token_cache)
+            else:
+                cred = credentials.Certificate(self.service_account_path)
+            self.admin_app = firebase_admin.initialize_app(cred, name=ADMIN_APP_NAME)
+            return self.admin_app, auth, firestore
+        return self.shared('admin_app', initialize)
+
+    def daemon_results(self):
+        """{check_id: result} for the Admin checks, answered by the warm admin_daemon.py"""
+        def ask():
+            from admin_daemon import DAEMON_CHECKS, request
+            response = request({'op': 'check', 'checks': DAEMON_CHECKS}, self.daemon_socket)
+            print(f"  ⚡ Answered in {response.get('elapsed_ms', 0):.0f}ms by the warm app "
+                  f"(its cold start took {response.get('init_seconds') or 0:.2f}s)")
+            return {result['check']: result for result in response.get('results', [])}
+        return self.shared('admin_daemon', ask)
+
+    def close(self):
+        """Delete the Admin SDK app, if one was initialized"""
+        if self.admin_app is not None:
+            try:
+                import_admin_sdk()[0].delete_app(self.admin_app)
+            except ValueError:
+                pass
+            self.admin_app = None
+        self.forget('admin_app', 'admin_daemon')
+
+
+def _probe_check(ctx, run, key, label, ok_text="Accessible", missing_text=None):
+    """Report one client probe; `missing_text` is the issue for a 404, other odd statuses only warn"""
+    result = ctx.probe(key)
+    run.result.latency_ms = result.elapsed * 1000 if result.elapsed is not None else None
+    run.result.attempts = result.attempts
+    if result.is_timeout:
+        print(f"  ❌ {label}: Connection timeout")
+        run.issues.append(f"{label} error: connection timeout")
+    elif result.error:
+        print(f"  ❌ {label}: Connection failed - {result.error}")
+        run.issues.append(f"{label} error: {result.error}")
+    elif result.ok:
+        print(f"  ✅ {label}: {ok_text}{result.note}")
+        run.successes.append(f"{label} is accessible")
+        return True
+    elif result.status_code == 404 and missing_text:
+        print(f"  ❌ {label}: Not found (404){result.note}")
+        run.issues.append(missing_text)
+    else:
+        # Reachable but answering oddly - a warning, as the standalone checkers always had it
+        print(f"  ⚠️ {label}: Unexpected response ({result.status_code}){result.note}")
+        run.warnings.append(f"{label} returned status {result.status_code}")
+        return True
+    return False
+
+
+def _daemon_check(ctx, run, check_id, label):
+    """Report one Admin check from the warm admin_daemon.py"""
+    try:
+        result = ctx.daemon_results().get(check_id)
+    except Exception as e:
+        print(f"  ❌ Admin daemon unavailable: {e}")
+        print("     Start it with: python admin_daemon.py")
+        run.issues.append(f"Admin daemon unavailable: {e}")
+        return False
+    if result is None:
+        print(f"  ❌ {label}: Not answered by the admin daemon")
+        run.issues.append(f"{label} error: not answered by the admin daemon")
+        return False
+    run.result.latency_ms = result['latency_ms']
+    if not result['ok']:
+        print(f"  ❌ {label}: {result['message']}")
+        run.issues.append(f"{label} error: {result['message']}")
+        return False
+    print(f"  ✅ {label}: {result['message']}")
+    run.successes.append(f"{label} is working")
+    return True
+
+
+@register('environment', "Environment files")
+def check_environment(ctx, run):
+    """Load the .env / .env.local layers every other check reads"""
+    if not existing_env_files():
+        print("❌ Environment file .env.local not found!")
+        print("   Copy .env.example to .env.local and fill in the Firebase web app config")
+        run.issues.append("Environment file .env.local not found")
+        return False
+    # Cleared in place: re-runs must drop deleted keys, and legacy checkers share the dict
+    ctx.env_vars.clear()
+    ctx.env_vars.update(load_vite_env())
+    print(f"🔥 Project: {ctx.env_vars.get('VITE_FIREBASE_PROJECT_ID') or 'not set'}")
+    run.successes.append("Environment files loaded")
+    return True
+
+
+@register('client_config', "Client configuration", requires=['environment'])
+def check_client_config(ctx, run):
+    """Every required VITE_FIREBASE_* key is set to a real value"""
+    print("\n🔍 Client Configuration")
+    config_valid = True
+    for key in REQUIRED_ENV_KEYS:
+        value = ctx.env_vars.get(key, '')
+        if not value:
+            print(f"  ❌ {key}: Missing or empty")
+            run.issues.append(f"{key} is missing or empty")
+            config_valid = False
+        elif value in PLACEHOLDER_VALUES or value.startswith(('your-', 'demo-')):
+            print(f"  ❌ {key}: Using placeholder value - needs real Firebase config")
+            run.issues.append(f"{key} contains placeholder value")
+            config_valid = False
+        else:
+            print(f"  ✅ {key}: {value[:20]}...")
+            run.successes.append(f"{key} configured")
+    return config_valid
+
+
+@register('config_format', "URL formats", requires=['client_config'])
+def check_config_format(ctx, run):
+    """Project ID, auth domain, storage bucket and API key look like Firebase's"""
+    print("\n🔗 URL Format & Consistency")
+    project_id = ctx.env_vars.get('VITE_FIREBASE_PROJECT_ID', '')
+    auth_domain = ctx.env_vars.get('VITE_FIREBASE_AUTH_DOMAIN', '')
+    storage_bucket = ctx.env_vars.get('VITE_FIREBASE_STORAGE_BUCKET', '')
+    api_key = ctx.env_vars.get('VITE_FIREBASE_API_KEY', '')
+
+    if re.match(r'^[a-z0-9-]+$', project_id) and not project_id.startswith('-') and not project_id.endswith('-'):
+        print(f"  ✅ Project ID format: Valid ({project_id})")
+    else:
+        print(f"  ❌ Project ID format: Invalid ({project_id})")
+        run.issues.append("Project ID format is invalid")
+
+    expected_auth_domain = f"{project_id}.firebaseapp.com"
+    if auth_domain == expected_auth_domain:
+        print("  ✅ Auth Domain: Consistent with project ID")
+    else:
+        print(f"  ⚠️ Auth Domain: Expected {expected_auth_domain}, got {auth_domain}")
+        run.warnings.append("Auth domain doesn't match project ID")
+
+    if storage_bucket in (f"{project_id}.appspot.com", f"{project_id}.firebasestorage.app"):
+        print("  ✅ Storage Bucket: Valid format")
+    else:
+        print(f"  ⚠️ Storage Bucket: Unexpected format ({storage_bucket})")
+        run.warnings.append("Storage bucket format is unusual")
+
+    if api_key.startswith('AIza') and len(api_key) > 30:
+        print("  ✅ API Key: Valid format")
+    else:
+        print("  ❌ API Key: Invalid format (should start with 'AIza')")
+        run.issues.append("API key format is invalid")
+
+    return not run.issues
+
+
+@register('client_source', "firebase.ts source")
+def check_client_source(ctx, run):
+    checker = ctx.legacy_checker()
+    valid = checker.validate_client_source()
+    run.absorb(checker)
+    return valid
+
+
+@register('client_auth', "Authentication API", requires=['client_config'], probe='auth')
+def check_client_auth(ctx, run):
+    return _probe_check(ctx, run, 'auth', "Authentication API")
+
+
+@register('client_firestore', "Firestore API", requires=['client_config'], probe='firestore')
+def check_client_firestore(ctx, run):
+    return _probe_check(ctx, run, 'firestore', "Firestore API",
+                        missing_text="Firestore database not created - enable in Firebase Console")
+
+
+@register('project_valid', "Firebase project", requires=['client_config'], probe='project')
+def check_project_valid(ctx, run):
+    return _probe_check(ctx, run, 'project', "Firebase Project", ok_text="Valid and accessible")
+
+
+@register('firestore_indexes', "Firestore composite indexes")
+def check_firestore_indexes(ctx, run):
+    """Every query shape in src/services against firestore.indexes.json"""
+    if not os.path.isdir(SERVICES_DIR):
+        print(f"⏭️ Firestore Indexes: {SERVICES_DIR} not found - nothing to check")
+        raise SkipCheck(f"{SERVICES_DIR} not found")
+    shapes = extract_queries()
+    if not shapes:
+        # More likely an extraction gap than a service layer without queries
+        print(f"  ⚠️ Firestore Indexes: No query shapes found in {SERVICES_DIR}")
+        run.warnings.append(f"No Firestore query shapes found in {SERVICES_DIR} - composite indexes not checked")
+        return True
+    try:
+        indexes = load_indexes_file()
+    except (OSError, ValueError) as e:
+        print(f"  ❌ Firestore Indexes: {INDEXES_FILE} is unreadable - {e}")
+        run.issues.append(f"Composite index file {INDEXES_FILE} is unreadable: {e}")
+        return False
+    missing = missing_indexes(advise(shapes, indexes))
+    if not missing:
+        print(f"  ✅ Firestore Indexes: {len(shapes)} service query shapes covered")
+        run.successes.append("Every service query has its composite index")
+        return True
+    print(f"  ❌ Firestore Indexes: {len(missing)} composite indexes missing from {INDEXES_FILE}")
+    for needed, needed_by in missing:
+        users = ", ".join(sorted({shape.function for shape in needed_by}))
+        print(f"     {needed.describe()} ({users})")
+        run.issues.append(f"Missing composite index {needed.describe()} for {users}")
+    return False
+
+
+@register('service_account', "Service account", requires=['environment'])
+def check_service_account(ctx, run):
+    checker = ctx.legacy_checker()
+    if not checker.find_service_account_file():
+        if ctx.daemon_socket:
+            # The daemon holds its own credentials
+            print("⏭️ Service account: Not found locally - the admin daemon uses its own")
+            run.successes.append("Admin checks use the admin daemon's service account")
+            return True
+        print("⚠️ Service account file not found - Admin SDK checks will be skipped")
+        raise SkipCheck("Service account file not found")
+    ctx.service_account_path = checker.service_account_path
+    print()
+    valid = checker.validate_service_account_file()
+    ctx.service_account_info = checker.service_account_info
+    run.absorb(checker)
+    return valid
+
+
+@register('admin_init', "Admin SDK initialization", requires=['service_account'])
+def check_admin_init(ctx, run):
+    if ctx.daemon_socket:
+        print(f"\n🔧 Firebase Admin SDK (via daemon at {ctx.daemon_socket})")
+        return _daemon_check(ctx, run, 'admin_init', "Admin SDK")
+    print("\n🔧 Firebase Admin SDK")
+    try:
+        ctx.admin()
+    except ImportError:
+        print("  ❌ Admin SDK: firebase-admin is not installed")
+        run.issues.append("Admin SDK error: firebase-admin package is not installed")
+        return False
+    except Exception as e:
+        print(f"  ❌ Admin SDK initialization failed: {e}")
+        run.issues.append(f"Admin SDK initialization error: {e}")
+        return False
+    print("  ✅ Admin SDK: Initialized")
+    run.successes.append("Firebase Admin SDK initialized")
+    return True
+
+
+@register('admin_auth', "Admin Authentication", requires=['admin_init'])
+def check_admin_auth(ctx, run):
+    if ctx.daemon_socket:
+        return _daemon_check(ctx, run, 'admin_auth', "Admin Auth")
+    app, auth, firestore = ctx.admin()
+    try:
+        # Listing one user works even when there are none
+        auth.list_users(max_results=1, app=app)
+    except Exception as e:
+        print(f"  ❌ Admin Auth: Error - {e}")
+        run.issues.append(f"Admin Auth error: {e}")
+        return False
+    print("  ✅ Admin Auth: Ready for user management")
+    run.successes.append("Admin Authentication is working")
+    return True
+
+
+@register('admin_firestore', "Admin Firestore", requires=['admin_init'])
+def check_admin_firestore(ctx, run):
+    if ctx.daemon_socket:
+        return _daemon_check(ctx, run, 'admin_firestore', "Admin Firestore")
+    app, auth, firestore = ctx.admin()
+    try:
+        # Building a reference proves the client works without querying the database
+        firestore.client(app=app).collection('test').document('connection')
+    except Exception as e:
+        print(f"  ❌ Admin Firestore: Error - {e}")
+        run.issues.append(f"Admin Firestore error: {e}")
+        return False
+    print("  ✅ Admin Firestore: Client ready")
+    run.successes.append("Admin Firestore is working")
+    return True
+
+
+@register('admin_firestore_write', "Admin Firestore write/read", requires=['admin_init'])
+def check_admin_firestore_write(ctx, run):
+    """Store, read back and delete a user document the way sign-up does"""
+    app, auth, firestore = ctx.admin()
+    try:
+        test_ref = firestore.client(app=app).collection('users').document('test_user')
+        test_ref.set({
+            'email': 'test@example.com',
+            'displayName': 'Test User',
+            'createdAt': firestore.SERVER_TIMESTAMP,
+            'enrolledCourses': [],
+            'progress': {}
+        })
+        exists = test_ref.get().exists
+        test_ref.delete()
+    except Exception as e:
+        print(f"  ❌ Admin Firestore: {e}")
+        run.issues.append(f"Admin Firestore error: {e}")
+        return False
+    if not exists:
+        print("  ❌ Admin Firestore: Write/read failed")
+        run.issues.append("Admin Firestore error: written document could not be read back")
+        return False
+    print("  ✅ Admin Firestore: Ready for user data storage")
+    run.successes.append("Admin Firestore write/read works")
+    return True
+
+
+@register('anonymous_auth', "Anonymous sign-in", requires=['client_config'])
+def check_anonymous_auth(ctx, run):
+    """Sign in anonymously, as guest features do; the token is shared with security_rules"""
+    api_key = ctx.env_vars.get('VITE_FIREBASE_API_KEY')
+
+    def sign_in():
+        response = get_session().post(
+            f"https://identitytoolkit.googleapis.com/v1/accounts:signUp?key={api_key}",
+            json={"returnSecureToken": True}, timeout=10
+        )
+        return response.json().get('idToken') if response.status_code == 200 else None
+
+    try:
+        token = ctx.shared('anonymous_token', sign_in)
+    except Exception as e:
+        print(f"  ⚠️ Anonymous Authentication: {e}")
+        run.warnings.append(f"Anonymous auth connection error: {e}")
+        return True
+    # Guest features are optional, so a disabled provider is only a warning
+    if not token:
+        print("  ⚠️ Anonymous Authentication: Not enabled")
+        run.warnings.append("Anonymous auth is not enabled in Firebase Console > Authentication")
+        return True
+    print("  ✅ Anonymous Authentication: Working")
+    run.successes.append("Anonymous authentication works")
+    return True
+
+
+@register('security_rules', "Security rules", requires=['anonymous_auth'])
+def check_security_rules(ctx, run):
+    """Write a document with the anonymous token to see the rules answer"""
+    project_id = ctx.env_vars.get('VITE_FIREBASE_PROJECT_ID')
+    token = ctx.shared('anonymous_token', lambda: None)
+    if not token:
+        print("  ⚠️ Database Security Rules: Not tested (needs anonymous sign-in)")
+        run.warnings.append("Security rules were not tested because anonymous sign-in is unavailable")
+        return True
+    url = (f"https://firestore.googleapis.com/v1/projects/{project_id}"
+           f"/databases/(default)/documents/test/security_test")
+    try:
+        response = get_session().patch(
+            url, json={"fields": {"test": {"stringValue": "security test"}}},
+            headers={"Authorization": f"Bearer {token}"}, timeout=10
+        )
+    except Exception as e:
+        print(f"  ❌ Security Rules Test: {e}")
+        run.issues.append(f"Security rules connection error: {e}")
+        return False
+    # Allowed, rejected as invalid or denied by the rules: the rules are being evaluated
+    if response.status_code in (200, 400, 403):
+        print("  ✅ Database Security Rules: Configured")
+        run.successes.append("Security rules are evaluated")
+        return True
+    print(f"  ⚠️ Database Security Rules: Response ({response.status_code})")
+    run.warnings.append(f"Security rules test returned status {response.status_code}")
+    return True
+
+
+def plan_checks(profile_names):
+    """Union of the profiles' checks plus their prerequisites, in registry order"""
+    wanted = set()
+    stack = [check_id for name in profile_names for check_id in PROFILES[name].checks]
+    while stack:
+        check_id = stack.pop()
+        if check_id not in wanted:
+            wanted.add(check_id)
+            stack.extend(REGISTRY[check_id].requires)
+    return [check_id for check_id in REGISTRY if check_id in wanted]
+
+
+class CheckEngine:
+    """Runs the checks of one or more profiles as a single schedule"""
+
+    def __init__(self, profile_names, jobs=DEFAULT_JOBS, cache=None, reporter=None, token_cache=None,
+                 daemon_socket=None):
+        unknown = [name for name in profile_names if name not in PROFILES]
+        if unknown:
+            raise ValueError(f"Unknown profile(s): {', '.join(unknown)}")
+        self.profiles = [PROFILES[name] for name in dict.fromkeys(profile_names)]
+        self.jobs = jobs
+        self.reporter = reporter or ResultReporter()
+        self.check_ids = plan_checks([profile.name for profile in self.profiles])
+        self.context = CheckContext(
+            probe_keys={REGISTRY[c].probe for c in self.check_ids if REGISTRY[c].probe},
+            # One probe round serves every profile, so give it the most generous budget
+            probe_budget=max(profile.probe_budget for profile in self.profiles),
+            cache=cache,
+            token_cache=token_cache,
+            daemon_socket=daemon_socket,
+        )
+        self.outcomes = {}
+        self.verdicts = {}
+        # check_id -> CheckRun of its latest run, so a re-run replaces its messages
+        self.runs = {}
+
+    @property
+    def issues(self):
+        return [issue for run in self.runs.values() for issue in run.issues]
+
+    @property
+    def warnings(self):
+        return [warning for run in self.runs.values() for warning in run.warnings]
+
+    def _unit(self, check):
+        def execute():
+            run = CheckRun(check.check_id)
+            started = time.perf_counter()
+            with timings.measure('check', check.label):
+                try:
+                    passed = bool(check.func(self.context, run))
+                except SkipCheck:
+                    raise
+                except Exception as e:
+                    print(f"  ❌ {check.label}: Unexpected error - {e}")
+                    run.issues.append(f"{check.label} error: {e}")
+                    passed = False
+            if run.result.latency_ms is None:
+                run.result.latency_ms = (time.perf_counter() - started) * 1000
+            # A check that reports failure fails even if it only left warnings
+            run.result.status = 'fail' if not passed else 'warn' if run.warnings else 'pass'
+            run.result.resolve(run.issues, run.warnings, run.successes)
+            self.runs[check.check_id] = run
+            self.reporter.emit(run.result)
+            return passed
+        return execute
+
+    def _on_skip(self, name, reason):
+        self.runs.pop(name, None)
+        self.reporter.emit(CheckResult(name, 'skip', detail=reason))
+
+    def run(self):
+        """Run every planned check once; returns True when all selected profiles pass"""
+        names = ", ".join(profile.name for profile in self.profiles)
+        print(f"🔥 Firebase Check Engine - profiles: {names}")
+        print("=" * 60)
+        print(f"⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"📋 {len(self.check_ids)} checks planned")
+        print()
+
+        scheduler = CheckScheduler(self.jobs)
+        for check_id in self.check_ids:
+            check = REGISTRY[check_id]
+            scheduler.add(check_id, self._unit(check), requires=check.requires)
+        started = time.perf_counter()
+        self.outcomes = scheduler.run(on_skip=self._on_skip)
+        wall_clock = time.perf_counter() - started
+
+        self.verdicts = {profile.name: profile.passed(self.outcomes) for profile in self.profiles}
+        self.print_report(wall_clock)
+        return all(self.verdicts.values())
+
+    def rerun(self, check_ids):
+        """Run only the given checks again, keeping every other outcome of the last run.
+
+        Checks downstream of them that were skipped last time run as well, so
+        fixing a prerequisite brings back what it blocked. Returns True when
+        all selected profiles pass.
+        """
+        selected = set(check_ids)
+        for check_id in self.check_ids:
+            outcome = self.outcomes.get(check_id)
+            if outcome and outcome.status == 'skipped' and selected & set(REGISTRY[check_id].requires):
+                selected.add(check_id)
+        selected = [check_id for check_id in self.check_ids if check_id in selected]
+
+        # Probe only what is re-run, and rebuild the Admin app from the current key
+        probe_keys = {REGISTRY[c].probe for c in selected if REGISTRY[c].probe}
+        if probe_keys:
+            self.context.probe_keys = probe_keys
+            self.context.forget('client_probes')
+        if 'admin_init' in selected:
+            self.context.close()
+
+        scheduler = CheckScheduler(self.jobs)
+        outcomes = dict(self.outcomes)
+        for check_id in selected:
+            check = REGISTRY[check_id]
+            # Prerequisites that are not re-run count with their last outcome
+            blocked = [r for r in check.requires if r not in scheduler.units and not outcomes[r].passed]
+            if blocked:
+                reason = f"{blocked[0]} {outcomes[blocked[0]].status}"
+                outcomes[check_id] = UnitOutcome(check_id, 'skipped', reason=reason)
+                print(f"⏭️ {check_id}: skipped - {reason}")
+                self._on_skip(check_id, reason)
+                continue
+            scheduler.add(check_id, self._unit(check),
+                          requires=[r for r in check.requires if r in scheduler.units])
+        outcomes.update(scheduler.run(on_skip=self._on_skip))
+
+        self.outcomes = outcomes
+        self.verdicts = {profile.name: profile.passed(self.outcomes) for profile in self.profiles}
+        return all(self.verdicts.values())
+
+    def print_report(self, wall_clock):
+        """Per-profile verdicts, shared work and the fixes for what failed"""
+        print("\n📊 Profile Results")
+        print("=" * 60)
+        for profile in self.profiles:
+            outcomes = [self.outcomes[check_id] for check_id in profile.checks]
+            passed = sum(outcome.passed for outcome in outcomes)
+            icon = "✅" if self.verdicts[profile.name] else "❌"
+            line = f"  {icon} {profile.name}: {passed}/{len(outcomes)} checks passed"
+            problems = [f"{o.name} {o.status}" for o in outcomes if not o.passed]
+            print(line + (f" ({', '.join(problems)})" if problems else ""))
+
+        shared = [f"{key} ran {computed}x for {used} checks"
+                  for key, (computed, used) in self.context.usage.items() if used]
+        print(f"\n🧵 {len(self.check_ids)} checks on {self.jobs} workers in {wall_clock:.2f}s")
+        if shared:
+            print(f"♻️ Shared: {', '.join(shared)}")
+        print_connection_stats()
+
+        used = sorted({r.remediation for r in self.reporter.results
+                       if r.remediation and r.status in ('fail', 'warn')})
+        if used:
+            print("\n🛠️ How to Fix")
+            for key in used:
+                print(f"  • {REMEDIATIONS.get(key, key)}")
+
+        project_id = self.context.env_vars.get('VITE_FIREBASE_PROJECT_ID')
+        if project_id:
+            print(f"\n🔗 Firebase Console: https://console.firebase.google.com/project/{project_id}")
+
+    def close(self):
+        self.context.close()
+
+
+def run_profiles(profile_names, jobs=DEFAULT_JOBS, cache=None, token_cache=None, reporter=None):
+    """Run the given profiles; used by the per-profile scripts.
+
+    With a machine-readable reporter the results (and closing summary) go to
+    stdout and the text report to stderr, as in main().
+    """
+    engine = CheckEngine(profile_names, jobs=jobs, cache=cache, reporter=reporter, token_cache=token_cache)
+    with engine.reporter.quiet():
+        try:
+            success = engine.run()
+        finally:
+            engine.close()
+    engine.reporter.finish(success, profiles=engine.verdicts,
+                           issues=len(engine.issues), warnings=len(engine.warnings))
+    return success
+
+
+def add_engine_arguments(parser):
+    """Register the shared --jobs / --timings / cache options on an argparse parser"""
+    parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS,
+                        help=f"checks to run in parallel once their prerequisites pass (default: {DEFAULT_JOBS})")
+    parser.add_argument('--timings', action='store_true',
+                        help="print time spent importing modules versus running checks")
+    add_cache_arguments(parser)
+    add_token_cache_argument(parser)
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Run one or more Firebase check profiles as a single schedule")
+    parser.add_argument('--profile', '-p', action='append', choices=list(PROFILES),
+                        help="profile to run; repeat to combine (default: quick)")
+    parser.add_argument('--list', action='store_true', help="list profiles and their checks, then exit")
+    add_engine_arguments(parser)
+    add_format_argument(parser)
+    return parser.parse_args(argv)
+
+
+def print_profiles():
+    """Print every profile and the checks it runs"""
+    for profile in PROFILES.values():
+        strict = " (skips count as failures)" if profile.strict else ""
+        print(f"{profile.name}: {profile.description}{strict}")
+        print(f"  {', '.join(profile.checks)}")
+
+
+def main(args=None):
+    """Main function"""
+    args = args or parse_args([])
+    if args.list:
+        print_profiles()
+        return True
+
+    engine = CheckEngine(args.profile or ['quick'], jobs=args.jobs, cache=cache_from_args(args),
+                         reporter=ResultReporter(args.format), token_cache=token_cache_from_args(args))
+    with engine.reporter.quiet():
+        try:
+            success = engine.run()
+            if args.timings:
+                timings.print_report()
+        except KeyboardInterrupt:
+            print("\n\n⏹️ Check cancelled by user")
+            success = False
+        finally:
+            engine.close()
+    engine.reporter.finish(success, profiles=engine.verdicts,
+                           issues=len(engine.issues), warnings=len(engine.warnings))
+    return success
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    success = main(args)
+    log = sys.stderr if args.format != 'text' else sys.stdout
+    if success and not args.list:
+        print("\n✅ All selected profiles passed", file=log)
+    elif not success:
+        print("\n❌ Some checks need attention", file=log)
+    sys.exit(0 if success else 1)
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Fleet Firebase Checker for EduGenie Platform
+Checks many tenants (each with its own .env file and service account JSON)
+side by side on a process pool and prints one merged report.
+
+firebase_admin only allows one default app per process, so every tenant is
+checked in a worker process under its own named Firebase app.
+
+Manifest format (JSON):
+    [
+        {"name": "acme", "env": "tenants/acme/.env.local", "service_account": "tenants/acme/sa.json"},
+        {"name": "globex", "env": "tenants/globex/.env.production"}
+    ]
+Relative paths are resolved against the manifest's directory.
+
+Usage:
+    python firebase_fleet_checker.py fleet.json --workers 8 --json fleet-report.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+try:
+    from env_loader import load_env_file
+    from firebase_probes import client_probes, run_probes, DEFAULT_BUDGET
+    from comprehensive_firebase_checker import import_admin_sdk, SERVICE_ACCOUNT_FIELDS
+except ImportError as e:
+    print("❌ Missing required packages. Please install them with:")
+    print("pip install -r requirements-comprehensive-firebase.txt")
+    sys.exit(1)
+
+# Columns of the merged report, in order
+FLEET_CHECKS = ['auth', 'firestore', 'project', 'admin_init', 'admin_auth', 'admin_firestore']
+
+
+def load_manifest(path):
+    """Read the fleet manifest and resolve its paths"""
+    with open(path, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+
+    if not isinstance(entries, list):
+        raise ValueError(f"Manifest must be a JSON list of tenant objects, not {type(entries).__name__}")
+    base = os.path.dirname(os.path.abspath(path))
+    tenants = []
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            raise ValueError(f"Manifest entry {index} must be an object, not {type(entry).__name__}")
+        env_path = entry.get('env')
+        if not isinstance(env_path, str) or not env_path:
+            raise ValueError(f"Manifest entry {index} has no 'env' file")
+        service_account = entry.get('service_account')
+        if service_account is not None and not isinstance(service_account, str):
+            raise ValueError(f"Manifest entry {index} has a non-string 'service_account'")
+        tenants.append({
+            'name': entry.get('name') or f"tenant-{index + 1}",
+            'env': os.path.join(base, env_path),
+            'service_account': os.path.join(base, service_account) if service_account else None,
+        })
+    return tenants
+
+
+def _check_admin(tenant, project_id, result):
+    """Admin SDK checks for one tenant under its own named app"""
+    try:
+        with open(tenant['service_account'], 'r', encoding='utf-8') as f:
+            service_account = json.load(f)
+    except (OSError, ValueError) as e:
+        result['checks']['admin_init'] = False
+        result['issues'].append(f"Service account file error: {e}")
+        return
+
+    missing_fields = [field for field in SERVICE_ACCOUNT_FIELDS if field not in service_account]
+    if missing_fields:
+        result['checks']['admin_init'] = False
+        result['issues'].append(f"Service account missing fields: {missing_fields}")
+        return
+    if service_account.get('project_id') != project_id:
+        result['warnings'].append("Project ID mismatch between service account and environment")
+
+    try:
+        firebase_admin, credentials, auth, firestore = import_admin_sdk()
+    except ImportError:
+        result['checks']['admin_init'] = False
+        result['issues'].append("Admin SDK error: firebase-admin package is not installed")
+        return
+
+    app = None
+    try:
+        started = time.perf_counter()
+        app = firebase_admin.initialize_app(
+            credentials.Certificate(tenant['service_account']), name=f"fleet-{tenant['name']}"
+        )
+        result['timings']['admin_init'] = time.perf_counter() - started
+        result['checks']['admin_init'] = True
+    except Exception as e:
+        result['checks']['admin_init'] = False
+        result['issues'].append(f"Admin SDK initialization error: {e}")
+        return
+
+    try:
+        checks = (
+            ('admin_auth', 'Admin Auth', lambda: auth.list_users(max_results=1, app=app)),
+            ('admin_firestore', 'Admin Firestore',
+             lambda: next(firestore.client(app=app).collection('test').limit(1).stream(), None)),
+        )
+        for key, label, call in checks:
+            started = time.perf_counter()
+            try:
+                call()
+                result['checks'][key] = True
+            except Exception as e:
+                result['checks'][key] = False
+                result['issues'].append(f"{label} error: {e}")
+            result['timings'][key] = time.perf_counter() - started
+    finally:
+        firebase_admin.delete_app(app)
+
+
+def check_tenant(tenant, budget=DEFAULT_BUDGET, base_url=None):
+    """Check one tenant; runs inside a worker process and returns a plain dict"""
+    started = time.perf_counter()
+    result = {
+        'name': tenant['name'],
+        'env': tenant['env'],
+        'service_account': tenant['service_account'],
+        'project_id': None,
+        'checks': {},
+        'timings': {},
+        'issues': [],
+        'warnings': [],
+    }
+
+    if not os.path.exists(tenant['env']):
+        result['issues'].append(f"Environment file {tenant['env']} not found")
+        result['duration'] = time.perf_counter() - started
+        return result
+
+    env_vars = load_env_file(tenant['env'])
+    project_id = env_vars.get('VITE_FIREBASE_PROJECT_ID')
+    api_key = env_vars.get('VITE_FIREBASE_API_KEY')
+    result['project_id'] = project_id
+
+    if project_id and api_key:
+        for probe in run_probes(client_probes(project_id, api_key, base_url), budget=budget):
+            result['checks'][probe.key] = probe.ok
+            result['timings'][probe.key] = probe.elapsed
+            if probe.timed_out:
+                result['issues'].append(f"{probe.label}: connection timeout")
+            elif probe.error:
+                result['issues'].append(f"{probe.label} error: {probe.error}")
+            elif not probe.ok:
+                result['issues'].append(f"{probe.label} returned status {probe.status_code}")
+    else:
+        result['issues'].append("Missing project ID or API key")
+
+    if tenant['service_account']:
+        _check_admin(tenant, project_id, result)
+
+    result['duration'] = time.perf_counter() - started
+    return result
+
+
+def print_fleet_report(results, wall_clock):
+    """Print one merged table for the whole fleet"""
+    print("\n📊 FLEET STATUS REPORT")
+    print("=" * 78)
+    header = f"  {'Tenant':<18} {'Project':<22} " + " ".join(f"{c[:9]:>9}" for c in FLEET_CHECKS)
+    print(header)
+    for result in results:
+        cells = []
+        for check in FLEET_CHECKS:
+            if check not in result['checks']:
+                cells.append(f"{'-':>9}")
+            else:
+                cells.append(f"{'✅' if result['checks'][check] else '❌':>8}")
+        print(f"  {result['name'][:18]:<18} {str(result['project_id'])[:22]:<22} " + " ".join(cells))
+
+    healthy = [r for r in results if not r['issues']]
+    print(f"\n📈 Summary:")
+    print(f"  Tenants Healthy: {len(healthy)}/{len(results)}")
+    print(f"  Wall Clock: {wall_clock:.1f}s "
+          f"(serial time would be ~{sum(r['duration'] for r in results):.1f}s)")
+
+    for result in results:
+        if result['issues'] or result['warnings']:
+            print(f"\n🏷️ {result['name']}:")
+            for issue in result['issues']:
+                print(f"  ❌ {issue}")
+            for warning in result['warnings']:
+                print(f"  ⚠️ {warning}")
+
+
+def run_fleet(tenants, workers=None, budget=DEFAULT_BUDGET, base_url=None):
+    """Check all tenants on a process pool; results come back in manifest order"""
+    results = [None] * len(tenants)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(check_tenant, tenant, budget, base_url): i for i, tenant in enumerate(tenants)}
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {
+                    'name': tenants[index]['name'], 'env': tenants[index]['env'],
+                    'service_account': tenants[index]['service_account'], 'project_id': None,
+                    'checks': {}, 'timings': {}, 'issues': [f"Worker crashed: {e}"],
+                    'warnings': [], 'duration': 0.0,
+                }
+            results[index] = result
+            icon = "✅" if not result['issues'] else "❌"
+            print(f"  {icon} {result['name']} ({result['duration']:.1f}s)")
+    return results
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Check many EduGenie Firebase tenants in parallel")
+    parser.add_argument('manifest', help="JSON manifest of {name, env, service_account} entries")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes (default: number of CPUs)")
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET,
+                        help=f"time budget for each tenant's client probes (default: {DEFAULT_BUDGET})")
+    parser.add_argument('--json', metavar='PATH', help="also write the merged report as JSON")
+    parser.add_argument('--base-url', metavar='URL',
+                        help="send client probes to this server instead of Google (e.g. an emulator)")
+    return parser.parse_args(argv)
+
+
+def main(args):
+    """Main function"""
+    print("🚀 Fleet Firebase Configuration Checker")
+    print("=" * 60)
+    print(f"⏰ Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+    try:
+        tenants = load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        print(f"❌ Cannot read manifest {args.manifest}: {e}")
+        return False
+
+    print(f"📋 {len(tenants)} tenants, {args.workers or os.cpu_count()} workers\n")
+    started = time.perf_counter()
+    results = run_fleet(tenants, args.workers, args.budget, args.base_url)
+    wall_clock = time.perf_counter() - started
+
+    print_fleet_report(results, wall_clock)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'generated_at': datetime.now().isoformat(), 'wall_clock': wall_clock,
+                       'tenants': results}, f, indent=2)
+        print(f"\n📄 Merged report written to {args.json}")
+
+    return all(not r['issues'] for r in results)
+
+
+if __name__ == "__main__":
+    try:
+        success = main(parse_args())
+    except KeyboardInterrupt:
+        print("\n\n❌ Fleet check interrupted by user")
+        success = False
+    sys.exit(0 if success else 1)
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Firebase Health Metrics Exporter for EduGenie Platform
+Runs the client API probes and Admin SDK checks on a fixed interval in the
+background and serves the results on /metrics in OpenMetrics (Prometheus) format.
+
+Scrapes only read the latest numbers, so they stay cheap and never trigger
+extra calls to Google endpoints.
+
+Usage:
+    python firebase_metrics_exporter.py --port 9464 --interval 60
+"""
+
+import argparse
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    from env_loader import load_vite_env
+    from firebase_probes import client_probes, run_probes
+    from comprehensive_firebase_checker import ComprehensiveFirebaseChecker, import_admin_sdk
+except ImportError as e:
+    print("❌ Missing required packages. Please install them with:")
+    print("pip install -r requirements-comprehensive-firebase.txt")
+    sys.exit(1)
+
+# Histogram buckets for probe latency, in seconds
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+OPENMETRICS_CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    pairs = ','.join(f'{key}="{str(value)}"' for key, value in sorted(labels.items()))
+    return '{' + pairs + '}'
+
+
+class MetricsRegistry:
+    """Thread-safe store for the handful of metrics this exporter publishes"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}   # endpoint -> [bucket counts..., count, sum]
+        self._responses = {}    # (endpoint, code) -> count
+        self._last_success = {}  # endpoint -> unix timestamp
+        self._up = {}           # endpoint -> 0/1
+        self._admin_init_seconds = None
+        self._admin_up = None   # 0/1 once initialization has been attempted
+        self._admin_init_failures = 0
+        self._runs = 0
+
+    def observe(self, endpoint, seconds, code, ok):
+        with self._lock:
+            buckets = self._histograms.setdefault(endpoint, [0] * len(LATENCY_BUCKETS) + [0, 0.0])
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    buckets[i] += 1
+            buckets[-2] += 1
+            buckets[-1] += seconds
+            key = (endpoint, str(code))
+            self._responses[key] = self._responses.get(key, 0) + 1
+            self._up[endpoint] = 1 if ok else 0
+            if ok:
+                self._last_success[endpoint] = time.time()
+
+    def set_admin_init(self, seconds):
+        with self._lock:
+            self._admin_init_seconds = seconds
+            self._admin_up = 1
+
+    def admin_init_failed(self):
+        # Counted, not observed: a failed init has no latency worth a histogram sample
+        with self._lock:
+            self._admin_init_failures += 1
+            self._admin_up = 0
+
+    def finish_run(self):
+        with self._lock:
+            self._runs += 1
+
+    def render(self, openmetrics=True):
+        """Render all metrics in OpenMetrics or Prometheus 0.0.4 text format"""
+        lines = []
+
+        def counter(name, help_text):
+            lines.append(f"# TYPE {name if openmetrics else name + '_total'} counter")
+            lines.append(f"# HELP {name if openmetrics else name + '_total'} {help_text}")
+
+        with self._lock:
+            lines.append("# TYPE firebase_probe_latency_seconds histogram")
+            lines.append("# HELP firebase_probe_latency_seconds Latency of Firebase health probes")
+            for endpoint, buckets in sorted(self._histograms.items()):
+                for bound, count in zip(LATENCY_BUCKETS, buckets):
+                    labels = _labels({'endpoint': endpoint, 'le': bound})
+                    lines.append(f"firebase_probe_latency_seconds_bucket{labels} {count}")
+                labels = _labels({'endpoint': endpoint, 'le': '+Inf'})
+                lines.append(f"firebase_probe_latency_seconds_bucket{labels} {buckets[-2]}")
+                lines.append(f"firebase_probe_latency_seconds_count{_labels({'endpoint': endpoint})} {buckets[-2]}")
+                lines.append(f"firebase_probe_latency_seconds_sum{_labels({'endpoint': endpoint})} {buckets[-1]:.6f}")
+
+            counter('firebase_probe_responses', "Probe outcomes by endpoint and HTTP status code")
+            for (endpoint, code), count in sorted(self._responses.items()):
+                lines.append(f"firebase_probe_responses_total{_labels({'endpoint': endpoint, 'code': code})} {count}")
+
+            lines.append("# TYPE firebase_probe_up gauge")
+            lines.append("# HELP firebase_probe_up Whether the last probe of an endpoint succeeded")
+            for endpoint, up in sorted(self._up.items()):
+                lines.append(f"firebase_probe_up{_labels({'endpoint': endpoint})} {up}")
+
+            lines.append("# TYPE firebase_probe_last_success_timestamp_seconds gauge")
+            lines.append("# HELP firebase_probe_last_success_timestamp_seconds Unix time of the last successful probe")
+            for endpoint, stamp in sorted(self._last_success.items()):
+                lines.append(f"firebase_probe_last_success_timestamp_seconds{_labels({'endpoint': endpoint})} {stamp:.3f}")
+
+            lines.append("# TYPE firebase_admin_init_duration_seconds gauge")
+            lines.append("# HELP firebase_admin_init_duration_seconds Time taken to initialize the Admin SDK app")
+            if self._admin_init_seconds is not None:
+                lines.append(f"firebase_admin_init_duration_seconds {self._admin_init_seconds:.6f}")
+
+            lines.append("# TYPE firebase_admin_up gauge")
+            lines.append("# HELP firebase_admin_up Whether the Admin SDK app is initialized")
+            if self._admin_up is not None:
+                lines.append(f"firebase_admin_up {self._admin_up}")
+
+            counter('firebase_admin_init_failures', "Failed Admin SDK initialization attempts")
+            lines.append(f"firebase_admin_init_failures_total {self._admin_init_failures}")
+
+            counter('firebase_probe_runs', "Completed background probe rounds")
+            lines.append(f"firebase_probe_runs_total {self._runs}")
+
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+class ProbeLoop:
+    """Background thread that probes Firebase every `interval` seconds"""
+
+    def __init__(self, registry, interval=60, budget=10, admin=True):
+        self.registry = registry
+        self.interval = interval
+        self.budget = budget
+        self.admin = admin
+        self._admin_handles = None
+        self._stop = threading.Event()
+
+    def _init_admin(self):
+        """Initialize a named Admin SDK app once and keep it for later rounds"""
+        checker = ComprehensiveFirebaseChecker()
+        if not checker.find_service_account_file():
+            return None
+        firebase_admin, credentials, auth, firestore = import_admin_sdk()
+        started = time.perf_counter()
+        app = firebase_admin.initialize_app(
+            credentials.Certificate(checker.service_account_path), name='metrics-exporter'
+        )
+        db = firestore.client(app=app)
+        self.registry.set_admin_init(time.perf_counter() - started)
+        return auth, app, db
+
+    def probe_client(self):
+        env_vars = load_vite_env()
+        project_id = env_vars.get('VITE_FIREBASE_PROJECT_ID')
+        api_key = env_vars.get('VITE_FIREBASE_API_KEY')
+        if not project_id or not api_key:
+            return
+        for result in run_probes(client_probes(project_id, api_key), budget=self.budget):
+            if result.timed_out:
+                code = 'timeout'
+            elif result.error:
+                code = 'error'
+            else:
+                code = result.status_code
+            self.registry.observe(result.key, result.elapsed or 0.0, code, result.ok)
+
+    def probe_admin(self):
+        if self._admin_handles is None:
+            try:
+                self._admin_handles = self._init_admin()
+            except Exception as e:
+                print(f"⚠️ Admin SDK initialization failed: {e}")
+                self.registry.admin_init_failed()
+                return
+            if self._admin_handles is None:
+                self.admin = False
+                return
+        auth, app, db = self._admin_handles
+
+        checks = (
+            ('admin_auth', lambda: auth.list_users(max_results=1, app=app)),
+            ('admin_firestore', lambda: next(db.collection('test').limit(1).stream(), None)),
+        )
+        for endpoint, call in checks:
+            started = time.perf_counter()
+            try:
+                call()
+                self.registry.observe(endpoint, time.perf_counter() - started, 'ok', True)
+            except Exception:
+                self.registry.observe(endpoint, time.perf_counter() - started, 'error', False)
+
+    def run_once(self):
+        self.probe_client()
+        if self.admin:
+            self.probe_admin()
+        self.registry.finish_run()
+
+    def run(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"⚠️ Probe round failed: {e}")
+            self._stop.wait(max(self.interval - (time.monotonic() - started), 0))
+
+    def start(self):
+        thread = threading.Thread(target=self.run, name='firebase-probe-loop', daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self._stop.set()
+
+
+def make_handler(registry):
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            openmetrics = 'application/openmetrics-text' in self.headers.get('Accept', '')
+            body = registry.render(openmetrics=openmetrics).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return MetricsHandler
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Serve Firebase probe metrics for Prometheus")
+    parser.add_argument('--host', default='0.0.0.0', help="address to listen on (default: 0.0.0.0)")
+    parser.add_argument('--port', type=int, default=9464, help="port to listen on (default: 9464)")
+    parser.add_argument('--interval', type=float, default=60,
+                        help="seconds between background probe rounds (default: 60)")
+    parser.add_argument('--budget', type=float, default=10,
+                        help="time budget for one round of client probes (default: 10)")
+    parser.add_argument('--no-admin', action='store_true', help="skip the Admin SDK checks")
+    return parser.parse_args(argv)
+
+
+def main(args=None):
+    """Main function"""
+    args = args or parse_args([])
+    registry = MetricsRegistry()
+    loop = ProbeLoop(registry, interval=args.interval, budget=args.budget, admin=not args.no_admin)
+    loop.start()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(registry))
+    print(f"📈 Serving Firebase metrics on http://{args.host}:{args.port}/metrics")
+    print(f"⏱️ Probing every {args.interval:g}s (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️ Exporter stopped")
+    finally:
+        loop.stop()
+        server.server_close()
+    return True
+
+
+if __name__ == "__main__":
+    success = main(parse_args())
+    sys.exit(0 if success else 1)
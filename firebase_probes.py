@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Concurrent Firebase Probe Engine for EduGenie Platform
+Fires the client REST probes (Auth, Firestore, project init.json) at the same time
+under one shared time budget instead of one after another.
+
+Each probe is resilient within its own latency budget: connection errors and
+retryable statuses (429/5xx) are retried with jittered exponential backoff,
+and a request still running past the endpoint's observed p95 latency gets a
+hedged duplicate - whichever answers first wins. Results record how many
+requests each verdict took.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+
+from check_timings import percentile
+from http_session import get_session
+from probe_cache import CachedResponse
+
+# Overall wall-clock budget for one round of probes, in seconds
+DEFAULT_BUDGET = 10
+
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+# Hedge after this long until an endpoint has enough samples for a p95
+DEFAULT_HEDGE_AFTER = 1.0
+MIN_HEDGE_SAMPLES = 5
+LATENCY_WINDOW = 50
+
+
+class RetryPolicy:
+    """How often and how patiently a probe is retried"""
+
+    def __init__(self, max_attempts=3, base_delay=0.2, max_delay=2.0, retryable=RETRYABLE_STATUSES):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retryable = tuple(retryable)
+
+    def backoff(self, attempt, retry_after=None):
+        """Full-jitter exponential delay before retry number `attempt` (1-based)"""
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+DEFAULT_POLICY = RetryPolicy()
+# One request, no hedging - what the probes did before retries existed
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+
+class LatencyTracker:
+    """Recent successful latencies per endpoint, for the hedging threshold"""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.window = window
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, seconds):
+        with self._lock:
+            self._samples.setdefault(endpoint, deque(maxlen=self.window)).append(seconds)
+
+    def hedge_after(self, endpoint):
+        """Observed p95 for the endpoint, or the default until there are enough samples"""
+        with self._lock:
+            samples = sorted(self._samples.get(endpoint, ()))
+        if len(samples) < MIN_HEDGE_SAMPLES:
+            return DEFAULT_HEDGE_AFTER
+        return percentile(samples, 95)
+
+
+# Shared across rounds, so watch mode and the exporters learn each endpoint's p95
+latency_tracker = LatencyTracker()
+
+
+class Probe:
+    """A single HTTP request to fire as part of a probe round"""
+
+    def __init__(self, key, label, method, url, fingerprint=None, expected=(200,),
+                 budget=None, idempotent=None, **kwargs):
+        self.key = key
+        self.label = label
+        self.method = method
+        self.url = url
+        # Status codes that mean the service is reachable and working
+        self.expected = tuple(expected)
+        # (project_id, api_key, endpoint) - probes without one are never cached
+        self.fingerprint = fingerprint
+        # Latency budget for this probe, retries included; None uses the round budget
+        self.budget = budget
+        # Only requests that are safe to repeat are retried or hedged
+        self.idempotent = method in ('GET', 'HEAD') if idempotent is None else idempotent
+        self.kwargs = kwargs
+
+    @property
+    def endpoint(self):
+        """Latency-tracking key; the query string carries the API key"""
+        return f"{self.method} {self.url.split('?')[0]}"
+
+
+class ProbeResult:
+    """Outcome of one probe: a response, an error, or a missed deadline"""
+
+    def __init__(self, probe):
+        self.key = probe.key
+        self.label = probe.label
+        self.expected = probe.expected
+        self.response = None
+        self.error = None
+        self.timed_out = False
+        self.elapsed = None
+        self.cached_age = None
+        # Requests sent for this verdict, hedges included; retries after the first
+        self.attempts = 0
+        self.retries = 0
+        self.hedges = 0
+
+    @property
+    def finished(self):
+        return not self.timed_out
+
+    @property
+    def status_code(self):
+        return self.response.status_code if self.response is not None else None
+
+    @property
+    def ok(self):
+        return self.status_code in self.expected
+
+    @property
+    def is_timeout(self):
+        return self.timed_out or isinstance(self.error, requests.exceptions.Timeout)
+
+    @property
+    def cached(self):
+        return self.cached_age is not None
+
+    @property
+    def attempts_note(self):
+        """e.g. '3 attempts, 1 hedged' - empty when one request settled it"""
+        if self.attempts <= 1:
+            return ""
+        return f"{self.attempts} attempts" + (f", {self.hedges} hedged" if self.hedges else "")
+
+    @property
+    def note(self):
+        """Suffix for report lines so cached or retried answers are not mistaken for first-try ones"""
+        if self.cached:
+            return f" (cached {self.cached_age:.0f}s ago)"
+        return f" ({self.attempts_note})" if self.attempts_note else ""
+
+
+def client_probes(project_id, api_key, base_url=None):
+    """Build the standard client connectivity probes for a Firebase project.
+
+    With base_url, every probe is sent to that server instead (a local stand-in
+    or emulator serving the same paths).
+    """
+    auth_base = base_url or "https://identitytoolkit.googleapis.com"
+    firestore_base = base_url or "https://firestore.googleapis.com"
+    hosting_base = base_url or f"https://{project_id}.firebaseapp.com"
+    return [
+        Probe(
+            'auth', 'Authentication API', 'POST',
+            f"{auth_base}/v1/accounts:lookup?key={api_key}",
+            fingerprint=(project_id, api_key, 'accounts:lookup'),
+            expected=(400,),  # a lookup with an empty ID token is rejected, which proves the API answers
+            idempotent=True,  # ... and only reads, so repeating it is safe. signUp would create
+                              # an anonymous user whenever anonymous sign-in is enabled
+            json={'idToken': ''}
+        ),
+        Probe(
+            'firestore', 'Firestore API', 'GET',
+            f"{firestore_base}/v1/projects/{project_id}/databases/(default)/documents",
+            fingerprint=(project_id, api_key, 'firestore/documents'),
+            expected=(200, 401, 403)  # 401/403 are OK - means service exists
+        ),
+        Probe(
+            'project', 'Firebase Project', 'GET',
+            f"{hosting_base}/__/firebase/init.json",
+            fingerprint=(project_id, api_key, 'init.json')
+        ),
+    ]
+
+
+def _send(probe, timeout, tracker):
+    started = time.perf_counter()
+    try:
+        response = get_session().request(probe.method, probe.url, timeout=timeout, **probe.kwargs)
+    except Exception as e:
+        return None, e
+    tracker.record(probe.endpoint, time.perf_counter() - started)
+    return response, None
+
+
+def _hedged_send(probe, deadline, tracker, hedge):
+    """One attempt: the request plus, past the endpoint's p95, a duplicate.
+
+    Returns (response, error, requests_sent, hedged). The slower twin is
+    abandoned; its own timeout bounds it.
+    """
+    remaining = deadline - time.perf_counter()
+    hedge_after = tracker.hedge_after(probe.endpoint)
+    if not hedge or hedge_after >= remaining:
+        return (*_send(probe, remaining, tracker), 1, False)
+
+    executor = ThreadPoolExecutor(max_workers=2)
+    try:
+        pending = {executor.submit(_send, probe, remaining, tracker)}
+        done, _ = wait(pending, timeout=hedge_after)
+        if done:
+            return (*done.pop().result(), 1, False)
+        pending.add(executor.submit(_send, probe, deadline - time.perf_counter(), tracker))
+        first = None
+        while pending:
+            done, pending = wait(pending, timeout=max(0.0, deadline - time.perf_counter()),
+                                 return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                response, error = future.result()
+                if response is not None:
+                    return response, None, 2, True
+                first = first or (response, error)
+        return (*(first or (None, requests.exceptions.Timeout("Hedged requests missed the deadline"))), 2, True)
+    finally:
+        executor.shutdown(wait=False)
+
+
+def _retry_after(response):
+    try:
+        return float(response.headers.get('Retry-After'))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def _execute(probe, budget, policy=DEFAULT_POLICY, tracker=latency_tracker):
+    """Send a probe with retries and hedging inside its budget.
+
+    Returns (response, error, elapsed, attempts, retries, hedges).
+    """
+    started = time.perf_counter()
+    deadline = started + budget
+    resilient = probe.idempotent and policy.max_attempts > 1
+    attempts = retries = hedges = 0
+    response = error = None
+
+    for attempt in range(1, (policy.max_attempts if resilient else 1) + 1):
+        response, error, sent, hedged = _hedged_send(probe, deadline, tracker, hedge=resilient)
+        attempts += sent
+        hedges += hedged
+        if error is None and response.status_code not in policy.retryable:
+            break
+        if attempt == policy.max_attempts or not resilient:
+            break
+        delay = policy.backoff(attempt, _retry_after(response))
+        if time.perf_counter() + delay >= deadline:
+            break
+        time.sleep(delay)
+        retries += 1
+
+    return response, error, time.perf_counter() - started, attempts, retries, hedges
+
+
+def run_probes(probes, budget=DEFAULT_BUDGET, cache=None, policy=DEFAULT_POLICY):
+    """Run all probes concurrently and return their results in the order given.
+
+    Each probe retries and hedges within its own budget (probe.budget, or
+    the round budget). Probes still running when the round budget expires
+    are marked as timed out; their worker threads are abandoned rather than
+    waited on. With a ProbeCache, fresh cached answers are used instead of
+    hitting the network.
+    """
+    results = [ProbeResult(probe) for probe in probes]
+    pending = []
+
+    for probe, result in zip(probes, results):
+        hit = cache.get(probe) if cache else None
+        if hit:
+            status_code, result.cached_age = hit
+            result.response = CachedResponse(status_code)
+            result.elapsed = 0.0
+        else:
+            pending.append((probe, result))
+
+    if not pending:
+        return results
+
+    executor = ThreadPoolExecutor(max_workers=len(pending))
+    futures = {
+        executor.submit(_execute, probe, min(probe.budget or budget, budget), policy): (probe, result)
+        for probe, result in pending
+    }
+
+    done, _ = wait(futures, timeout=budget)
+
+    for future, (probe, result) in futures.items():
+        if future in done:
+            (result.response, result.error, result.elapsed,
+             result.attempts, result.retries, result.hedges) = future.result()
+            status_code = result.response.status_code if result.response is not None else None
+            # A 429/5xx left over after the retries is transient - replaying it would skip the next retry
+            if cache and status_code is not None and (status_code in probe.expected
+                                                      or status_code not in policy.retryable):
+                cache.put(probe, status_code)
+        else:
+            result.timed_out = True
+            result.elapsed = budget
+            future.cancel()
+
+    executor.shutdown(wait=False, cancel_futures=True)
+    return results
+
+
+def print_probe_summary(results, budget=DEFAULT_BUDGET, indent="  "):
+    """Print which probes finished and which hit the shared deadline"""
+    results = list(results)
+    finished = [r for r in results if r.finished]
+    elapsed = max((r.elapsed for r in results if r.elapsed is not None), default=0)
+    print(f"{indent}⏱️ {len(finished)}/{len(results)} probes finished in {elapsed:.2f}s (budget {budget}s)")
+    for result in results:
+        if result.cached:
+            print(f"{indent}   💾 {result.label}: cached result from {result.cached_age:.0f}s ago")
+        elif result.timed_out:
+            print(f"{indent}   ⌛ {result.label}: hit the {budget}s deadline")
+        elif result.attempts_note:
+            print(f"{indent}   🔁 {result.label}: {result.attempts_note} ({result.elapsed:.2f}s)")
@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Firestore Composite Index Advisor for EduGenie Platform
+Extracts every query shape from src/services/*.ts (firestore_queries.py),
+works out which composite index each one needs and diffs that against
+firestore.indexes.json - or, with --deployed, the indexes of the live
+project - so a missing index shows up here instead of as a failing query in
+production.
+
+Index rules follow Firestore's query planner: equality-only filters are
+served by merging single-field indexes; equality or range filters combined
+with an orderBy on another field need a composite index, unless several
+existing composite indexes with the same sort order can be merged.
+
+Usage:
+    python firestore_index_advisor.py                 # against firestore.indexes.json
+    python firestore_index_advisor.py --write         # add the missing indexes to it
+    python firestore_index_advisor.py --deployed      # against the live project (service account)
+"""
+
+import argparse
+import json
+import os
+import sys
+
+try:
+    from firestore_queries import (CONTAINS_OPS, EQUALITY_OPS, RANGE_OPS, SERVICES_DIR,
+                                   extract_queries)
+    from http_session import get_session
+except ImportError as e:
+    print("❌ Missing required packages. Please install them with:")
+    print("pip install -r requirements-comprehensive-firebase.txt")
+    sys.exit(1)
+
+INDEXES_FILE = 'firestore.indexes.json'
+DIRECTIONS = {'asc': 'ASCENDING', 'desc': 'DESCENDING'}
+INDEXES_URL = ("https://firestore.googleapis.com/v1/projects/{project_id}"
+               "/databases/(default)/collectionGroups/-/indexes")
+
+
+class IndexSpec:
+    """A composite index: equality fields (any order), then the sort fields in order"""
+
+    def __init__(self, collection, scope, equality, sort, contains=None):
+        self.collection = collection
+        self.scope = scope
+        self.equality = frozenset(equality)
+        # [(field, 'ASCENDING' | 'DESCENDING')]
+        self.sort = tuple(sort)
+        self.contains = contains
+
+    @property
+    def key(self):
+        return (self.collection, self.scope, self.equality, self.sort, self.contains)
+
+    def fields(self):
+        """Field list in firestore.indexes.json form"""
+        fields = [{'fieldPath': field, 'order': 'ASCENDING'} for field in sorted(self.equality)]
+        if self.contains:
+            fields.append({'fieldPath': self.contains, 'arrayConfig': 'CONTAINS'})
+        fields += [{'fieldPath': field, 'order': order} for field, order in self.sort]
+        return fields
+
+    def to_json(self):
+        return {'collectionGroup': self.collection, 'queryScope': self.scope, 'fields': self.fields()}
+
+    def describe(self):
+        parts = [f"{field} ASC" for field in sorted(self.equality)]
+        if self.contains:
+            parts.append(f"{self.contains} CONTAINS")
+        parts += [f"{field} {order[:-6]}" for field, order in self.sort]
+        return f"{self.collection}: " + ", ".join(parts)
+
+
+def required_index(shape):
+    """The composite index a query shape needs, or None when single-field indexes serve it"""
+    filters = shape.filters
+    equality = {f.field for f in filters if f.op in EQUALITY_OPS}
+    contains = [f.field for f in filters if f.op in CONTAINS_OPS]
+    ranges = [f.field for f in filters if f.op in RANGE_OPS]
+
+    sort = []
+    for order in shape.orders:
+        # Ordering by a field pinned with == is a no-op for the planner
+        if order.field not in equality and order.field not in [field for field, _ in sort]:
+            sort.append((order.field, DIRECTIONS.get((order.direction or 'asc').lower(), 'ASCENDING')))
+    # Range fields missing from orderBy are ordered implicitly, ascending, after the explicit ones
+    for field in sorted(set(ranges)):
+        if field not in [name for name, _ in sort]:
+            sort.append((field, 'ASCENDING'))
+
+    if not sort:
+        return None
+    if not equality and not contains and len(sort) == 1:
+        return None
+    return IndexSpec(shape.collection, shape.scope, equality, sort, contains[0] if contains else None)
+
+
+def parse_index(entry):
+    """IndexSpec from a firestore.indexes.json / Admin API index entry"""
+    # The API appends the implicit __name__ ordering; index files leave it out
+    fields = [f for f in entry.get('fields', []) if f.get('fieldPath') != '__name__']
+    collection = entry.get('collectionGroup') or entry.get('name', '').split('/collectionGroups/')[-1].split('/')[0]
+    return {
+        'collection': collection,
+        'scope': entry.get('queryScope', 'COLLECTION'),
+        'fields': [(f['fieldPath'], f.get('order') or f.get('arrayConfig')) for f in fields],
+        'state': entry.get('state'),
+        'raw': entry,
+    }
+
+
+def _served_by(index, needed):
+    """True when `index` alone can serve `needed`: equality prefix as a set, then the exact sort"""
+    if (index['collection'], index['scope']) != (needed.collection, needed.scope):
+        return False
+    fields = index['fields']
+    prefix_length = len(needed.equality) + (1 if needed.contains else 0)
+    prefix, suffix = fields[:prefix_length], fields[prefix_length:]
+    expected_prefix = {(field, 'ASCENDING') for field in needed.equality}
+    if needed.contains:
+        expected_prefix.add((needed.contains, 'CONTAINS'))
+    # Equality fields may be indexed in either direction
+    prefix_set = {(field, 'ASCENDING' if order in ('ASCENDING', 'DESCENDING') else order) for field, order in prefix}
+    return prefix_set == expected_prefix and tuple(suffix) == needed.sort
+
+
+def _merge_cover(indexes, needed):
+    """Indexes Firestore can merge to serve `needed`: same sort order, equality fields covering it"""
+    if needed.contains:
+        return None
+    covering, covered = [], set()
+    for index in indexes:
+        if (index['collection'], index['scope']) != (needed.collection, needed.scope):
+            continue
+        fields = index['fields']
+        if len(fields) <= len(needed.sort) or tuple(fields[-len(needed.sort):]) != needed.sort:
+            continue
+        prefix = {field for field, _ in fields[:-len(needed.sort)]}
+        if prefix and prefix <= needed.equality:
+            covering.append(index)
+            covered |= prefix
+    return covering if covered == needed.equality and len(covering) > 1 else None
+
+
+class Advice:
+    """Outcome for one query shape"""
+
+    def __init__(self, shape, needed, status, served_by=()):
+        self.shape = shape
+        self.needed = needed
+        # 'single-field', 'present', 'building', 'merged', 'missing' or 'dynamic'
+        self.status = status
+        self.served_by = list(served_by)
+
+
+def advise(shapes, indexes):
+    """Match every shape's required index against the existing ones"""
+    advice = []
+    for shape in shapes:
+        if shape.dynamic or shape.collection is None:
+            advice.append(Advice(shape, None, 'dynamic'))
+            continue
+        needed = required_index(shape)
+        if needed is None:
+            advice.append(Advice(shape, None, 'single-field'))
+            continue
+        exact = [index for index in indexes if _served_by(index, needed)]
+        if exact:
+            building = all(index['state'] not in (None, 'READY') for index in exact)
+            advice.append(Advice(shape, needed, 'building' if building else 'present', exact))
+            continue
+        merged = _merge_cover(indexes, needed)
+        advice.append(Advice(shape, needed, 'merged', merged) if merged else Advice(shape, needed, 'missing'))
+    return advice
+
+
+def missing_indexes(advice):
+    """Distinct missing IndexSpecs with the shapes that need each"""
+    missing = {}
+    for item in advice:
+        if item.status == 'missing':
+            missing.setdefault(item.needed.key, (item.needed, []))[1].append(item.shape)
+    return list(missing.values())
+
+
+def merged_plan(missing):
+    """Fewer indexes for shapes that only differ in equality filters.
+
+    Shapes sharing a collection and sort order are covered by one index per
+    equality field, which Firestore merges at query time - fewer index
+    entries to write per document, at some cost to selective queries.
+    """
+    groups = {}
+    for needed, shapes in missing:
+        key = (needed.collection, needed.scope, needed.sort)
+        if needed.contains:
+            key += (id(needed),)
+        groups.setdefault(key, []).append((needed, shapes))
+    plan = []
+    for group in groups.values():
+        fields = sorted(set().union(*(needed.equality for needed, _ in group)))
+        if len(group) > 1 and len(fields) < len(group):
+            needed = group[0][0]
+            shapes = [shape for _, group_shapes in group for shape in group_shapes]
+            plan += [(IndexSpec(needed.collection, needed.scope, {field}, needed.sort),
+                      [shape for shape in shapes if any(f.field == field for f in shape.filters)])
+                     for field in fields]
+        else:
+            plan += group
+    return plan
+
+
+def unused_indexes(advice, indexes):
+    """Composite indexes no extracted query shape uses"""
+    used = {id(index) for item in advice for index in item.served_by}
+    return [index for index in indexes if id(index) not in used]
+
+
+def load_indexes_file(path=INDEXES_FILE):
+    """Parsed composite indexes from firestore.indexes.json; [] if the file does not exist"""
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return [parse_index(entry) for entry in json.load(f).get('indexes', [])]
+
+
+def load_deployed_indexes(service_account_path=None, token_cache=None):
+    """Composite indexes of the live project, listed with the service account's access token"""
+    from comprehensive_firebase_checker import ComprehensiveFirebaseChecker, import_admin_sdk
+    from token_cache import TokenCache, cached_certificate
+
+    if not service_account_path:
+        checker = ComprehensiveFirebaseChecker()
+        if not checker.find_service_account_file():
+            raise RuntimeError("Service account JSON file not found")
+        service_account_path = checker.service_account_path
+    with open(service_account_path, 'r', encoding='utf-8') as f:
+        service_account = json.load(f)
+    credentials = import_admin_sdk()[1]
+    cert = cached_certificate(credentials, service_account, token_cache or TokenCache())
+    token = cert.get_access_token().access_token
+
+    indexes, page_token = [], None
+    url = INDEXES_URL.format(project_id=service_account['project_id'])
+    while True:
+        params = {'pageToken': page_token} if page_token else {}
+        response = get_session().get(url, params=params, timeout=15,
+                                     headers={'Authorization': f"Bearer {token}"})
+        if response.status_code != 200:
+            raise RuntimeError(f"Listing indexes returned status {response.status_code}")
+        payload = response.json()
+        indexes += [parse_index(entry) for entry in payload.get('indexes', [])]
+        page_token = payload.get('nextPageToken')
+        if not page_token:
+            return indexes
+
+
+def write_indexes_file(missing, path=INDEXES_FILE):
+    """Append the missing indexes to firestore.indexes.json, keeping what is already there"""
+    document = {'indexes': [], 'fieldOverrides': []}
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            document = json.load(f)
+    document.setdefault('indexes', []).extend(needed.to_json() for needed, _ in missing)
+    document.setdefault('fieldOverrides', [])
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2)
+        f.write('\n')
+
+
+def print_advice(advice, indexes, indent="  ", merge=False):
+    """Per-shape verdicts, then the missing and unused indexes"""
+    icons = {'single-field': '➖', 'present': '✅', 'building': '⏳', 'merged': '🔀',
+             'missing': '❌', 'dynamic': '❔'}
+    notes = {'single-field': "single-field indexes", 'present': "composite index present",
+             'building': "composite index still building", 'merged': "served by merging indexes",
+             'missing': "composite index missing", 'dynamic': "not statically known"}
+    for item in advice:
+        shape = item.shape
+        variant = f" (+{', '.join(shape.variant)})" if shape.variant else ""
+        print(f"{indent}{icons[item.status]} {shape.function}{variant} [{shape.collection}] "
+              f"{shape.describe()} - {notes[item.status]}")
+
+    missing = missing_indexes(advice)
+    if merge:
+        missing = merged_plan(missing)
+    if missing:
+        print(f"\n{indent}🛠️ Missing composite indexes ({len(missing)}):")
+        for needed, shapes in missing:
+            users = ", ".join(sorted({f"{s.function} ({s.location})" for s in shapes}))
+            print(f"{indent}   {needed.describe()}")
+            print(f"{indent}      needed by {users}")
+    unused = unused_indexes(advice, indexes)
+    if unused:
+        print(f"\n{indent}💤 Indexes no service query uses ({len(unused)}):")
+        for index in unused:
+            fields = ", ".join(f"{field} {order}" for field, order in index['fields'])
+            print(f"{indent}   {index['collection']}: {fields}")
+    return missing
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Find the Firestore composite indexes the service queries need")
+    parser.add_argument('--services', default=SERVICES_DIR, help=f"service sources (default: {SERVICES_DIR})")
+    parser.add_argument('--indexes', default=INDEXES_FILE, help=f"index definitions (default: {INDEXES_FILE})")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--deployed', action='store_true',
+                        help="compare against the live project's indexes instead of the file")
+    source.add_argument('--write', action='store_true', help="add the missing indexes to the index file")
+    parser.add_argument('--merge', action='store_true',
+                        help="suggest one index per equality field that Firestore merges, instead of one per shape")
+    parser.add_argument('--service-account', metavar='PATH', help="service account JSON for --deployed")
+    return parser.parse_args(argv)
+
+
+def main(args):
+    """Main function"""
+    print("🗂️ Firestore Index Advisor")
+    print("=" * 50)
+    shapes = extract_queries(args.services)
+    functions = len({(shape.path, shape.function) for shape in shapes})
+    print(f"🔎 {len(shapes)} query shapes in {functions} service functions ({args.services})")
+
+    try:
+        if args.deployed:
+            indexes = load_deployed_indexes(args.service_account)
+            source = "deployed project"
+        else:
+            indexes = load_indexes_file(args.indexes)
+            source = args.indexes if os.path.exists(args.indexes) else f"{args.indexes} (not found)"
+    except ImportError:
+        print("❌ --deployed needs firebase-admin: pip install firebase-admin")
+        return False
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"❌ Could not load indexes: {e}")
+        return False
+    print(f"📋 Indexes: {source}, {len(indexes)} composite")
+    print()
+
+    advice = advise(shapes, indexes)
+    missing = print_advice(advice, indexes, merge=args.merge)
+    if args.write and missing:
+        write_indexes_file(missing, args.indexes)
+        print(f"\n💾 Added {len(missing)} indexes to {args.indexes}")
+        print("   → Deploy with: firebase deploy --only firestore:indexes")
+        return True
+    if missing:
+        flags = " --merge" if args.merge else ""
+        print(f"\n   → Run: python firestore_index_advisor.py --write{flags} && firebase deploy --only firestore:indexes")
+        return False
+    print("\n✅ Every service query has the indexes it needs")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main(parse_args()) else 1)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Firestore Load Test for EduGenie Platform
+Runs concurrent writers and readers against user-shaped documents
+(enrolledCourses, progress, createdAt) and reports ops/sec, latency
+percentiles and transaction contention/abort counts.
+
+Used by `final_firebase_verification.py --load-test`. Point it at the
+Firestore emulator with --emulator localhost:8080 to size capacity offline.
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from check_timings import percentile
+
+# Documents live in their own collection so a load test never touches real users
+LOAD_TEST_COLLECTION = 'loadtest_users'
+HOT_DOC_ID = '_hot_user'
+
+OPERATIONS = ['create', 'read', 'update', 'delete']
+
+
+class LoadStats:
+    """Thread-safe latency and outcome counters per operation"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = {op: [] for op in OPERATIONS}
+        self.errors = {op: 0 for op in OPERATIONS}
+        self.txn_attempts = 0
+        self.txn_retries = 0
+        self.txn_aborts = 0
+
+    def record(self, op, seconds, ok=True):
+        with self._lock:
+            self.latencies[op].append(seconds)
+            if not ok:
+                self.errors[op] += 1
+
+    def record_transaction(self, attempts, aborted):
+        with self._lock:
+            self.txn_attempts += attempts
+            self.txn_retries += max(attempts - 1, 0)
+            if aborted:
+                self.txn_aborts += 1
+
+
+def user_document(writer, index):
+    """A document shaped like the ones the app stores under users/{uid}"""
+    return {
+        'email': f"loadtest+{writer}-{index}@example.com",
+        'displayName': f"Load Test {writer}-{index}",
+        'enrolledCourses': [f"course-{random.randint(1, 50)}" for _ in range(3)],
+        'progress': {'lessonsCompleted': 0},
+    }
+
+
+def _is_abort(error):
+    # Exhausted transaction retries surface as Aborted or as a ValueError from the client
+    return type(error).__name__ == 'Aborted' or 'Failed to commit transaction' in str(error)
+
+
+def run_load_test(db, firestore, writers=4, readers=4, docs_per_writer=25,
+                  reads_per_reader=100, hot_ratio=0.1, collection=LOAD_TEST_COLLECTION):
+    """Run writers and readers concurrently, then delete everything they created.
+
+    `firestore` is the firebase_admin.firestore (or google.cloud.firestore) module,
+    used for SERVER_TIMESTAMP and the transactional decorator. A `hot_ratio` share
+    of updates go to one shared document to measure transaction contention.
+
+    Returns (stats, phase_seconds) where phase_seconds maps 'load'/'cleanup' to wall time.
+    """
+    stats = LoadStats()
+    users = db.collection(collection)
+    hot_ref = users.document(HOT_DOC_ID)
+    hot_ref.set({**user_document('hot', 0), 'createdAt': firestore.SERVER_TIMESTAMP})
+
+    created = []
+    created_lock = threading.Lock()
+    writers_done = threading.Event()
+
+    def bump_progress(ref):
+        attempts = [0]
+
+        @firestore.transactional
+        def update(transaction):
+            attempts[0] += 1
+            snapshot = ref.get(transaction=transaction)
+            progress = (snapshot.to_dict() or {}).get('progress', {})
+            transaction.update(ref, {'progress.lessonsCompleted': progress.get('lessonsCompleted', 0) + 1})
+
+        started = time.perf_counter()
+        try:
+            update(db.transaction())
+            stats.record('update', time.perf_counter() - started)
+            stats.record_transaction(attempts[0], aborted=False)
+        except Exception as e:
+            stats.record('update', time.perf_counter() - started, ok=False)
+            stats.record_transaction(attempts[0], aborted=_is_abort(e))
+
+    def writer(writer_id):
+        for index in range(docs_per_writer):
+            ref = users.document()
+            started = time.perf_counter()
+            try:
+                ref.set({**user_document(writer_id, index), 'createdAt': firestore.SERVER_TIMESTAMP})
+                stats.record('create', time.perf_counter() - started)
+                with created_lock:
+                    created.append(ref)
+            except Exception:
+                stats.record('create', time.perf_counter() - started, ok=False)
+                continue
+            bump_progress(hot_ref if random.random() < hot_ratio else ref)
+
+    def reader(_):
+        done = 0
+        while done < reads_per_reader:
+            with created_lock:
+                ref = random.choice(created) if created else None
+            if ref is None:
+                if writers_done.is_set():
+                    return
+                time.sleep(0.01)
+                continue
+            started = time.perf_counter()
+            try:
+                snapshot = ref.get()
+                stats.record('read', time.perf_counter() - started, ok=snapshot.exists)
+            except Exception:
+                stats.record('read', time.perf_counter() - started, ok=False)
+            done += 1
+
+    def delete(ref):
+        started = time.perf_counter()
+        try:
+            ref.delete()
+            stats.record('delete', time.perf_counter() - started)
+        except Exception:
+            stats.record('delete', time.perf_counter() - started, ok=False)
+
+    phases = {}
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=writers + readers) as executor:
+            writer_futures = [executor.submit(writer, w) for w in range(writers)]
+            reader_futures = [executor.submit(reader, r) for r in range(readers)]
+            try:
+                for future in writer_futures:
+                    future.result()
+            finally:
+                # Readers still waiting for a first document must stop if a writer failed
+                writers_done.set()
+            for future in reader_futures:
+                future.result()
+        phases['load'] = time.perf_counter() - started
+    finally:
+        # Even when the load phase raised, so no test documents are left behind
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(writers, 1)) as executor:
+            list(executor.map(delete, created + [hot_ref]))
+        phases['cleanup'] = time.perf_counter() - started
+
+    return stats, phases
+
+
+def print_load_report(stats, phases, indent="   "):
+    """Print ops/sec, latency percentiles and contention counters"""
+    print(f"{indent}{'Operation':<9} {'Ops':>6} {'Errors':>7} {'ops/s':>8} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for op in OPERATIONS:
+        latencies = sorted(stats.latencies[op])
+        if not latencies:
+            continue
+        wall = phases['cleanup'] if op == 'delete' else phases['load']
+        rate = len(latencies) / wall if wall else 0.0
+        print(f"{indent}{op:<9} {len(latencies):>6} {stats.errors[op]:>7} {rate:>8.1f} "
+              f"{percentile(latencies, 50) * 1000:>7.1f}ms {percentile(latencies, 95) * 1000:>7.1f}ms "
+              f"{percentile(latencies, 99) * 1000:>7.1f}ms")
+    print(f"{indent}Transactions: {stats.txn_attempts} attempts, "
+          f"{stats.txn_retries} retries (contention), {stats.txn_aborts} aborted")
+    print(f"{indent}Load phase: {phases['load']:.2f}s, cleanup: {phases['cleanup']:.2f}s")
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+Static Firestore Query Extraction for the EduGenie services
+Reads src/services/*.ts without running them and recovers, per exported
+service function, every `query(...)` it builds: the collection, where()
+filters, orderBy() clauses and limit(). Constraints added by
+`q = query(q, ...)` inside an `if` are optional, so each combination is a
+separate query shape - getCourses with and without its category and level
+filters.
+
+This is a scanner for the code style the services use, not a TypeScript
+parser: field names must be string literals, and anything it cannot read is
+marked `dynamic` instead of guessed.
+"""
+
+import glob
+import itertools
+import os
+import re
+
+SERVICES_DIR = os.path.join('src', 'services')
+# More optional steps than this and only base, each-alone and all-together shapes are listed
+MAX_OPTIONAL_COMBINATIONS = 6
+
+EQUALITY_OPS = ('==', 'in')
+CONTAINS_OPS = ('array-contains', 'array-contains-any')
+RANGE_OPS = ('<', '<=', '>', '>=', '!=', 'not-in')
+
+FUNCTION_START = re.compile(
+    r'(?:export\s+)?(?:const|let)\s+(\w+)\s*=\s*(?:async\s*)?(?:\([^)]*\)|\w+)\s*(?::[^=]*?)?=>'
+    r'|(?:export\s+)?(?:async\s+)?function\s+(\w+)\s*\(')
+ALIAS_EXPORT = re.compile(r'export\s+const\s+(\w+)\s*=\s*(\w+)\s*;')
+FIRESTORE_IMPORT = re.compile(r'import\s*\{([^}]*)\}\s*from\s*["\']firebase/firestore["\']')
+STRING_LITERAL = re.compile(r'''^\s*(['"`])([^'"`$]*)\1\s*$''')
+CALL = re.compile(r'^\s*(\w+)\s*\((.*)\)\s*$', re.S)
+ASSIGNED_TO = re.compile(r'(?:(const|let|var)\s+)?(\w+)\s*=\s*(?:await\s+)?$')
+
+
+def mask_source(source):
+    """Copy of the source with comments blanked and string contents replaced, same offsets.
+
+    Brackets and commas inside strings or comments then never confuse the scanner.
+    """
+    out = list(source)
+    i, n = 0, len(source)
+    while i < n:
+        char = source[i]
+        if source.startswith('//', i):
+            end = source.find('\n', i)
+            end = n if end == -1 else end
+            out[i:end] = ' ' * (end - i)
+            i = end
+        elif source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            end = n if end == -1 else end + 2
+            out[i:end] = [c if c == '\n' else ' ' for c in source[i:end]]
+            i = end
+        elif char in '\'"`':
+            j = i + 1
+            while j < n and source[j] != char:
+                if source[j] == '\n' and char != '`':
+                    break
+                j += 2 if source[j] == '\\' else 1
+            if j < n and source[j] != char:
+                # An apostrophe in JSX text (`There's`) is not a string
+                i += 1
+                continue
+            out[i + 1:j] = ['\n' if c == '\n' else '_' for c in source[i + 1:j]]
+            i = j + 1
+        else:
+            i += 1
+    return ''.join(out)
+
+
+def matching_bracket(masked, start):
+    """Index of the bracket closing the one at `start`, or -1"""
+    pairs = {'(': ')', '{': '}', '[': ']'}
+    stack = []
+    for index in range(start, len(masked)):
+        char = masked[index]
+        if char in pairs:
+            stack.append(pairs[char])
+        elif stack and char == stack[-1]:
+            stack.pop()
+            if not stack:
+                return index
+    return -1
+
+
+def split_arguments(masked, start, end):
+    """(start, end) spans of the top-level comma separated arguments in masked[start:end]"""
+    spans, depth, begin = [], 0, start
+    for index in range(start, end):
+        char = masked[index]
+        if char in '([{':
+            depth += 1
+        elif char in ')]}':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            spans.append((begin, index))
+            begin = index + 1
+    if masked[begin:end].strip():
+        spans.append((begin, end))
+    return spans
+
+
+def string_value(text):
+    match = STRING_LITERAL.match(text)
+    return match.group(2) if match else None
+
+
+def firestore_aliases(source):
+    """Local name -> firebase/firestore export, for `limit as firestoreLimit` style imports"""
+    aliases = {}
+    for block in FIRESTORE_IMPORT.findall(source):
+        for item in block.split(','):
+            parts = item.split()
+            if len(parts) == 3 and parts[1] == 'as':
+                aliases[parts[2]] = parts[0]
+            elif len(parts) == 1:
+                aliases[parts[0]] = parts[0]
+    return aliases
+
+
+class Constraint:
+    """One where/orderBy/limit/cursor argument of a query() call"""
+
+    def __init__(self, kind, field=None, op=None, direction=None, value=None):
+        self.kind = kind
+        self.field = field
+        self.op = op
+        self.direction = direction
+        self.value = value
+
+    def describe(self):
+        if self.kind == 'where':
+            return f"{self.field} {self.op}"
+        if self.kind == 'orderBy':
+            return f"orderBy {self.field} {self.direction}"
+        if self.kind in ('limit', 'limitToLast'):
+            return f"{self.kind} {self.value}"
+        return self.kind
+
+
+class QueryShape:
+    """A query as Firestore sees it: collection, scope and constraints"""
+
+    def __init__(self, function, path, line, collection, scope='COLLECTION', constraints=(),
+                 variant=(), dynamic=False, variable=None, offset=None):
+        self.function = function
+        self.path = path
+        self.line = line
+        self.collection = collection
+        self.scope = scope
+        self.constraints = list(constraints)
+        # Descriptions of the optional constraints included in this shape
+        self.variant = tuple(variant)
+        self.dynamic = dynamic
+        # Where the query() chain starts and the variable holding it, to find its getDocs()
+        self.variable = variable
+        self.offset = offset
+
+    @property
+    def location(self):
+        return f"{os.path.basename(self.path)}:{self.line}"
+
+    @property
+    def filters(self):
+        return [c for c in self.constraints if c.kind == 'where']
+
+    @property
+    def orders(self):
+        return [c for c in self.constraints if c.kind == 'orderBy']
+
+    @property
+    def limit(self):
+        for constraint in self.constraints:
+            if constraint.kind in ('limit', 'limitToLast'):
+                return constraint.value
+        return None
+
+    def describe(self):
+        parts = [c.describe() for c in self.constraints if c.kind in ('where', 'orderBy')]
+        return ", ".join(parts) or "all documents"
+
+
+class ServiceFunction:
+    """An exported function of a service module and the queries it builds"""
+
+    def __init__(self, name, path, line, start, end, header=''):
+        self.name = name
+        self.path = path
+        self.line = line
+        self.start = start
+        self.end = end
+        # Source from the name to the body, with the parameter list and its defaults
+        self.header = header
+        self.queries = []
+
+
+class ServiceModule:
+    """One parsed service file"""
+
+    def __init__(self, path, source):
+        self.path = path
+        self.source = source
+        self.masked = mask_source(source)
+        self.aliases = firestore_aliases(source)
+        self.functions = {}
+        # `export const getCourses = getCoursesNew;`
+        self.exported_aliases = dict(ALIAS_EXPORT.findall(self.masked))
+
+    def line_of(self, offset):
+        return self.source.count('\n', 0, offset) + 1
+
+    def canonical(self, name):
+        """firebase/firestore export a local identifier refers to"""
+        return self.aliases.get(name, name)
+
+    def depth_at(self, offset, start):
+        """Brace nesting at `offset`, counted from `start`"""
+        segment = self.masked[start:offset]
+        return segment.count('{') - segment.count('}')
+
+    def parse_call(self, span):
+        """(callee, [argument texts]) for `name(args)` at span, or (None, None)"""
+        start, end = span
+        masked = self.masked[start:end]
+        match = CALL.match(masked)
+        if not match:
+            return None, None
+        open_at = start + masked.index('(', match.start(2) - 1)
+        close_at = matching_bracket(self.masked, open_at)
+        if close_at == -1 or self.masked[close_at + 1:end].strip():
+            return None, None
+        arguments = [self.source[a:b].strip() for a, b in split_arguments(self.masked, open_at + 1, close_at)]
+        return self.canonical(match.group(1)), arguments
+
+
+def _constraint(module, span):
+    """Constraint for one query() argument; None for the collection or base query"""
+    callee, arguments = module.parse_call(span)
+    if callee == 'where' and len(arguments) >= 2:
+        field = string_value(arguments[0])
+        if arguments[0].replace(' ', '') == 'documentId()':
+            field = '__name__'
+        return Constraint('where', field, string_value(arguments[1]), value=arguments[2] if len(arguments) > 2 else None)
+    if callee == 'orderBy' and arguments:
+        direction = string_value(arguments[1]) if len(arguments) > 1 else 'asc'
+        return Constraint('orderBy', string_value(arguments[0]), direction=direction or 'asc')
+    if callee in ('limit', 'limitToLast') and arguments:
+        return Constraint(callee, value=arguments[0])
+    if callee in ('startAt', 'startAfter', 'endAt', 'endBefore'):
+        return Constraint(callee)
+    return None
+
+
+def _collection(module, span):
+    """(collection id, scope) for collection()/collectionGroup(), else None"""
+    callee, arguments = module.parse_call(span)
+    if callee == 'collectionGroup' and len(arguments) >= 2:
+        return string_value(arguments[1]), 'COLLECTION_GROUP'
+    if callee == 'collection' and len(arguments) >= 2:
+        # collection(db, 'users', uid, 'progress') queries the last segment
+        return string_value(arguments[-1]), 'COLLECTION'
+    return None
+
+
+def _query_steps(module, function):
+    """Each query() call in a function: (target, base, collection, scope, constraints, depth, offset)"""
+    steps = []
+    for match in re.finditer(r'\b(\w+)\s*\(', module.masked[function.start:function.end]):
+        if module.canonical(match.group(1)) != 'query':
+            continue
+        offset = function.start + match.start()
+        open_at = function.start + match.end() - 1
+        close_at = matching_bracket(module.masked, open_at)
+        if close_at == -1:
+            continue
+        assigned = ASSIGNED_TO.search(module.masked[function.start:offset])
+        target = assigned.group(2) if assigned else None
+        declared = bool(assigned and assigned.group(1))
+        spans = split_arguments(module.masked, open_at + 1, close_at)
+        base = collection = scope = None
+        constraints, dynamic = [], False
+        for index, span in enumerate(spans):
+            text = module.source[span[0]:span[1]].strip()
+            found = _collection(module, span) if index == 0 else None
+            if found:
+                collection, scope = found
+                dynamic = dynamic or collection is None
+            elif index == 0 and re.fullmatch(r'\w+', text):
+                base = text
+            elif text.startswith('...'):
+                dynamic = True
+            else:
+                constraint = _constraint(module, span)
+                if constraint is None or (constraint.kind in ('where', 'orderBy') and constraint.field is None):
+                    dynamic = True
+                else:
+                    constraints.append(constraint)
+        steps.append({'target': target, 'declared': declared, 'base': base, 'collection': collection,
+                      'scope': scope, 'constraints': constraints, 'dynamic': dynamic,
+                      'depth': module.depth_at(offset, function.start), 'offset': offset})
+    return steps
+
+
+def _variants(optional):
+    """Subsets of the optional steps to expand into shapes"""
+    if len(optional) <= MAX_OPTIONAL_COMBINATIONS:
+        return [combo for size in range(len(optional) + 1) for combo in itertools.combinations(optional, size)]
+    return [()] + [(step,) for step in optional] + [tuple(optional)]
+
+
+def function_queries(module, function):
+    """Expand a function's query() steps into QueryShapes"""
+    shapes = []
+    chains = {}
+    for step in _query_steps(module, function):
+        if step['base'] and step['base'] == step['target'] and step['base'] in chains and not step['declared']:
+            chain = chains[step['base']]
+            step['optional'] = step['depth'] > chain['depth']
+            chain['steps'].append(step)
+            continue
+        if step['base'] and step['base'] in chains:
+            # `const q2 = query(q, ...)` starts a new query from an existing one
+            parent = chains[step['base']]
+            chain = {'root': parent['root'], 'depth': step['depth'],
+                     'steps': parent['steps'] + [dict(step, optional=False)]}
+        else:
+            chain = {'root': step, 'depth': step['depth'], 'steps': [dict(step, optional=False)]}
+        if step['target']:
+            chains[step['target']] = chain
+        else:
+            chains[f"@{step['offset']}"] = chain
+
+    for key, chain in chains.items():
+        root = chain['root']
+        if root['collection'] is None and not root['dynamic']:
+            continue
+        required = [s for s in chain['steps'] if not s['optional']]
+        optional = [s for s in chain['steps'] if s['optional'] and
+                    any(c.kind in ('where', 'orderBy') for c in s['constraints'])]
+        always = [s for s in chain['steps'] if s['optional'] and s not in optional]
+        for combo in _variants(optional):
+            included = required + always + list(combo)
+            included.sort(key=lambda s: s['offset'])
+            constraints = [c for s in included for c in s['constraints']]
+            shapes.append(QueryShape(
+                function.name, module.path, module.line_of(root['offset']), root['collection'],
+                root['scope'] or 'COLLECTION', constraints,
+                variant=[c.describe() for s in combo for c in s['constraints']],
+                dynamic=any(s['dynamic'] for s in included),
+                variable=None if key.startswith('@') else key, offset=root['offset'],
+            ))
+    return shapes
+
+
+def function_spans(module):
+    """(name, definition offset, body brace, body end) for every function, nested ones included"""
+    for match in FUNCTION_START.finditer(module.masked):
+        name = match.group(1) or match.group(2)
+        if match.group(1):
+            brace = module.masked.find('{', match.end())
+            # Expression-bodied arrows (`=> x`) build no queries worth following
+            if brace == -1 or module.masked[match.end():brace].strip():
+                continue
+        else:
+            params_end = matching_bracket(module.masked, match.end() - 1)
+            brace = module.masked.find('{', params_end) if params_end != -1 else -1
+            if brace == -1:
+                continue
+        end = matching_bracket(module.masked, brace)
+        if end != -1:
+            yield name, match.start(), brace, end
+
+
+def parse_module(path):
+    """ServiceModule with its functions and their query shapes"""
+    with open(path, 'r', encoding='utf-8') as f:
+        module = ServiceModule(path, f.read())
+    for name, start, brace, end in function_spans(module):
+        if any(f.start <= start < f.end for f in module.functions.values()):
+            continue
+        function = ServiceFunction(name, path, module.line_of(start), brace, end, module.source[start:brace])
+        function.queries = function_queries(module, function)
+        module.functions[name] = function
+    return module
+
+
+def parse_services(directory=SERVICES_DIR):
+    """ServiceModules for every .ts file in the services directory"""
+    return [parse_module(path) for path in sorted(glob.glob(os.path.join(directory, '*.ts')))]
+
+
+def extract_queries(directory=SERVICES_DIR):
+    """Every query shape the services can issue"""
+    return [shape for module in parse_services(directory)
+            for function in module.functions.values() for shape in function.queries]
@@ -0,0 +1,781 @@
+#!/usr/bin/env python3
+"""
+Firestore Read-Cost Estimator for EduGenie Platform
+Estimates what one load of each page in src/pages/*.tsx costs in Firestore:
+document reads (the bill), sequential round trips (the latency) and bytes.
+
+The call graph is static: every useEffect of a page, and of the components
+it renders, is followed into local helpers and service functions down to
+getDoc()/getDocs()/onSnapshot(); the queries themselves come from
+firestore_queries.py. The numbers come from collection statistics sampled
+through the Admin SDK (--sample) - document counts, how many documents each
+equality filter matches, average stored size and average array lengths for
+`for (const id of user.enrolledCourses)` style fan-out. Without a sample the
+estimate falls back to stated assumptions.
+
+A loop awaiting a read per item costs one round trip per item (N+1); a
+`.map`/`.forEach` issues them in parallel. Page loads use each query's base
+shape - filters such as category 'All' off - and a limit's default value.
+
+Usage:
+    python firestore_read_cost.py                          # assumed collection sizes
+    python firestore_read_cost.py --sample --save-stats S  # sample the project, keep the stats
+    python firestore_read_cost.py --stats S                # reuse saved stats
+"""
+
+import argparse
+import datetime
+import glob
+import json
+import os
+import re
+import sys
+
+try:
+    from firestore_queries import (CONTAINS_OPS, RANGE_OPS, SERVICES_DIR, ServiceFunction, ServiceModule,
+                                   function_queries, function_spans, matching_bracket, split_arguments,
+                                   string_value)
+except ImportError as e:
+    print("❌ Missing required packages. Please install them with:")
+    print("pip install -r requirements-comprehensive-firebase.txt")
+    sys.exit(1)
+
+PAGES_DIR = os.path.join('src', 'pages')
+# Rendered around every page by App.tsx
+APP_SHELL = (os.path.join('src', 'contexts', 'AuthContext.tsx'), os.path.join('src', 'components', 'Navbar.tsx'))
+DEFAULT_SAMPLE_SIZE = 50
+# Used for collections and fields without statistics
+ASSUMED_DOCS = 50
+ASSUMED_DOC_BYTES = 2048
+ASSUMED_FANOUT = 5
+ASSUMED_SELECTIVITY = {'literal': 0.5, 'variable': 0.1, 'range': 0.5, 'contains': 0.1}
+# Distinct values kept per field in the statistics
+MAX_TRACKED_VALUES = 50
+
+READ_OPS = ('getDoc', 'getDocs', 'getDocFromServer', 'getDocsFromServer', 'onSnapshot')
+CALL_SITE = re.compile(r'\b(\w+)\s*\(')
+KEYWORDS = {'if', 'for', 'while', 'switch', 'catch', 'return', 'function', 'typeof', 'await', 'async'}
+IMPORT = re.compile(r'import\s+(?:(\w+)\s*,?\s*)?(?:\{([^}]*)\})?\s*from\s*["\'](\.[^"\']+)["\']')
+FOR_OF = re.compile(r'\bfor\s*\(\s*(?:const|let|var)\s+[^;()]+?\s+of\s+')
+ITERATION = re.compile(r'([\w.?]+)\s*\.\s*(?:map|forEach|flatMap)\s*\(')
+USE_EFFECT = re.compile(r'\buseEffect\s*\(')
+JSX_ELEMENT = re.compile(r'<([A-Z]\w*)[\s/>]')
+
+
+class Loop:
+    """Fan-out around an operation: items come from an array field or an earlier query"""
+
+    def __init__(self, source, field=None, query=None, sequential=False):
+        self.source = source
+        self.field = field
+        self.query = query
+        self.sequential = sequential
+
+
+class Operation:
+    """A read, or a call into another flow, at one place in the source"""
+
+    def __init__(self, kind, label, location, awaited=True, loops=(), collection=None, shape=None,
+                 limit=None, flow=None):
+        self.kind = kind  # 'doc', 'query' or 'call'
+        self.label = label
+        self.location = location
+        self.awaited = awaited
+        self.loops = list(loops)
+        self.collection = collection
+        self.shape = shape
+        self.limit = limit
+        self.flow = flow
+
+
+class Flow:
+    """The reads a function or effect makes, in source order"""
+
+    def __init__(self, name, location):
+        self.name = name
+        self.location = location
+        self.operations = []
+        # Parameters a `.filter(...)` over the fetched documents tests on the client
+        self.client_filters = []
+
+
+class Cost:
+    """Estimated reads, round trips and bytes of a flow"""
+
+    def __init__(self, reads=0.0, round_trips=0.0, bytes=0.0):
+        self.reads = reads
+        self.round_trips = round_trips
+        self.bytes = bytes
+        self.notes = []
+        self.assumptions = set()
+
+    def absorb(self, other):
+        """Take over the notes and assumptions of a part"""
+        for note in other.notes:
+            if note not in self.notes:
+                self.notes.append(note)
+        self.assumptions |= other.assumptions
+
+    def to_json(self):
+        return {'reads': round(self.reads, 1), 'round_trips': round(self.round_trips, 1),
+                'bytes': round(self.bytes), 'notes': self.notes, 'assumptions': sorted(self.assumptions)}
+
+
+def document_size(path, data):
+    """Stored size of a document, following Firestore's storage size rules"""
+    def value_size(value):
+        if value is None or isinstance(value, bool):
+            return 1
+        if isinstance(value, (int, float, datetime.datetime)):
+            return 8
+        if isinstance(value, str):
+            return len(value.encode('utf-8')) + 1
+        if isinstance(value, bytes):
+            return len(value)
+        if isinstance(value, (list, tuple)):
+            return sum(value_size(item) for item in value)
+        if isinstance(value, dict):
+            return sum(len(key.encode('utf-8')) + 1 + value_size(item) for key, item in value.items())
+        if hasattr(value, 'latitude'):
+            return 16
+        if hasattr(value, 'path'):
+            return name_size(value.path)
+        return 8
+
+    def name_size(name):
+        return sum(len(segment.encode('utf-8')) + 1 for segment in name.split('/')) + 16
+
+    return name_size(path) + value_size(data) + 32
+
+
+def _literal_key(text):
+    """JSON form of a literal filter value from the source, or None for expressions"""
+    text = (text or '').strip()
+    if text in ('true', 'false', 'null') or re.fullmatch(r'-?\d+(\.\d+)?', text):
+        return text
+    value = string_value(text)
+    return json.dumps(value) if value is not None else None
+
+
+class CollectionStats:
+    """Document count, size and per-field value distribution of one collection"""
+
+    def __init__(self, name, count, avg_bytes, fields=None, source='sampled'):
+        self.name = name
+        self.count = count
+        self.avg_bytes = avg_bytes
+        # field -> {'values': {json value: fraction}, 'untracked': fraction past MAX_TRACKED_VALUES,
+        #           'distinct': n, 'array_length': avg}
+        self.fields = fields or {}
+        self.source = source
+
+    @classmethod
+    def from_documents(cls, name, count, documents):
+        """Statistics from sampled (path, data) pairs"""
+        sizes = [document_size(path, data) for path, data in documents]
+        fields = {}
+        for _, data in documents:
+            for field, value in data.items():
+                entry = fields.setdefault(field, {'values': {}, 'lengths': [], 'seen': 0, 'untracked': 0})
+                entry['seen'] += 1
+                if isinstance(value, (list, tuple)):
+                    entry['lengths'].append(len(value))
+                elif value is None or isinstance(value, (bool, int, float, str)):
+                    key = json.dumps(value)
+                    if key in entry['values'] or len(entry['values']) < MAX_TRACKED_VALUES:
+                        entry['values'][key] = entry['values'].get(key, 0) + 1
+                    else:
+                        entry['untracked'] += 1
+        total = len(documents) or 1
+        summary = {}
+        for field, entry in fields.items():
+            summary[field] = {
+                'values': {key: hits / total for key, hits in entry['values'].items()},
+                'untracked': entry['untracked'] / total,
+                'distinct': len(entry['values']) or entry['seen'],
+                'array_length': sum(entry['lengths']) / len(entry['lengths']) if entry['lengths'] else None,
+            }
+        return cls(name, count, sum(sizes) / len(sizes) if sizes else ASSUMED_DOC_BYTES, summary)
+
+    def selectivity(self, constraint):
+        """(fraction of documents a where() keeps, assumption or None)"""
+        stats = self.fields.get(constraint.field)
+        literal = _literal_key(constraint.value)
+        if constraint.op in RANGE_OPS:
+            return ASSUMED_SELECTIVITY['range'], f"{constraint.field} {constraint.op} keeps half"
+        if constraint.op in CONTAINS_OPS:
+            if stats and stats['array_length']:
+                return min(1.0, 1 / max(stats['distinct'], 1)), None
+            return ASSUMED_SELECTIVITY['contains'], f"{constraint.field} {constraint.op} keeps 10%"
+        if stats is None:
+            kind = 'literal' if literal else 'variable'
+            share = ASSUMED_SELECTIVITY[kind]
+            return share, f"{self.name}.{constraint.field} == keeps {share:.0%}"
+        if literal is not None:
+            if literal in stats['values']:
+                return stats['values'][literal], None
+            untracked = stats.get('untracked', 0.0)
+            if untracked:
+                # Tracking stopped at MAX_TRACKED_VALUES, so the literal may be one of the rest
+                share = min(untracked, 1 / max(stats['distinct'], 1))
+                return share, f"{self.name}.{constraint.field} == {literal} is untracked, keeps {share:.1%}"
+            return 0.0, None
+        return 1 / max(stats['distinct'], 1), None
+
+
+class Statistics:
+    """Collection statistics plus the fallbacks used where there are none"""
+
+    def __init__(self, collections=None, assumed_docs=ASSUMED_DOCS, assumed_fanout=ASSUMED_FANOUT):
+        self.collections = collections or {}
+        self.assumed_docs = assumed_docs
+        self.assumed_fanout = assumed_fanout
+
+    def collection(self, name):
+        if name not in self.collections:
+            self.collections[name] = CollectionStats(name or '?', self.assumed_docs, ASSUMED_DOC_BYTES,
+                                                     source='assumed')
+        return self.collections[name]
+
+    def array_length(self, field):
+        """Average length of an array field in whichever collection has it"""
+        for stats in self.collections.values():
+            length = stats.fields.get(field, {}).get('array_length')
+            if length is not None:
+                return length
+        return None
+
+    def to_json(self):
+        return {name: {'count': stats.count, 'avg_bytes': round(stats.avg_bytes), 'fields': stats.fields}
+                for name, stats in sorted(self.collections.items()) if stats.source != 'assumed'}
+
+    @classmethod
+    def from_json(cls, document, **assumptions):
+        collections = {name: CollectionStats(name, entry['count'], entry['avg_bytes'], entry.get('fields'),
+                                             source='file')
+                       for name, entry in document.items()}
+        return cls(collections, **assumptions)
+
+
+def sample_statistics(collections, sample_size=DEFAULT_SAMPLE_SIZE, service_account_path=None,
+                      token_cache=None):
+    """Count and sample each collection through the Admin SDK"""
+    from comprehensive_firebase_checker import ComprehensiveFirebaseChecker, import_admin_sdk
+    from token_cache import TokenCache, cached_certificate
+
+    if not service_account_path:
+        checker = ComprehensiveFirebaseChecker()
+        if not checker.find_service_account_file():
+            raise RuntimeError("Service account JSON file not found")
+        service_account_path = checker.service_account_path
+    firebase_admin, credentials, _, firestore = import_admin_sdk()
+    cert = cached_certificate(credentials, service_account_path, token_cache or TokenCache())
+    app = firebase_admin.initialize_app(cert, name='read-cost-sample')
+    try:
+        db = firestore.client(app=app)
+        stats = {}
+        for name in sorted(collections):
+            reference = db.collection(name)
+            documents = [(snapshot.reference.path, snapshot.to_dict() or {})
+                         for snapshot in reference.limit(sample_size).stream()]
+            try:
+                # A count() aggregation costs one read per 1000 index entries
+                count = reference.count().get()[0][0].value
+            except Exception:
+                count = len(documents)
+            stats[name] = CollectionStats.from_documents(name, count, documents)
+        return stats
+    finally:
+        firebase_admin.delete_app(app)
+
+
+class SourceFile:
+    """A .ts/.tsx file: masked source, function definitions and relative imports"""
+
+    def __init__(self, path):
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            self.module = ServiceModule(path, f.read())
+        self.path = path
+        self.definitions = {}
+        for name, start, brace, end in function_spans(self.module):
+            self.definitions.setdefault(name, ServiceFunction(
+                name, path, self.module.line_of(start), brace, end, self.module.source[start:brace]))
+        self.exported_aliases = self.module.exported_aliases
+        # local name -> (resolved path, exported name or None for the default export)
+        self.imports = {}
+        for default, named, target in IMPORT.findall(self.module.source):
+            resolved = self._resolve(target)
+            if resolved is None:
+                continue
+            if default:
+                self.imports[default] = (resolved, None)
+            for item in named.split(','):
+                parts = item.split()
+                if len(parts) == 3 and parts[1] == 'as':
+                    self.imports[parts[2]] = (resolved, parts[0])
+                elif len(parts) == 1:
+                    self.imports[parts[0]] = (resolved, parts[0])
+
+    def _resolve(self, target):
+        base = os.path.normpath(os.path.join(os.path.dirname(self.path), target))
+        for candidate in (base, base + '.ts', base + '.tsx', os.path.join(base, 'index.ts')):
+            if os.path.isfile(candidate):
+                return candidate
+        return None
+
+    def location(self, offset):
+        return f"{os.path.basename(self.path)}:{self.module.line_of(offset)}"
+
+    def effects(self):
+        """ServiceFunction-like spans for the callback of every useEffect()"""
+        masked = self.module.masked
+        spans = []
+        for match in USE_EFFECT.finditer(masked):
+            close_at = matching_bracket(masked, match.end() - 1)
+            arguments = split_arguments(masked, match.end(), close_at) if close_at != -1 else []
+            if not arguments:
+                continue
+            start, end = arguments[0]
+            brace = masked.find('{', start, end)
+            if brace == -1:
+                continue
+            spans.append(ServiceFunction('useEffect', self.path, self.module.line_of(match.start()),
+                                         brace, matching_bracket(masked, brace)))
+        return spans
+
+
+class ReadCostAnalyzer:
+    """Builds the read flows of pages from their effects down to the Firestore calls"""
+
+    def __init__(self):
+        self.files = {}
+        self.flows = {}
+
+    def source(self, path):
+        path = os.path.normpath(path)
+        if path not in self.files:
+            self.files[path] = SourceFile(path)
+        return self.files[path]
+
+    def definition_flow(self, path, name):
+        """Flow of a named function, following `export const a = b;` aliases"""
+        source = self.source(path)
+        name = source.exported_aliases.get(name, name)
+        if name not in source.definitions:
+            if name in source.imports:
+                return self.definition_flow(*source.imports[name])
+            return None
+        key = (source.path, name)
+        if key not in self.flows:
+            self.flows[key] = None  # recursion guard
+            self.flows[key] = self.span_flow(source, source.definitions[name])
+        return self.flows[key]
+
+    def span_flow(self, source, function):
+        """Flow of the reads inside one function body or effect callback"""
+        module = source.module
+        masked = module.masked
+        flow = Flow(function.name, f"{os.path.basename(source.path)}:{function.line}")
+        shapes = function_queries(module, function)
+        nested = [d for d in source.definitions.values() if function.start < d.start and d.end <= function.end]
+        loops = self._loops(source, function)
+        results = {}
+
+        for match in CALL_SITE.finditer(masked, function.start, function.end):
+            name, offset = match.group(1), match.start()
+            if name in KEYWORDS or any(d.start <= offset <= d.end for d in nested):
+                continue
+            if offset > 0 and masked[offset - 1] == '.':
+                continue
+            canonical = module.canonical(name)
+            before = masked[max(function.start, offset - 40):offset]
+            awaited = bool(re.search(r'\bawait\s*$', before))
+            enclosing = [loop for start, end, loop in loops if start < offset < end]
+            operation = None
+            if canonical in READ_OPS and name not in source.definitions:
+                operation = self._read(source, function, shapes, canonical, match)
+            elif name in source.definitions and source.definitions[name].start != function.start:
+                called = self.definition_flow(source.path, name)
+                if called and called.operations:
+                    operation = Operation('call', name, source.location(offset), flow=called)
+            elif name in source.imports:
+                called = self.definition_flow(*source.imports[name])
+                if called and called.operations:
+                    operation = Operation('call', name, source.location(offset), flow=called)
+            if operation is None:
+                continue
+            operation.awaited = awaited or any(not loop.sequential for loop in enclosing)
+            operation.loops = [self._bind(loop, results) for loop in enclosing]
+            flow.operations.append(operation)
+            assigned = re.search(r'(?:const|let|var)?\s*(\w+)\s*=\s*(?:await\s+)?$', before)
+            if assigned and operation.kind == 'query':
+                results[assigned.group(1)] = operation
+
+        flow.client_filters = self._client_filters(source, function, flow)
+        return flow
+
+    def _read(self, source, function, shapes, op, match):
+        """Operation for a getDoc/getDocs/onSnapshot call"""
+        module = source.module
+        masked = module.masked
+        open_at = match.end() - 1
+        close_at = matching_bracket(masked, open_at)
+        arguments = split_arguments(masked, open_at + 1, close_at) if close_at != -1 else []
+        location = source.location(match.start())
+        if not arguments:
+            return Operation('query', op, location)
+        start, end = arguments[0]
+        target = module.source[start:end].strip()
+        if re.fullmatch(r'\w+', target):
+            # The reference or query was built earlier: `const q = query(...)`, `const ref = doc(...)`
+            definition = re.findall(rf'\b{target}\s*=\s*(?:await\s+)?([^;]+)', masked[function.start:match.start()])
+            if definition:
+                offset = masked.rindex(definition[-1], function.start, match.start())
+                start, end = offset, offset + len(definition[-1])
+        callee, call_arguments = module.parse_call((start, end))
+
+        if op in ('getDoc', 'getDocFromServer') or callee == 'doc':
+            segments = call_arguments[1:] if callee == 'doc' and call_arguments else []
+            collection = string_value(segments[-2]) if len(segments) >= 2 else None
+            return Operation('doc', op, location, collection=collection)
+        if callee == 'collection' and call_arguments:
+            return Operation('query', op, location, collection=string_value(call_arguments[-1]))
+        candidates = [s for s in shapes if (s.variable == target) or (start <= (s.offset or -1) < end)]
+        candidates.sort(key=lambda s: len(s.variant))
+        if not candidates:
+            return Operation('query', op, location)
+        shape = candidates[0]
+        return Operation('query', op, location, collection=shape.collection, shape=shape,
+                         limit=self._limit(shape, function))
+
+    @staticmethod
+    def _limit(shape, function):
+        """A query's limit as a number, using the parameter default for `limit(limitCount)`"""
+        text = (shape.limit or '').strip()
+        if text.isdigit():
+            return int(text)
+        default = re.search(rf'\b{re.escape(text)}\s*\??\s*(?::[^=,)]*)?=\s*(\d+)', function.header) if text else None
+        return int(default.group(1)) if default else None
+
+    def _loops(self, source, function):
+        """(start, end, Loop) for the for-of loops and map/forEach callbacks in a body"""
+        masked = source.module.masked
+        loops = []
+        for match in FOR_OF.finditer(masked, function.start, function.end):
+            header_end = matching_bracket(masked, masked.rindex('(', match.start(), match.end()))
+            brace = masked.find('{', header_end)
+            if header_end == -1 or brace == -1:
+                continue
+            iterable = masked[match.end():header_end].strip()
+            body = masked[brace:matching_bracket(masked, brace)]
+            loops.append((brace, brace + len(body), Loop(iterable, sequential='await' in body)))
+        for match in ITERATION.finditer(masked, function.start, function.end):
+            close_at = matching_bracket(masked, match.end() - 1)
+            if close_at != -1:
+                loops.append((match.end(), close_at, Loop(match.group(1).split('.')[0])))
+        for _, _, loop in loops:
+            root = re.match(r'\w+', loop.source)
+            assigned = re.findall(rf'\b{root.group(0)}\s*=\s*[\w.?]*?\.(\w+)\s*(?:\|\||\?\?|;|$)',
+                                  masked[function.start:function.end], re.M) if root else []
+            loop.field = assigned[-1] if assigned else None
+        return loops
+
+    @staticmethod
+    def _bind(loop, results):
+        """Tie a loop over a query's snapshot to that query's operation"""
+        root = re.match(r'\w+', loop.source)
+        if root and root.group(0) in results:
+            return Loop(loop.source, query=results[root.group(0)], sequential=loop.sequential)
+        return loop
+
+    @staticmethod
+    def _client_filters(source, function, flow):
+        """Parameters tested inside `.filter(...)` after a query - work the query could do"""
+        if not any(op.kind == 'query' for op in flow.operations):
+            return []
+        parameters = re.findall(r'(\w+)\s*\??\s*:', function.header) or re.findall(r'\((\w+)', function.header)
+        masked = source.module.masked
+        body = masked[function.start:function.end]
+        # `const searchLower = searchTerm.toLowerCase()` still filters on searchTerm
+        derived = {p: p for p in parameters}
+        for name, expression in re.findall(r'(?:const|let)\s+(\w+)\s*=\s*([^;]+)', body):
+            used = [derived[word] for word in re.findall(r'(?<![.\w])(\w+)', expression) if word in derived]
+            if used:
+                derived.setdefault(name, used[0])
+        filtered = []
+        for match in re.finditer(r'\.\s*filter\s*\(', body):
+            open_at = function.start + match.end() - 1
+            callback = masked[open_at:matching_bracket(masked, open_at)]
+            for word in re.findall(r'(?<![.\w])(\w+)', callback):
+                if word in derived and derived[word] not in filtered:
+                    filtered.append(derived[word])
+        return filtered
+
+    def page_flows(self, path, seen=None):
+        """Flows of a component's effects and of the local components it renders"""
+        seen = seen if seen is not None else set()
+        source = self.source(path)
+        if source.path in seen:
+            return []
+        seen.add(source.path)
+        flows = [self.span_flow(source, effect) for effect in source.effects()]
+        rendered = set(JSX_ELEMENT.findall(source.module.source))
+        for name in sorted(rendered):
+            target = source.imports.get(name)
+            if target and target[0].endswith('.tsx'):
+                flows += self.page_flows(target[0], seen)
+        return [flow for flow in flows if flow.operations]
+
+
+def evaluate(flow, stats, active=None):
+    """Cost of one run of a flow: reads and bytes add up, round trips follow the awaits"""
+    active = active or set()
+    cost = Cost()
+    elapsed = finished = 0.0
+    if id(flow) in active:
+        return cost
+    active = active | {id(flow)}
+    for operation in flow.operations:
+        part = _operation_cost(operation, stats, active)
+        if operation.kind == 'query' and operation.limit is None and not (operation.shape and operation.shape.filters):
+            part.notes.append(f"{flow.name} reads all of {operation.collection} ({operation.location}) "
+                              f"- no filter or limit")
+        factor, trips = 1.0, part.round_trips
+        for loop in operation.loops:
+            items = _fanout(loop, stats, part)
+            factor *= items
+            if loop.sequential:
+                trips *= items
+        if any(loop.sequential for loop in operation.loops) and part.reads:
+            note = (f"{flow.name} awaits {operation.label} once per {_loop_items(operation.loops)} "
+                    f"in sequence ({operation.location}) - N+1 round trips")
+            part.notes.append(note)
+        cost.reads += part.reads * factor
+        cost.bytes += part.bytes * factor
+        cost.absorb(part)
+        if operation.awaited:
+            elapsed += trips
+            finished = max(finished, elapsed)
+        else:
+            finished = max(finished, elapsed + trips)
+    cost.round_trips = max(finished, elapsed)
+    for parameter in flow.client_filters:
+        cost.notes.append(f"{flow.name} filters {parameter} on the client after reading "
+                          f"{cost.reads:.0f} docs ({flow.location})")
+    return cost
+
+
+def _loop_items(loops):
+    names = [loop.field or loop.source for loop in loops]
+    return " × ".join(names)
+
+
+def _fanout(loop, stats, part):
+    """Number of iterations of a loop"""
+    if loop.query is not None:
+        return _operation_cost(loop.query, stats, set()).reads
+    if loop.field:
+        length = stats.array_length(loop.field)
+        if length is not None:
+            return length
+    part.assumptions.add(f"{loop.field or loop.source} has {stats.assumed_fanout} items")
+    return stats.assumed_fanout
+
+
+def _operation_cost(operation, stats, active):
+    if operation.kind == 'call':
+        return evaluate(operation.flow, stats, active)
+    collection = stats.collection(operation.collection)
+    cost = Cost(round_trips=1.0)
+    if collection.source == 'assumed':
+        cost.assumptions.add(f"{collection.name} has {collection.count} docs of "
+                             f"{collection.avg_bytes / 1024:.0f} KB")
+    if operation.kind == 'doc':
+        cost.reads = 1.0
+    else:
+        matching = float(collection.count)
+        for constraint in operation.shape.filters if operation.shape else ():
+            share, assumption = collection.selectivity(constraint)
+            matching *= share
+            if assumption:
+                cost.assumptions.add(assumption)
+        if operation.limit is not None:
+            matching = min(matching, operation.limit)
+        # An empty result is still billed as one read
+        cost.reads = max(1.0, matching)
+    cost.bytes = cost.reads * collection.avg_bytes
+    return cost
+
+
+def collections_used(flows):
+    """Collection ids the flows read from"""
+    found, pending, seen = set(), list(flows), set()
+    while pending:
+        flow = pending.pop()
+        if id(flow) in seen:
+            continue
+        seen.add(id(flow))
+        for operation in flow.operations:
+            if operation.kind == 'call':
+                pending.append(operation.flow)
+            elif operation.collection:
+                found.add(operation.collection)
+            for loop in operation.loops:
+                if loop.query is not None and loop.query.collection:
+                    found.add(loop.query.collection)
+    return found
+
+
+def page_cost(flows, stats):
+    """Effects run side by side: reads and bytes add up, round trips are the slowest effect's"""
+    cost = Cost()
+    for flow in flows:
+        part = evaluate(flow, stats)
+        cost.reads += part.reads
+        cost.bytes += part.bytes
+        cost.round_trips = max(cost.round_trips, part.round_trips)
+        cost.absorb(part)
+    return cost
+
+
+def estimate_pages(pages_dir=PAGES_DIR, stats=None, analyzer=None):
+    """(page name, Cost) per page, most reads first; the app shell is listed as '(app shell)'"""
+    analyzer = analyzer or ReadCostAnalyzer()
+    stats = stats or Statistics()
+    flows = {os.path.splitext(os.path.basename(path))[0]: analyzer.page_flows(path)
+             for path in sorted(glob.glob(os.path.join(pages_dir, '*.tsx')))}
+    shell = [flow for path in APP_SHELL if os.path.exists(path) for flow in analyzer.page_flows(path)]
+    if shell:
+        flows['(app shell)'] = shell
+    ranked = [(name, page_cost(page, stats)) for name, page in flows.items()]
+    ranked.sort(key=lambda item: (-item[1].reads, -item[1].round_trips, item[0]))
+    return ranked
+
+
+def service_costs(services_dir=SERVICES_DIR, stats=None, analyzer=None):
+    """(function, location, Cost) for every service function that reads, most reads first"""
+    analyzer = analyzer or ReadCostAnalyzer()
+    stats = stats or Statistics()
+    costs = []
+    for path in sorted(glob.glob(os.path.join(services_dir, '*.ts'))):
+        source = analyzer.source(path)
+        for name in source.definitions:
+            flow = analyzer.definition_flow(path, name)
+            if flow and flow.operations:
+                costs.append((name, flow.location, evaluate(flow, stats)))
+    costs.sort(key=lambda item: (-item[2].reads, -item[2].round_trips, item[0]))
+    return costs
+
+
+def format_bytes(size):
+    return f"{size / 1024:.1f} KB" if size < 1024 * 1024 else f"{size / 1024 / 1024:.1f} MB"
+
+
+def print_table(rows, title, indent="  "):
+    """Ranked reads / round trips / bytes table with the notes under it"""
+    print(title)
+    if not rows:
+        print(f"{indent}(nothing reads Firestore)")
+        return
+    width = max(len(name) for name, _ in rows)
+    print(f"{indent}{'':{width}}  {'reads':>8}  {'round trips':>11}  {'bytes':>10}")
+    for name, cost in rows:
+        print(f"{indent}{name:{width}}  {cost.reads:>8.1f}  {cost.round_trips:>11.1f}  "
+              f"{format_bytes(cost.bytes):>10}")
+    notes = [(name, note) for name, cost in rows for note in cost.notes]
+    if notes:
+        print()
+        for name, note in notes:
+            print(f"{indent}⚠️ {name}: {note}")
+
+
+def load_statistics(args, collections):
+    """Statistics from --stats, a fresh --sample, or nothing but assumptions"""
+    assumptions = {'assumed_docs': args.assume_docs, 'assumed_fanout': args.assume_fanout}
+    if args.stats:
+        with open(args.stats, 'r', encoding='utf-8') as f:
+            return Statistics.from_json(json.load(f), **assumptions), args.stats
+    if args.sample:
+        sampled = sample_statistics(collections, args.sample_size, args.service_account)
+        return Statistics(sampled, **assumptions), f"sampled {len(sampled)} collections"
+    return Statistics(**assumptions), "assumed (no --sample or --stats)"
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Estimate the Firestore reads, round trips and bytes of each page load")
+    parser.add_argument('--pages', default=PAGES_DIR, help=f"page components (default: {PAGES_DIR})")
+    parser.add_argument('--services', default=SERVICES_DIR, help=f"service sources (default: {SERVICES_DIR})")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--sample', action='store_true',
+                        help="sample collection statistics from the project with the Admin SDK")
+    source.add_argument('--stats', metavar='FILE', help="collection statistics saved by --save-stats")
+    parser.add_argument('--save-stats', metavar='FILE', help="write the sampled statistics to FILE")
+    parser.add_argument('--sample-size', type=int, default=DEFAULT_SAMPLE_SIZE,
+                        help=f"documents sampled per collection (default: {DEFAULT_SAMPLE_SIZE})")
+    parser.add_argument('--service-account', metavar='PATH', help="service account JSON for --sample")
+    parser.add_argument('--assume-docs', type=int, default=ASSUMED_DOCS,
+                        help=f"documents in a collection without statistics (default: {ASSUMED_DOCS})")
+    parser.add_argument('--assume-fanout', type=int, default=ASSUMED_FANOUT,
+                        help=f"items in an array without statistics (default: {ASSUMED_FANOUT})")
+    parser.add_argument('--top', type=int, default=10, help="service functions listed (default: 10)")
+    parser.add_argument('--json', action='store_true', help="print the estimates as JSON")
+    return parser.parse_args(argv)
+
+
+def main(args):
+    """Main function"""
+    analyzer = ReadCostAnalyzer()
+    pages = sorted(glob.glob(os.path.join(args.pages, '*.tsx')))
+    if not pages:
+        print(f"❌ No pages found in {args.pages}")
+        return False
+    flows = [flow for path in pages + list(APP_SHELL) if os.path.exists(path)
+             for flow in analyzer.page_flows(path)]
+    collections = collections_used(flows)
+    try:
+        stats, source = load_statistics(args, collections)
+    except ImportError:
+        print("❌ --sample needs firebase-admin: pip install firebase-admin")
+        return False
+    except (OSError, ValueError, KeyError, RuntimeError) as e:
+        print(f"❌ Could not load collection statistics: {e}")
+        return False
+    if args.save_stats:
+        with open(args.save_stats, 'w', encoding='utf-8') as f:
+            json.dump(stats.to_json(), f, indent=2)
+
+    ranked = estimate_pages(args.pages, stats, analyzer)
+    services = service_costs(args.services, stats, analyzer)[:args.top]
+    if args.json:
+        print(json.dumps({'statistics': source,
+                          'pages': {name: cost.to_json() for name, cost in ranked},
+                          'services': {name: dict(cost.to_json(), location=location)
+                                       for name, location, cost in services}}, indent=2))
+        return True
+
+    print("💸 Firestore Read Cost per Page Load")
+    print("=" * 50)
+    print(f"📄 {len(pages)} pages, {len(collections)} collections read ({', '.join(sorted(collections))})")
+    print(f"📊 Collection statistics: {source}")
+    if args.save_stats:
+        print(f"💾 Saved statistics to {args.save_stats}")
+    print()
+    print_table(ranked, "🏆 Pages, most reads first:")
+    print()
+    print_table([(f"{name} ({location})", cost) for name, location, cost in services],
+                f"🔧 Service functions, per call (top {args.top}):")
+
+    assumptions = sorted({a for _, cost in ranked for a in cost.assumptions} |
+                         {a for _, _, cost in services for a in cost.assumptions})
+    if assumptions:
+        print("\n📐 Assumed where there were no statistics:")
+        for assumption in assumptions:
+            print(f"   {assumption}")
+        print("   → Measure them: python firestore_read_cost.py --sample --save-stats read-stats.json")
+    print("\n   Pages also pay the (app shell) row: AuthContext and Navbar render on every route.")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main(parse_args()) else 1)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP Session Layer for the EduGenie Firebase checkers
+Keeps one pooled keep-alive session per process so repeated probes against
+identitytoolkit/firestore googleapis reuse their TCP+TLS connections.
+
+HTTP/2 is optional: set FIREBASE_CHECK_HTTP2=1 (requires `pip install httpx[http2]`).
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Number of distinct hosts to keep pools for, and connections kept per host
+POOL_HOSTS = 10
+POOL_SIZE_PER_HOST = 10
+
+_lock = threading.Lock()
+_session = None
+
+
+class _PooledSession:
+    """requests.Session with a per-host connection pool and reuse accounting"""
+
+    protocol = "HTTP/1.1"
+
+    def __init__(self, pool_size=POOL_SIZE_PER_HOST):
+        self._session = requests.Session()
+        self._adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=pool_size)
+        self._session.mount('https://', self._adapter)
+        self._session.mount('http://', self._adapter)
+
+    def request(self, method, url, **kwargs):
+        return self._session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.request('PATCH', url, **kwargs)
+
+    @contextmanager
+    def stream(self, method, url, chunk_size=64 * 1024, **kwargs):
+        """Yield (response, body chunks) without reading the body up front; closed on exit"""
+        response = self.request(method, url, stream=True, **kwargs)
+        try:
+            yield response, response.iter_content(chunk_size)
+        finally:
+            response.close()
+
+    def stats(self):
+        pools = self._adapter.poolmanager.pools
+        requests_sent = opened = 0
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            requests_sent += pool.num_requests
+            opened += pool.num_connections
+        return {
+            'protocol': self.protocol,
+            'requests': requests_sent,
+            'opened': opened,
+            'reused': max(requests_sent - opened, 0),
+        }
+
+    def close(self):
+        self._session.close()
+
+
+class _Http2Session(_PooledSession):
+    """httpx client with HTTP/2 multiplexing, exposing the same interface"""
+
+    protocol = "HTTP/2"
+
+    def __init__(self, httpx, pool_size=POOL_SIZE_PER_HOST):
+        self._httpx = httpx
+        self._client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=POOL_HOSTS * pool_size,
+                max_keepalive_connections=POOL_HOSTS * pool_size,
+            ),
+        )
+        self._counter_lock = threading.Lock()
+        self._requests = 0
+        self._opened = 0
+
+    def _trace(self, event_name, info):
+        if event_name == "connection.connect_tcp.complete":
+            with self._counter_lock:
+                self._opened += 1
+
+    def request(self, method, url, **kwargs):
+        with self._counter_lock:
+            self._requests += 1
+        try:
+            return self._client.request(method, url, extensions={"trace": self._trace}, **kwargs)
+        except self._httpx.TimeoutException as e:
+            # Callers only know about requests' exception hierarchy
+            raise requests.exceptions.Timeout(str(e)) from e
+        except self._httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+
+    @contextmanager
+    def stream(self, method, url, chunk_size=64 * 1024, **kwargs):
+        with self._counter_lock:
+            self._requests += 1
+        try:
+            with self._client.stream(method, url, extensions={"trace": self._trace}, **kwargs) as response:
+                yield response, response.iter_bytes(chunk_size)
+        except self._httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+        except self._httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+
+    def stats(self):
+        with self._counter_lock:
+            return {
+                'protocol': self.protocol,
+                'requests': self._requests,
+                'opened': self._opened,
+                'reused': max(self._requests - self._opened, 0),
+            }
+
+    def close(self):
+        self._client.close()
+
+
+def _http2_requested():
+    return os.environ.get('FIREBASE_CHECK_HTTP2', '').lower() in ('1', 'true', 'yes')
+
+
+def new_session(pool_size=POOL_SIZE_PER_HOST):
+    """Create a separate pooled session, e.g. one sized for a benchmark's concurrency"""
+    if _http2_requested():
+        try:
+            import httpx
+            import h2  # noqa: F401 - httpx needs it for http2=True
+            return _Http2Session(httpx, pool_size)
+        except ImportError:
+            print("⚠️ HTTP/2 requested but httpx[http2] is not installed - using HTTP/1.1")
+    return _PooledSession(pool_size)
+
+
+def get_session():
+    """Return the process-wide pooled session, creating it on first use"""
+    global _session
+    with _lock:
+        if _session is None:
+            _session = new_session()
+        return _session
+
+
+def connection_stats():
+    """Connections opened versus reused by the shared session so far"""
+    if _session is None:
+        return {'protocol': None, 'requests': 0, 'opened': 0, 'reused': 0}
+    return _session.stats()
+
+
+def print_connection_stats(indent="  "):
+    """Print a one-line connection reuse summary"""
+    stats = connection_stats()
+    if not stats['requests']:
+        return
+    print(f"{indent}🔌 Connections: {stats['opened']} opened, {stats['reused']} reused "
+          f"over {stats['requests']} requests ({stats['protocol']})")
+
+
+def close_session():
+    """Close the shared session and drop its pooled connections"""
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+On-disk Probe Result Cache for the EduGenie Firebase checkers
+Remembers the status code each client probe returned, keyed by a hash of
+(project_id, api_key, endpoint), so re-running a checker seconds later does not
+repeat identical network calls. Each probe kind has its own time-to-live.
+
+Entries are written to a temp file and atomically renamed into place, so
+concurrent checker runs can share the cache directory safely.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+DEFAULT_CACHE_DIR = os.environ.get('FIREBASE_CHECK_CACHE_DIR', '.firebase_check_cache')
+
+# Seconds a cached answer stays fresh, per probe kind
+PROBE_TTLS = {
+    'auth': 60,        # Auth API reachability
+    'firestore': 60,   # Firestore database existence / reachability
+    'project': 300,    # Hosting init.json - changes only when the project does
+}
+DEFAULT_TTL = 60
+
+
+class CachedResponse:
+    """Stand-in for a requests.Response restored from the cache"""
+
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class ProbeCache:
+    """Status-code cache for probes that carry a fingerprint"""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_age=None):
+        self.directory = directory
+        self.max_age = max_age
+
+    def ttl(self, probe):
+        if self.max_age is not None:
+            return self.max_age
+        return PROBE_TTLS.get(probe.key, DEFAULT_TTL)
+
+    def _path(self, probe):
+        digest = hashlib.sha256(json.dumps(list(probe.fingerprint)).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def get(self, probe):
+        """Return (status_code, age_seconds) for a fresh entry, or None"""
+        if probe.fingerprint is None:
+            return None
+        try:
+            with open(self._path(probe), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            age = time.time() - entry['stored_at']
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if age < 0 or age > self.ttl(probe):
+            return None
+        return entry['status_code'], age
+
+    def put(self, probe, status_code):
+        """Store a probe's status code, replacing any previous entry atomically"""
+        if probe.fingerprint is None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        entry = {'status_code': status_code, 'stored_at': time.time(), 'kind': probe.key}
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._path(probe))
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+def cache_from_args(args):
+    """Build a ProbeCache from --no-cache / --max-age, or None when disabled"""
+    if getattr(args, 'no_cache', False):
+        return None
+    return ProbeCache(max_age=getattr(args, 'max_age', None))
+
+
+def add_cache_arguments(parser):
+    """Register the shared --no-cache / --max-age options on an argparse parser"""
+    parser.add_argument('--no-cache', action='store_true',
+                        help="ignore cached probe results and always hit the network")
+    parser.add_argument('--max-age', type=float, default=None, metavar='SECONDS',
+                        help="accept cached probe results up to this age (overrides per-probe TTLs)")
@@ -7,8 +7,26 @@ import os
 import sys
 import time
 import requests
+from http_session import get_session, print_connection_stats
+from stream_matcher import CHUNK_SIZE, DEFAULT_MAX_BYTES, scan_stream
 from datetime import datetime
 
+# Markers looked for in the dev server page: name -> (text, case sensitive)
+PAGE_PATTERNS = {
+    'process': ('process is not defined', True),
+    'firebase': ('Firebase', True),
+    'error': ('error', False),
+}
+
+def page_verdict_decided(found):
+    """'process is not defined' fails the check outright; otherwise every marker must be seen"""
+    return 'process' in found or len(found) == len(PAGE_PATTERNS)
+
+def scan_dev_server_page(url='http://localhost:5173', max_bytes=DEFAULT_MAX_BYTES):
+    """Stream the page through the matcher; returns (status code, ScanResult)"""
+    with get_session().stream('GET', url, chunk_size=CHUNK_SIZE, timeout=5) as (response, chunks):
+        return response.status_code, scan_stream(chunks, PAGE_PATTERNS, page_verdict_decided, max_bytes)
+
 def check_application_status():
     print("🔍 Application Error Diagnosis")
     print("=" * 40)
@@ -33,16 +51,20 @@ def check_application_status():
     
     # Check if dev server is running
     try:
-        response = requests.get('http://localhost:5173', timeout=5)
-        print(f"✅ Dev server: Running (Status: {response.status_code})")
+        status_code, scan = scan_dev_server_page()
+        print(f"✅ Dev server: Running (Status: {status_code})")
+        if scan.stopped_early:
+            print(f"   Scanned {scan.bytes_scanned / 1024:.1f} KB - stopped once the verdict was decided")
+        elif scan.capped:
+            print(f"   Scanned the first {scan.bytes_scanned / 1024:.0f} KB only (page is larger)")
         
         # Check for common errors in response
-        if 'process is not defined' in response.text:
+        if 'process' in scan.found:
             print("❌ Browser error: 'process is not defined' - Need to use import.meta.env")
             return False
-        elif 'Firebase' in response.text and 'error' not in response.text.lower():
+        elif 'firebase' in scan.found and 'error' not in scan.found:
             print("✅ Firebase: Configuration loaded successfully")
-        elif 'error' in response.text.lower():
+        elif 'error' in scan.found:
             print("⚠️ Application: Some errors detected in page")
         else:
             print("✅ Application: Appears to be loading correctly")
@@ -82,6 +104,8 @@ def check_application_status():
     print("✅ Application should be working correctly!")
     print("🌐 Open: http://localhost:5173")
     print("🔥 Firebase should be properly configured")
+    print("🕸️ Cold-start cost: python vite_module_crawler.py")
+    print_connection_stats(indent="")
     
     return True
 
@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Bulk Duplicate Course Remover for EduGenie Platform
+Python counterpart of remove-duplicates.js for large cleanups. Reads the
+duplicate groups written by course_duplicate_auditor.py (or the clusters from
+course_near_duplicates.py), keeps the oldest `createdAt` in every group and
+deletes the rest through the Admin SDK's BulkWriter under an ops/sec ceiling.
+
+Progress is checkpointed after every flush, so an interrupted run picks up
+where it stopped when started again with the same groups file.
+
+Usage:
+    python course_duplicate_auditor.py --output course-duplicates.ndjson
+    python remove_duplicate_courses.py course-duplicates.ndjson --dry-run
+    python remove_duplicate_courses.py course-duplicates.ndjson --max-ops 300
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+try:
+    from course_duplicate_auditor import COURSES_COLLECTION, connect_admin, created_at_sort_key
+    from course_near_duplicates import DEFAULT_THRESHOLD, title_numbers
+except ImportError as e:
+    print("❌ Missing required packages. Please install them with:")
+    print("pip install -r requirements-comprehensive-firebase.txt")
+    sys.exit(1)
+
+# Firestore's 500/50/5 guidance: start new traffic at 500 ops/sec
+DEFAULT_MAX_OPS = 500
+# Deletes between flushes; each flush is followed by a checkpoint
+FLUSH_EVERY = 500
+# Firestore limit on writes in one batch commit
+BATCH_LIMIT = 500
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_CHECKPOINT = '.remove_duplicates.checkpoint.json'
+
+
+def read_groups(path):
+    """Yield (line_number, group) from an NDJSON groups file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if line.strip():
+                yield line_number, json.loads(line)
+
+
+def plan_group(group, threshold=DEFAULT_THRESHOLD):
+    """Return (keep_id, [delete_ids], [spared_ids]) - the oldest createdAt survives.
+
+    Near-duplicate clusters record each member's similarity to the oldest
+    course; a member below `threshold`, or whose title numbers differ from the
+    kept title ("Part 2" vs "Part 1"), is spared instead of deleted. Exact
+    groups from the auditor carry no similarity and are deleted as they are.
+    """
+    members = sorted(group.get('courses', []), key=lambda c: created_at_sort_key(c.get('createdAt')))
+    if len(members) < 2:
+        return None, [], []
+    keep = members[0]['id']
+    keep_numbers = title_numbers(members[0].get('title'))
+    doomed, spared = [], []
+    for course in members[1:]:
+        if course['id'] == keep or course['id'] in doomed or course['id'] in spared:
+            continue
+        numbers = title_numbers(course.get('title'))
+        similarity = course.get('similarity', 1.0)
+        if similarity < threshold or (numbers and keep_numbers and numbers != keep_numbers):
+            spared.append(course['id'])
+        else:
+            doomed.append(course['id'])
+    return keep, doomed, spared
+
+
+class Checkpoint:
+    """Last flushed groups-file line plus the deletes that failed, replaced atomically.
+
+    Failed ids are retried first on resume, so moving the line past them loses nothing.
+    """
+
+    def __init__(self, path, groups_path):
+        self.path = path
+        self.groups_path = os.path.abspath(groups_path)
+        self.groups_size = os.path.getsize(groups_path)
+
+    def load(self):
+        """Resume state for this groups file, or None"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if state.get('groups_path') != self.groups_path or state.get('groups_size') != self.groups_size:
+            print(f"⚠️ Ignoring checkpoint {self.path}: it belongs to a different groups file")
+            return None
+        return state
+
+    def save(self, line_number, deleted, failed_ids):
+        state = {
+            'groups_path': self.groups_path,
+            'groups_size': self.groups_size,
+            'line': line_number,
+            'deleted': deleted,
+            'failed': len(failed_ids),
+            'failed_ids': failed_ids,
+            'updated_at': time.time(),
+        }
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class RateLimiter:
+    """Spaces operations so they never exceed `ops_per_second`"""
+
+    def __init__(self, ops_per_second):
+        self.interval = 1.0 / ops_per_second
+        self._next = time.monotonic()
+
+    def wait(self, ops=1):
+        now = time.monotonic()
+        if self._next > now:
+            time.sleep(self._next - now)
+        self._next = max(self._next, now) + ops * self.interval
+
+
+class BulkDeleter:
+    """Deletes through BulkWriter, which batches, parallelizes and retries on its own"""
+
+    mode = 'BulkWriter'
+
+    def __init__(self, db, collection, max_ops, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        from google.cloud.firestore_v1.bulk_writer import BulkWriterOptions
+
+        self._collection = db.collection(collection)
+        self._lock = threading.Lock()
+        self.deleted = 0
+        self.failed = []
+        self._writer = db.bulk_writer(options=BulkWriterOptions(
+            initial_ops_per_second=min(max_ops, DEFAULT_MAX_OPS), max_ops_per_second=max_ops
+        ))
+        self._writer.on_write_result(self._on_result)
+        self._writer.on_write_error(lambda failure, writer: self._on_error(failure, max_attempts))
+
+    def _on_result(self, reference, result, writer):
+        with self._lock:
+            self.deleted += 1
+
+    def _on_error(self, failure, max_attempts):
+        if failure.attempts < max_attempts:
+            return True
+        with self._lock:
+            self.failed.append({'id': failure.operation.reference.id, 'error': failure.message})
+        return False
+
+    def delete(self, course_id):
+        self._writer.delete(self._collection.document(course_id))
+
+    def flush(self):
+        self._writer.flush()
+
+    def close(self):
+        self._writer.close()
+
+
+class BatchDeleter:
+    """Fallback for SDKs without BulkWriter: 500-write batches paced by a RateLimiter"""
+
+    mode = 'batched writes'
+
+    def __init__(self, db, collection, max_ops, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        self._db = db
+        self._collection = db.collection(collection)
+        self._limiter = RateLimiter(max_ops)
+        self._max_attempts = max_attempts
+        self._pending = []
+        self.deleted = 0
+        self.failed = []
+
+    def delete(self, course_id):
+        self._pending.append(course_id)
+        if len(self._pending) >= BATCH_LIMIT:
+            self.flush()
+
+    def flush(self):
+        while self._pending:
+            chunk, self._pending = self._pending[:BATCH_LIMIT], self._pending[BATCH_LIMIT:]
+            self._commit(chunk)
+
+    def _commit(self, course_ids):
+        for attempt in range(1, self._max_attempts + 1):
+            batch = self._db.batch()
+            for course_id in course_ids:
+                batch.delete(self._collection.document(course_id))
+            self._limiter.wait(len(course_ids))
+            try:
+                batch.commit()
+                self.deleted += len(course_ids)
+                return
+            except Exception as e:
+                if attempt == self._max_attempts:
+                    self.failed.extend({'id': course_id, 'error': str(e)} for course_id in course_ids)
+                    return
+                time.sleep(min(2 ** attempt, 30))
+
+    def close(self):
+        self.flush()
+
+
+def make_deleter(db, collection, max_ops, mode='bulk', max_attempts=DEFAULT_MAX_ATTEMPTS):
+    """BulkWriter when requested and available, batched writes otherwise"""
+    if mode == 'bulk':
+        try:
+            return BulkDeleter(db, collection, max_ops, max_attempts)
+        except (ImportError, AttributeError):
+            print("⚠️ This google-cloud-firestore has no BulkWriter - using batched writes")
+    return BatchDeleter(db, collection, max_ops, max_attempts)
+
+
+def existing_ids(db, collection, course_ids):
+    """Which of the given ids still exist, looked up with one get_all() call"""
+    refs = [db.collection(collection).document(course_id) for course_id in course_ids]
+    return {snapshot.id for snapshot in db.get_all(refs, field_paths=['createdAt']) if snapshot.exists}
+
+
+def dry_run(groups_path, threshold=DEFAULT_THRESHOLD):
+    """Print the plan without connecting to Firebase"""
+    groups = doomed_total = spared_total = 0
+    for line_number, group in read_groups(groups_path):
+        keep, doomed, spared = plan_group(group, threshold)
+        spared_total += len(spared)
+        if not doomed:
+            continue
+        groups += 1
+        doomed_total += len(doomed)
+        print(f"\n📚 {len(doomed) + 1} copies of: \"{group.get('title')}\"")
+        print(f"   ✅ Keeping: {keep}")
+        for course_id in doomed:
+            print(f"   ❌ Would delete: {course_id}")
+        for course_id in spared:
+            print(f"   ⏭️ Sparing: {course_id} (below {threshold} or different title numbers)")
+    print(f"\n🧪 Dry run: {doomed_total:,} courses in {groups:,} groups would be deleted")
+    if spared_total:
+        print(f"   ⏭️ {spared_total:,} cluster members spared after re-checking them against the kept course")
+    return True
+
+
+def remove_duplicates(db, groups_path, deleter, checkpoint, collection=COURSES_COLLECTION,
+                      threshold=DEFAULT_THRESHOLD):
+    """Delete every group's newer copies, flushing and checkpointing every FLUSH_EVERY deletes"""
+    state = checkpoint.load() if checkpoint else None
+    resume_line = state['line'] if state else 0
+    if resume_line:
+        print(f"♻️ Resuming after line {resume_line} ({state['deleted']:,} already deleted)")
+    previously_deleted = state['deleted'] if state else 0
+    retry = state.get('failed_ids', []) if state else []
+
+    skipped = []
+    spared_total = 0
+    chunk = []
+    chunk_deletes = 0
+    started = time.perf_counter()
+
+    if retry:
+        print(f"♻️ Retrying {len(retry):,} deletes that failed last run")
+        for course_id in retry:
+            deleter.delete(course_id)
+        deleter.flush()
+        if checkpoint:
+            checkpoint.save(resume_line, previously_deleted + deleter.deleted, [f['id'] for f in deleter.failed])
+
+    def flush_chunk(last_line):
+        # The kept copy must still exist before its duplicates go
+        alive = existing_ids(db, collection, [keep for _, keep, _ in chunk])
+        for title, keep, doomed in chunk:
+            if keep not in alive:
+                skipped.append(title)
+                continue
+            for course_id in doomed:
+                deleter.delete(course_id)
+        deleter.flush()
+        if checkpoint:
+            checkpoint.save(last_line, previously_deleted + deleter.deleted, [f['id'] for f in deleter.failed])
+        elapsed = time.perf_counter() - started
+        print(f"   🗑️ {previously_deleted + deleter.deleted:,} deleted, {len(deleter.failed)} failed "
+              f"({deleter.deleted / elapsed if elapsed else 0:,.0f} ops/sec)")
+
+    last_line = resume_line
+    for line_number, group in read_groups(groups_path):
+        if line_number <= resume_line:
+            continue
+        keep, doomed, spared = plan_group(group, threshold)
+        spared_total += len(spared)
+        last_line = line_number
+        if not doomed:
+            continue
+        chunk.append((group.get('title'), keep, doomed))
+        chunk_deletes += len(doomed)
+        if chunk_deletes >= FLUSH_EVERY:
+            flush_chunk(line_number)
+            chunk, chunk_deletes = [], 0
+    if chunk:
+        flush_chunk(last_line)
+    deleter.close()
+
+    return {
+        'deleted': previously_deleted + deleter.deleted,
+        'failed': deleter.failed,
+        'skipped': skipped,
+        'spared': spared_total,
+        'seconds': time.perf_counter() - started,
+        'rate_deleted': deleter.deleted,
+    }
+
+
+def print_removal_report(result, mode):
+    """Summarize the run"""
+    rate = result['rate_deleted'] / result['seconds'] if result['seconds'] else 0.0
+    print(f"\n🎉 Cleanup complete!")
+    print(f"   • Deleted: {result['deleted']:,} duplicate courses ({mode}, {rate:,.0f} ops/sec)")
+    if result['skipped']:
+        print(f"   • Skipped: {len(result['skipped'])} groups whose kept course no longer exists")
+    if result['spared']:
+        print(f"   • Spared: {result['spared']:,} cluster members below the threshold or with different title numbers")
+    if result['failed']:
+        print(f"   • Failed: {len(result['failed'])} deletes")
+        for failure in result['failed'][:10]:
+            print(f"     ❌ {failure['id']}: {failure['error']}")
+        print("     → Run again to retry them; the checkpoint keeps their ids")
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Delete duplicate courses found by the duplicate auditor")
+    parser.add_argument('groups', help="NDJSON duplicate groups (course_duplicate_auditor.py / course_near_duplicates.py)")
+    parser.add_argument('--dry-run', action='store_true', help="print what would be deleted and exit")
+    parser.add_argument('--max-ops', type=int, default=DEFAULT_MAX_OPS,
+                        help=f"deletes per second ceiling (default: {DEFAULT_MAX_OPS})")
+    parser.add_argument('--mode', choices=['bulk', 'batch'], default='bulk',
+                        help="BulkWriter or 500-write batches (default: bulk)")
+    parser.add_argument('--max-attempts', type=int, default=DEFAULT_MAX_ATTEMPTS,
+                        help=f"attempts per delete before it counts as failed (default: {DEFAULT_MAX_ATTEMPTS})")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f"minimum similarity to the kept course for near-duplicate clusters (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument('--checkpoint', default=DEFAULT_CHECKPOINT,
+                        help=f"resume file (default: {DEFAULT_CHECKPOINT})")
+    parser.add_argument('--restart', action='store_true', help="ignore an existing checkpoint")
+    parser.add_argument('--collection', default=COURSES_COLLECTION,
+                        help=f"collection holding the courses (default: {COURSES_COLLECTION})")
+    parser.add_argument('--service-account', metavar='PATH',
+                        help="service account JSON (default: same discovery as the comprehensive checker)")
+    return parser.parse_args(argv)
+
+
+def main(args):
+    """Main function"""
+    print("🔍 Removing duplicate courses...")
+    print("=" * 50)
+    if not os.path.exists(args.groups):
+        print(f"❌ Groups file {args.groups} not found - run course_duplicate_auditor.py first")
+        return False
+    if args.dry_run:
+        return dry_run(args.groups, args.threshold)
+
+    try:
+        firebase_admin, app, firestore, db = connect_admin('duplicate-remover', args.service_account)
+    except ImportError:
+        print("❌ firebase-admin is not installed: pip install firebase-admin google-cloud-firestore")
+        return False
+    except Exception as e:
+        print(f"❌ Admin SDK initialization failed: {e}")
+        return False
+
+    checkpoint = Checkpoint(args.checkpoint, args.groups)
+    if args.restart:
+        checkpoint.clear()
+    try:
+        deleter = make_deleter(db, args.collection, args.max_ops, args.mode, args.max_attempts)
+        print(f"🗑️ Deleting with {deleter.mode}, at most {args.max_ops} ops/sec")
+        result = remove_duplicates(db, args.groups, deleter, checkpoint, args.collection, args.threshold)
+        print_removal_report(result, deleter.mode)
+        if not result['failed']:
+            checkpoint.clear()
+        return not result['failed']
+    except Exception as e:
+        print(f"❌ Error during cleanup: {e}")
+        print(f"   Run again to resume from {args.checkpoint}")
+        return False
+    finally:
+        firebase_admin.delete_app(app)
+
+
+if __name__ == "__main__":
+    try:
+        success = main(parse_args())
+    except KeyboardInterrupt:
+        print("\n\n❌ Cleanup interrupted - run again to resume from the checkpoint")
+        success = False
+    sys.exit(0 if success else 1)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Streaming Multi-Pattern Matcher for the EduGenie diagnostics
+Looks for several patterns in one pass over a response body as it arrives,
+so a page is never held in memory or decoded as a whole. Scanning stops once
+the caller's verdict can no longer change, or at a byte cap.
+
+The patterns are compiled into a single regex alternation (re's C matcher
+does the multi-pattern search), run over ASCII-lowercased chunks; hits for
+case-sensitive patterns are confirmed against the original bytes. The last
+few bytes of each chunk are carried over so matches spanning a chunk
+boundary are found.
+"""
+
+import re
+
+# Bytes scanned before giving up on a verdict
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+
+class ScanResult:
+    """Which named patterns were seen and how much of the stream it took"""
+
+    def __init__(self):
+        self.found = set()
+        self.bytes_scanned = 0
+        self.capped = False
+        self.stopped_early = False
+
+
+class StreamScanner:
+    """Feed chunks, collect matches; `decided(found)` says when to stop"""
+
+    def __init__(self, patterns, decided=None, max_bytes=DEFAULT_MAX_BYTES):
+        """`patterns` maps a name to (text, case_sensitive)"""
+        self.patterns = {name: (text.encode('utf-8'), sensitive)
+                         for name, (text, sensitive) in patterns.items()}
+        self.decided = decided or (lambda found: len(found) == len(self.patterns))
+        self.max_bytes = max_bytes
+        self.result = ScanResult()
+        self._tail = b""
+        self._keep = max((len(raw) for raw, _ in self.patterns.values()), default=1) - 1
+        self._regex = None
+        self._compile()
+
+    def _compile(self):
+        """One alternation over the patterns not seen yet, searched from each hit's start + 1"""
+        missing = sorted({raw.lower() for name, (raw, _) in self.patterns.items()
+                          if name not in self.result.found}, key=len, reverse=True)
+        self._regex = re.compile(b"|".join(re.escape(p) for p in missing)) if missing else None
+
+    def _match_at(self, window, lowered, start):
+        """Names of the missing patterns that occur at `start`, and the furthest end offset"""
+        hits, end = [], start
+        for name, (raw, sensitive) in self.patterns.items():
+            if name in self.result.found:
+                continue
+            if sensitive:
+                matched = window.startswith(raw, start)
+            else:
+                matched = lowered.startswith(raw.lower(), start)
+            if matched:
+                hits.append(name)
+                end = max(end, start + len(raw))
+        return hits, end
+
+    def feed(self, chunk):
+        """Scan one chunk; returns True when scanning should stop"""
+        result = self.result
+        room = self.max_bytes - result.bytes_scanned
+        if len(chunk) > room:
+            chunk = chunk[:room]
+            result.capped = True
+
+        window = self._tail + chunk
+        carried = len(self._tail)
+        if self._regex is not None:
+            lowered = window.lower()
+            position = 0
+            while True:
+                match = self._regex.search(lowered, position)
+                if match is None:
+                    break
+                hits, end = self._match_at(window, lowered, match.start())
+                if hits:
+                    result.found.update(hits)
+                    if self.decided(result.found):
+                        result.bytes_scanned += end - carried
+                        result.stopped_early = True
+                        return True
+                    self._compile()
+                    if self._regex is None:
+                        break
+                position = match.start() + 1
+
+        result.bytes_scanned += len(chunk)
+        if self._keep:
+            self._tail = window[-self._keep:]
+        return result.capped
+
+
+def scan_stream(chunks, patterns, decided=None, max_bytes=DEFAULT_MAX_BYTES):
+    """Scan an iterable of byte chunks; stops pulling chunks as soon as possible"""
+    scanner = StreamScanner(patterns, decided, max_bytes)
+    for chunk in chunks:
+        if chunk and scanner.feed(chunk):
+            break
+    return scanner.result
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Regression checks for course_near_duplicates.py
+Run with: python -m pytest test_course_near_duplicates.py
+"""
+
+from course_near_duplicates import build_index
+
+TITLE = "Learn Python Programming Full Course"
+
+
+def _index(titles):
+    records = [(f"course-{i}", {'title': title, 'createdAt': f"2024-01-0{i + 1}T00:00:00"})
+               for i, title in enumerate(titles)]
+    return build_index(records, workers=1)
+
+
+def test_numbered_parts_do_not_chain_through_unnumbered_title():
+    index = _index([f"{TITLE} Part 1", f"{TITLE} Part", f"{TITLE} Part 2"])
+    for cluster in index.clusters(threshold=0.5):
+        numbers = {index.numbers[i] for i in cluster if index.numbers[i]}
+        assert len(numbers) <= 1, [index.titles[i] for i in cluster]
+
+
+def test_reimported_titles_still_cluster():
+    index = _index([f"{TITLE} Part 1", f"{TITLE} Pt. 1", "Cooking Basics for Beginners"])
+    clusters = index.clusters(threshold=0.5)
+    assert [sorted(index.ids[i] for i in cluster) for cluster in clusters] == [['course-0', 'course-1']]
+
+
+def test_numbered_parts_do_not_chain_past_the_representatives():
+    # Enough unnumbered copies to fill the representative set before the parts join
+    index = _index([f"{TITLE} Part"] * 20 + [f"{TITLE} Part 1", f"{TITLE} Part 2"])
+    for cluster in index.clusters(threshold=0.5):
+        numbers = {index.numbers[i] for i in cluster if index.numbers[i]}
+        assert len(numbers) <= 1, [index.titles[i] for i in cluster]
+
+
+def test_large_exact_duplicate_family_is_one_cluster():
+    index = _index([TITLE] * 2000)
+    clusters = index.clusters()
+    assert [len(cluster) for cluster in clusters] == [2000]
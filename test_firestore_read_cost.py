@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Regression checks for firestore_read_cost.py
+Run with: python -m pytest test_firestore_read_cost.py
+"""
+
+from firestore_queries import Constraint
+from firestore_read_cost import MAX_TRACKED_VALUES, CollectionStats
+
+
+def _stats(values):
+    documents = [(f"courses/c{i}", {'category': value}) for i, value in enumerate(values)]
+    return CollectionStats.from_documents('courses', len(documents), documents)
+
+
+def _equals(value):
+    return Constraint('where', 'category', '==', value=value)
+
+
+def test_tracked_literal_uses_its_sampled_share():
+    stats = _stats(['web'] * 3 + ['data'])
+    assert stats.selectivity(_equals("'web'")) == (0.75, None)
+
+
+def test_untracked_literal_is_not_assumed_absent():
+    # The first MAX_TRACKED_VALUES values are tracked, the rest only counted
+    values = [f"v{i}" for i in range(MAX_TRACKED_VALUES)] + ["late"] * 50
+    share, assumption = _stats(values).selectivity(_equals("'late'"))
+    assert share == 1 / MAX_TRACKED_VALUES
+    assert assumption
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+On-disk OAuth Access Token Cache for the EduGenie Firebase checkers
+Each Admin SDK run used to mint a fresh access token from the service account
+key. cached_certificate() wraps credentials.Certificate so the token is kept
+on disk, keyed by the key's private_key_id, and reused until shortly before
+it expires - repeated CI runs skip the token endpoint round trip.
+
+Token files hold a bearer token: they are created 0600, and a file that
+group or others can read is ignored rather than trusted.
+"""
+
+import hashlib
+import json
+import os
+import stat
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from probe_cache import DEFAULT_CACHE_DIR
+
+# Stop reusing a cached token this many seconds before it expires
+REFRESH_MARGIN = 300
+
+
+def _epoch(expiry):
+    """google-auth keeps expiry as a naive UTC datetime"""
+    if expiry.tzinfo is None:
+        expiry = expiry.replace(tzinfo=timezone.utc)
+    return expiry.timestamp()
+
+
+class TokenCache:
+    """Access tokens on disk, one file per service account key"""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, margin=REFRESH_MARGIN):
+        self.directory = directory
+        self.margin = margin
+
+    def _path(self, key_id):
+        digest = hashlib.sha256(key_id.encode('utf-8')).hexdigest()[:32]
+        return os.path.join(self.directory, f"token-{digest}.json")
+
+    def fresh(self, expiry):
+        """True while a token expiring at `expiry` is still worth handing out"""
+        return expiry is not None and _epoch(expiry) - time.time() > self.margin
+
+    def load(self, key_id, scopes=()):
+        """Return (token, naive UTC expiry) for a fresh cached token, or None"""
+        if not key_id:
+            return None
+        path = self._path(key_id)
+        try:
+            if os.stat(path).st_mode & (stat.S_IRWXG | stat.S_IRWXO):
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            if sorted(entry.get('scopes') or []) != sorted(scopes or []):
+                return None
+            expiry = datetime.fromtimestamp(entry['expires_at'], tz=timezone.utc).replace(tzinfo=None)
+            token = entry['token']
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return (token, expiry) if self.fresh(expiry) else None
+
+    def save(self, key_id, token, expiry, scopes=()):
+        """Store a token atomically; mkstemp creates the file 0600"""
+        if not key_id or not token or expiry is None:
+            return
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        entry = {'token': token, 'expires_at': _epoch(expiry), 'scopes': list(scopes or []),
+                 'stored_at': time.time()}
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='token-', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._path(key_id))
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def clear(self, key_id):
+        try:
+            os.remove(self._path(key_id))
+        except OSError:
+            pass
+
+
+def _google_auth_request():
+    from google.auth.transport import requests as google_requests
+    return google_requests.Request()
+
+
+def cached_certificate(credentials, service_account, cache=None):
+    """A credentials.Certificate whose access token comes from, and goes to, the token cache.
+
+    `credentials` is the firebase_admin.credentials module (imported lazily by
+    the callers); `service_account` is the parsed key JSON or its path.
+    """
+    if not isinstance(service_account, dict):
+        with open(service_account, 'r', encoding='utf-8') as f:
+            service_account = json.load(f)
+    cache = cache or TokenCache()
+    key_id = service_account.get('private_key_id')
+    cert = credentials.Certificate(service_account)
+    google_cred = cert.get_credential()
+    scopes = list(getattr(google_cred, 'scopes', None) or [])
+
+    cached = cache.load(key_id, scopes)
+    if cached:
+        # A valid token means the SDK's transports never call refresh()
+        google_cred.token, google_cred.expiry = cached
+
+    refresh = google_cred.refresh
+
+    def refresh_and_save(request):
+        refresh(request)
+        cache.save(key_id, google_cred.token, google_cred.expiry, scopes)
+
+    def get_access_token():
+        # Certificate.get_access_token() refreshes unconditionally; reuse a fresh token instead
+        if google_cred.token is None or not cache.fresh(google_cred.expiry):
+            google_cred.refresh(_google_auth_request())
+        return credentials.AccessTokenInfo(google_cred.token, google_cred.expiry)
+
+    google_cred.refresh = refresh_and_save
+    cert.get_access_token = get_access_token
+    return cert
+
+
+def token_cache_from_args(args):
+    """Build a TokenCache from --no-token-cache, or None when disabled"""
+    if getattr(args, 'no_token_cache', False):
+        return None
+    return TokenCache()
+
+
+def add_token_cache_argument(parser):
+    """Register the shared --no-token-cache option on an argparse parser"""
+    parser.add_argument('--no-token-cache', action='store_true',
+                        help="mint a fresh OAuth access token instead of reusing the cached one")
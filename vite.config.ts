@@ -1,10 +1,54 @@
-import { defineConfig } from 'vite';
+import { mkdirSync, renameSync, rmSync } from 'node:fs';
+import { dirname, join } from 'node:path';
+import { defineConfig, type Plugin } from 'vite';
 import react from '@vitejs/plugin-react';
 
+// Sourcemaps are moved here once written, so deploying dist/ never publishes
+// the app source; build_budget.py reads them from this directory
+const SOURCEMAP_DIR = 'build-sourcemaps';
+
+function moveSourcemapsOutOfDist(): Plugin {
+  return {
+    name: 'move-sourcemaps-out-of-dist',
+    apply: 'build',
+    buildStart() {
+      rmSync(SOURCEMAP_DIR, { recursive: true, force: true });
+    },
+    writeBundle(options, bundle) {
+      const outDir = options.dir ?? 'dist';
+      for (const fileName of Object.keys(bundle)) {
+        if (!fileName.endsWith('.map')) continue;
+        const target = join(SOURCEMAP_DIR, fileName);
+        mkdirSync(dirname(target), { recursive: true });
+        renameSync(join(outDir, fileName), target);
+      }
+    },
+  };
+}
+
 // https://vitejs.dev/config/
 export default defineConfig({
-  plugins: [react()],
+  plugins: [react(), moveSourcemapsOutOfDist()],
   optimizeDeps: {
     exclude: ['lucide-react'],
   },
+  build: {
+    // build_budget.py attributes chunk bytes to source modules from the maps
+    // and finds the entry chunk in the manifest. 'hidden' leaves no
+    // sourceMappingURL in the chunks, and the plugin above moves the .map
+    // files out of dist/ before anything can deploy them
+    sourcemap: 'hidden',
+    manifest: true,
+    rollupOptions: {
+      output: {
+        // Each Firebase SDK gets its own vendor chunk with its own size budget
+        manualChunks: {
+          'firebase-app': ['firebase/app'],
+          'firebase-auth': ['firebase/auth'],
+          'firebase-firestore': ['firebase/firestore'],
+          'firebase-storage': ['firebase/storage'],
+        },
+      },
+    },
+  },
 });
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Vite Module Graph Crawler for EduGenie Platform
+Loads index.html from the dev (or preview) server the way a browser would:
+follows every <script type="module">, modulepreload link and import
+specifier (src/main.tsx -> src/App.tsx -> pages -> services -> the
+Firebase SDK), fetching modules concurrently as they are discovered.
+
+Reports total requests and bytes, the critical path (the longest chain of
+modules that can only be requested after their importer arrived) and the
+slowest and largest modules, i.e. the app's cold-start cost as a number we
+can track.
+
+Usage:
+    python vite_module_crawler.py                        # dev server, :5173
+    python vite_module_crawler.py --preview              # vite preview, :4173
+    python vite_module_crawler.py --json crawl.json      # keep the numbers
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urldefrag, urljoin, urlsplit
+
+try:
+    from http_session import new_session
+except ImportError as e:
+    print("❌ Missing required packages. Please install them with:")
+    print("pip install requests")
+    sys.exit(1)
+
+DEV_URL = 'http://localhost:5173/'
+PREVIEW_URL = 'http://localhost:4173/'
+DEFAULT_JOBS = 8
+# A browser opens at most 6 HTTP/1.1 connections per origin
+BROWSER_JOBS = 6
+MAX_MODULES = 2000
+FETCH_TIMEOUT = 10
+
+SCRIPT_TAG = re.compile(r'<script\b([^>]*)>(.*?)</script>', re.I | re.S)
+PRELOAD_LINK = re.compile(r'<link\b[^>]*\brel=["\']?modulepreload\b[^>]*>', re.I)
+ATTRIBUTE = re.compile(r'\b(type|src|href)\s*=\s*["\']?([^"\'\s>]+)', re.I)
+# `import x from '..'`, `import '..'`, `export * from '..'`, minified or not
+STATIC_IMPORT = re.compile(
+    r'''(?:^|[;\s}])(?:import|export)\s*(?:[\w$*{}\s,]*?\s*from\s*)?["']([^"'\n]+)["']''', re.M)
+DYNAMIC_IMPORT = re.compile(r'''\bimport\s*\(\s*["']([^"'\n]+)["']\s*\)''')
+
+
+class ModuleFetch:
+    """One module request and where it sits in the waterfall"""
+
+    def __init__(self, url, parent=None, depth=0, kind='entry'):
+        self.url = url
+        self.parent = parent
+        self.depth = depth
+        self.kind = kind
+        self.status_code = None
+        self.content_type = ''
+        self.bytes = 0
+        self.latency = 0.0
+        self.error = None
+        self.imports = []
+        # Modelled arrival time: the importer's arrival plus this module's own latency
+        self.arrival = 0.0
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def _attributes(tag_attrs):
+    return {name.lower(): value for name, value in ATTRIBUTE.findall(tag_attrs)}
+
+
+def html_entries(html):
+    """Module specifiers referenced by a page: script src, inline imports and modulepreloads"""
+    entries = []
+    for attrs, body in SCRIPT_TAG.findall(html):
+        attributes = _attributes(attrs)
+        if attributes.get('type', '').lower() != 'module':
+            continue
+        if attributes.get('src'):
+            entries.append((attributes['src'], 'entry'))
+        else:
+            entries.extend(module_imports(body))
+    for link in PRELOAD_LINK.findall(html):
+        href = _attributes(link).get('href')
+        if href:
+            entries.append((href, 'preload'))
+    return entries
+
+
+def module_imports(source, follow_dynamic=True):
+    """(specifier, kind) for every import in a JavaScript module, in source order"""
+    found = [(m.start(), m.group(1), 'static') for m in STATIC_IMPORT.finditer(source)]
+    if follow_dynamic:
+        found += [(m.start(), m.group(1), 'dynamic') for m in DYNAMIC_IMPORT.finditer(source)]
+    return [(specifier, kind) for _, specifier, kind in sorted(found)]
+
+
+def resolve(specifier, base_url):
+    """Absolute same-origin URL for a specifier, or None for bare or foreign ones"""
+    if not specifier.startswith(('/', './', '../', 'http://', 'https://')):
+        return None
+    url = urldefrag(urljoin(base_url, specifier))[0]
+    base = urlsplit(base_url)
+    target = urlsplit(url)
+    if (target.scheme, target.netloc) != (base.scheme, base.netloc):
+        return None
+    return url
+
+
+class ModuleCrawler:
+    """Breadth-first crawl that requests each module as soon as its importer arrives"""
+
+    def __init__(self, base_url=DEV_URL, jobs=DEFAULT_JOBS, follow_dynamic=True,
+                 max_modules=MAX_MODULES, timeout=FETCH_TIMEOUT):
+        self.base_url = base_url
+        self.jobs = jobs
+        self.follow_dynamic = follow_dynamic
+        self.max_modules = max_modules
+        self.timeout = timeout
+        self.modules = {}
+        self.unresolved = set()
+        self.truncated = False
+        self.wall_seconds = 0.0
+
+    def _fetch(self, session, module):
+        started = time.perf_counter()
+        try:
+            response = session.get(module.url, timeout=self.timeout)
+            body = response.content
+            module.latency = time.perf_counter() - started
+            module.status_code = response.status_code
+            module.content_type = response.headers.get('content-type', '')
+            module.bytes = len(body)
+            if response.status_code != 200:
+                module.error = f"HTTP {response.status_code}"
+                return
+            text = body.decode('utf-8', errors='replace')
+            if module.kind == 'page':
+                module.imports = html_entries(text)
+            elif 'text/html' in module.content_type:
+                # Vite's SPA fallback answers unknown paths with index.html
+                module.error = "served the HTML fallback, not a module"
+            else:
+                module.imports = module_imports(text, self.follow_dynamic)
+        except Exception as e:
+            module.latency = time.perf_counter() - started
+            module.error = type(e).__name__
+
+    def _discover(self, module):
+        children = []
+        for specifier, kind in module.imports:
+            url = resolve(specifier, module.url)
+            if url is None:
+                self.unresolved.add(specifier)
+                continue
+            if url in self.modules:
+                continue
+            if len(self.modules) >= self.max_modules:
+                self.truncated = True
+                break
+            child = ModuleFetch(url, module.url, module.depth + 1, kind)
+            self.modules[url] = child
+            children.append(child)
+        return children
+
+    def crawl(self):
+        """Fetch the page and its whole module graph; returns the modules in discovery order"""
+        session = new_session(pool_size=self.jobs)
+        page = ModuleFetch(self.base_url, kind='page')
+        self.modules[page.url] = page
+        started = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+                pending = {executor.submit(self._fetch, session, page): page}
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        module = pending.pop(future)
+                        parent = self.modules.get(module.parent)
+                        module.arrival = (parent.arrival if parent else 0.0) + module.latency
+                        for child in self._discover(module):
+                            pending[executor.submit(self._fetch, session, child)] = child
+        finally:
+            session.close()
+        self.wall_seconds = time.perf_counter() - started
+        return list(self.modules.values())
+
+    def critical_path(self):
+        """The chain ending at the latest modelled arrival, entry first"""
+        if not self.modules:
+            return []
+        module = max(self.modules.values(), key=lambda m: m.arrival)
+        chain = []
+        while module is not None:
+            chain.append(module)
+            module = self.modules.get(module.parent)
+        return chain[::-1]
+
+    def _path(self, url):
+        parts = urlsplit(url)
+        return parts.path + (f"?{parts.query}" if parts.query else "")
+
+    def summary(self, top=10):
+        """Totals, critical path and slowest/largest modules as plain data"""
+        modules = list(self.modules.values())
+        chain = self.critical_path()
+        return {
+            'url': self.base_url,
+            'requests': len(modules),
+            'failed': sum(1 for m in modules if not m.ok),
+            'bytes': sum(m.bytes for m in modules),
+            'dynamic_imports': sum(1 for m in modules if m.kind == 'dynamic'),
+            'wall_seconds': round(self.wall_seconds, 3),
+            'jobs': self.jobs,
+            'max_depth': max((m.depth for m in modules), default=0),
+            'critical_path_depth': len(chain) - 1 if chain else 0,
+            'critical_path_ms': round(chain[-1].arrival * 1000, 1) if chain else 0.0,
+            'critical_path': [self._path(m.url) for m in chain],
+            'slowest': [self._row(m) for m in sorted(modules, key=lambda m: m.latency, reverse=True)[:top]],
+            'largest': [self._row(m) for m in sorted(modules, key=lambda m: m.bytes, reverse=True)[:top]],
+            'errors': [self._row(m) for m in modules if not m.ok],
+            'unresolved': sorted(self.unresolved),
+            'truncated': self.truncated,
+        }
+
+    def _row(self, module):
+        return {'path': self._path(module.url), 'kind': module.kind, 'depth': module.depth,
+                'latency_ms': round(module.latency * 1000, 1), 'bytes': module.bytes,
+                'error': module.error}
+
+
+def _size(num_bytes):
+    if num_bytes >= 1024 * 1024:
+        return f"{num_bytes / (1024 * 1024):.1f} MB"
+    return f"{num_bytes / 1024:.1f} KB"
+
+
+def print_crawl_report(summary):
+    """Print the crawl totals, waterfall and module tables"""
+    print(f"🌐 {summary['url']}")
+    failed = f" ({summary['failed']} failed)" if summary['failed'] else ""
+    print(f"📦 Requests: {summary['requests']}{failed}   Bytes: {_size(summary['bytes'])}"
+          f"   Dynamic imports: {summary['dynamic_imports']}")
+    print(f"⏱️ Wall clock: {summary['wall_seconds']:.2f}s with {summary['jobs']} concurrent fetches")
+    print(f"🪜 Critical path: {summary['critical_path_depth']} round trips after the page, "
+          f"{summary['critical_path_ms']:.0f}ms modelled")
+    for index, path in enumerate(summary['critical_path']):
+        print(f"   {'  ' * min(index, 12)}└─ {path}")
+
+    print("\n🐢 Slowest modules:")
+    for row in summary['slowest']:
+        print(f"   {row['latency_ms']:>8.1f}ms {_size(row['bytes']):>10}  {row['path']}")
+    print("\n🏋️ Largest modules:")
+    for row in summary['largest']:
+        print(f"   {_size(row['bytes']):>10} {row['latency_ms']:>8.1f}ms  {row['path']}")
+
+    if summary['errors']:
+        print("\n❌ Failed requests:")
+        for row in summary['errors']:
+            print(f"   {row['path']}: {row['error']}")
+    if summary['unresolved']:
+        shown = ", ".join(summary['unresolved'][:5])
+        more = f" (+{len(summary['unresolved']) - 5} more)" if len(summary['unresolved']) > 5 else ""
+        print(f"\n⚠️ Bare specifiers not rewritten by the server: {shown}{more}")
+    if summary['truncated']:
+        print(f"\n⚠️ Stopped after {summary['requests']} modules (--max-modules)")
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Crawl the Vite module graph from index.html and measure the load waterfall")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument('--url', default=DEV_URL, help=f"page to start from (default: {DEV_URL})")
+    target.add_argument('--preview', action='store_const', dest='url', const=PREVIEW_URL,
+                        help=f"crawl the `vite preview` server at {PREVIEW_URL}")
+    parser.add_argument('--jobs', '-j', type=int, default=DEFAULT_JOBS,
+                        help=f"concurrent fetches (default: {DEFAULT_JOBS}; a browser uses {BROWSER_JOBS})")
+    parser.add_argument('--no-dynamic', action='store_true',
+                        help="do not follow dynamic import() calls")
+    parser.add_argument('--top', type=int, default=10, help="rows in the slowest/largest tables (default: 10)")
+    parser.add_argument('--max-modules', type=int, default=MAX_MODULES,
+                        help=f"stop after this many modules (default: {MAX_MODULES})")
+    parser.add_argument('--json', metavar='PATH', help="also write the summary as JSON")
+    return parser.parse_args(argv)
+
+
+def main(args):
+    """Main function"""
+    print("🕸️ Vite Module Graph Crawl")
+    print("=" * 50)
+    crawler = ModuleCrawler(args.url, jobs=max(args.jobs, 1), follow_dynamic=not args.no_dynamic,
+                            max_modules=args.max_modules)
+    crawler.crawl()
+    page = crawler.modules[args.url]
+    if not page.ok:
+        print(f"❌ {args.url}: {page.error}")
+        print("   → Run: npm run dev (or npm run build && npm run preview)")
+        return False
+
+    summary = crawler.summary(top=args.top)
+    print_crawl_report(summary)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+        print(f"\n💾 Summary written to {args.json}")
+    return summary['failed'] == 0
+
+
+if __name__ == "__main__":
+    try:
+        success = main(parse_args())
+    except KeyboardInterrupt:
+        print("\n\n⏹️ Crawl cancelled by user")
+        success = False
+    sys.exit(0 if success else 1)